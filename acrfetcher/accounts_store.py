@@ -61,6 +61,44 @@ def parse_telethon_http_proxy(spec: str):
         return None
 
 
+ACCOUNT_ROLES = ("detector", "opener", "both")
+
+_ROLE_ALIASES = {
+    "": "both",
+    "all": "both",
+    "detect": "detector",
+    "listener": "detector",
+    "watcher": "detector",
+    "open": "opener",
+    "worker": "opener",
+}
+
+
+def parse_account_role(raw: str) -> str:
+    """accounts.csv role column -> detector | opener | both (unknown values -> both)."""
+    r = str(raw or "").strip().lower()
+    r = _ROLE_ALIASES.get(r, r)
+    return r if r in ACCOUNT_ROLES else "both"
+
+
+def role_detects(role: str) -> bool:
+    """Listens/polls the channel (NEW mode)."""
+    return str(role or "both") in ("detector", "both")
+
+
+def role_opens(role: str) -> bool:
+    """Receives fanout OPENs and runs a browser (NEW mode)."""
+    return str(role or "both") in ("opener", "both")
+
+
+def effective_roles(roles: list[str]) -> list[str]:
+    """Roles as used at runtime: if nobody would detect, or nobody would open,
+    every account falls back to "both"."""
+    if not any(role_detects(r) for r in roles) or not any(role_opens(r) for r in roles):
+        return ["both" for _ in roles]
+    return [str(r or "both") for r in roles]
+
+
 def load_accounts_csv(csv_path: Path) -> list[AccountRecord]:
     if csv_path.is_dir():
         csv_path = csv_path / "accounts.csv"
@@ -74,6 +112,7 @@ def load_accounts_csv(csv_path: Path) -> list[AccountRecord]:
             phone = (r.get("phone") or r.get("Phone") or "").strip()
             email = (r.get("email") or r.get("Email") or "").strip()
             proxy_raw = (r.get("proxy") or r.get("Proxy") or "").strip()
+            role = parse_account_role(r.get("role") or r.get("Role") or "")
             if not phone:
                 continue
             rows.append(
@@ -83,6 +122,7 @@ def load_accounts_csv(csv_path: Path) -> list[AccountRecord]:
                     proxy_raw=proxy_raw,
                     proxy=parse_http_proxy(proxy_raw),
                     tg_proxy=parse_telethon_http_proxy(proxy_raw),
+                    role=role,
                 )
             )
     if not rows:
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from telethon import types
+
+
+def _ref_key(channel_ref: str) -> str:
+    return (channel_ref or "").strip().lower()
+
+
+def record_from_entity(ent: Any) -> Optional[dict]:
+    """Cacheable fields of a resolved channel/supergroup (None for anything else)."""
+    if not isinstance(ent, types.Channel):
+        return None
+    access_hash = getattr(ent, "access_hash", None)
+    if access_hash is None:
+        return None
+    return {
+        "id": int(ent.id),
+        "access_hash": int(access_hash),
+        "title": str(getattr(ent, "title", "") or ""),
+        "username": getattr(ent, "username", None) or None,
+        "megagroup": bool(getattr(ent, "megagroup", False)),
+        "broadcast": bool(getattr(ent, "broadcast", False)),
+    }
+
+
+def entity_from_record(rec: dict) -> Optional[types.Channel]:
+    """Rebuild a types.Channel good enough for get_messages / events / peer ids."""
+    try:
+        return types.Channel(
+            id=int(rec["id"]),
+            title=str(rec.get("title") or ""),
+            photo=types.ChatPhotoEmpty(),
+            date=None,
+            access_hash=int(rec["access_hash"]),
+            username=rec.get("username") or None,
+            megagroup=bool(rec.get("megagroup")) or None,
+            broadcast=bool(rec.get("broadcast")) or None,
+        )
+    except Exception:
+        return None
+
+
+class ChannelCache:
+    """Per-account resolved channel (id + access hash) and membership, on disk.
+
+    JSON file under DATA_DIR: {account: {channel_ref: record}}. Entries never
+    expire on their own; callers drop them with invalidate() on access errors
+    (private channel, kicked, stale access hash). Only channels/supergroups are
+    cached. Every change is written atomically (tmp + os.replace).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data: dict[str, dict[str, dict]] = {}
+        self._loaded = False
+
+    def load(self) -> None:
+        self._data = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if isinstance(raw, dict):
+                for acct, chans in raw.items():
+                    if isinstance(chans, dict):
+                        self._data[str(acct)] = {str(k): v for k, v in chans.items() if isinstance(v, dict)}
+        except FileNotFoundError:
+            pass
+        except Exception:
+            pass
+        self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=1, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def get(self, account: str, channel_ref: str) -> Optional[dict]:
+        self._ensure_loaded()
+        rec = self._data.get(str(account), {}).get(_ref_key(channel_ref))
+        return dict(rec) if rec is not None else None
+
+    def entity(self, account: str, channel_ref: str) -> Optional[types.Channel]:
+        rec = self.get(account, channel_ref)
+        return entity_from_record(rec) if rec is not None else None
+
+    def joined(self, account: str, channel_ref: str) -> bool:
+        rec = self.get(account, channel_ref)
+        return bool(rec and rec.get("joined"))
+
+    def put(self, account: str, channel_ref: str, ent: Any, *, joined: Optional[bool] = None) -> bool:
+        """Store a resolved entity; keeps the known membership unless joined is given."""
+        self._ensure_loaded()
+        rec = record_from_entity(ent)
+        if rec is None:
+            return False
+        chans = self._data.setdefault(str(account), {})
+        prev = chans.get(_ref_key(channel_ref)) or {}
+        same = prev.get("id") == rec["id"]
+        rec["joined"] = bool(prev.get("joined")) if (joined is None and same) else bool(joined)
+        rec["t"] = time.time()
+        chans[_ref_key(channel_ref)] = rec
+        self._save()
+        return True
+
+    def set_joined(self, account: str, channel_ref: str, joined: bool = True) -> None:
+        self._ensure_loaded()
+        rec = self._data.get(str(account), {}).get(_ref_key(channel_ref))
+        if rec is None or bool(rec.get("joined")) == bool(joined):
+            return
+        rec["joined"] = bool(joined)
+        self._save()
+
+    def invalidate(self, account: str, channel_ref: Optional[str] = None) -> bool:
+        """Drop one channel (or every channel when channel_ref is None) for an account."""
+        self._ensure_loaded()
+        chans = self._data.get(str(account))
+        if not chans:
+            return False
+        if channel_ref is None:
+            self._data.pop(str(account), None)
+        elif chans.pop(_ref_key(channel_ref), None) is None:
+            return False
+        self._save()
+        return True
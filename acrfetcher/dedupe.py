@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Iterator, Optional
+
+
+@dataclass(slots=True)
+class DedupeCounters:
+    hits: int = 0  # duplicates rejected
+    misses: int = 0  # new keys accepted
+    expired: int = 0  # dropped by TTL
+    evicted: int = 0  # dropped by the size cap
+
+
+class DedupeStore:
+    """TTL'd "seen" set with O(1) amortized insert, lookup and expiry.
+
+    Keys live in an insertion-ordered dict (oldest first). Timestamps only grow,
+    so expiry pops from the front until it meets a live entry, and the size cap
+    evicts the oldest key. A duplicate does not refresh its timestamp.
+    """
+
+    def __init__(self, ttl_s: float, max_items: int = 50_000):
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.max_items = max(1, int(max_items))
+        self._items: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.counters = DedupeCounters()
+
+    def _now(self, now: Optional[float]) -> float:
+        return time.monotonic() if now is None else float(now)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop entries older than ttl_s; returns how many were dropped."""
+        cutoff = self._now(now) - self.ttl_s
+        n = 0
+        items = self._items
+        while items:
+            _key, ts = next(iter(items.items()))
+            if ts > cutoff:
+                break
+            items.popitem(last=False)
+            n += 1
+        self.counters.expired += n
+        return n
+
+    def seen(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """True if key was added within ttl_s (a duplicate); otherwise record it and return False."""
+        now = self._now(now)
+        self.expire(now)
+        if key in self._items:
+            self.counters.hits += 1
+            return True
+        self.counters.misses += 1
+        self._items[key] = now
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+            self.counters.evicted += 1
+        return False
+
+    def add(self, key: Hashable, now: Optional[float] = None) -> None:
+        """Record key (refreshing its timestamp) without counting a hit/miss."""
+        now = self._now(now)
+        self._items.pop(key, None)
+        self._items[key] = now
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+            self.counters.evicted += 1
+
+    def get(self, key: Hashable) -> Optional[float]:
+        return self._items.get(key)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._items)
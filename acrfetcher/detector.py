@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
 
 
 HARD_MISSED_PHRASES = [
@@ -20,6 +23,12 @@ ALREADY_CLAIMED_SUCCESS_PHRASES = [
     "this offer has already been claimed",
 ]
 
+# Category precedence used by classify_result_text (and the watch/old detectors).
+# "claimed" is the hard-success phrase list; "success" are the config patterns.
+DEFAULT_ORDER = ("claimed", "missed", "fail", "success")
+
+_CATEGORY_STATUS = {"claimed": "success", "missed": "missed", "fail": "fail", "success": "success"}
+
 
 def norm_text(s: str) -> str:
     return re.sub(r"\s+", " ", str(s)).strip().lower()
@@ -41,34 +50,163 @@ def match_phrase_detail(tnorm: str, lines: list[str], phrases: list[str]) -> tup
     return False, ""
 
 
+def _norm_phrases(phrases) -> list[str]:
+    out: list[str] = []
+    for x in phrases or []:
+        p = norm_text(x) if str(x or "").strip() else ""
+        if p and p not in out:
+            out.append(p)
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class ResultMatch:
+    category: str  # claimed | missed | fail | success | none
+    phrase: str
+    line: str
+
+    @property
+    def status(self) -> str:
+        return _CATEGORY_STATUS.get(self.category, "none")
+
+
+_NO_MATCH = ResultMatch("none", "", "")
+
+
+class ResultMatcher:
+    """Result phrase matcher compiled once per pattern set.
+
+    One regex pass over the normalized text finds every position where any
+    phrase starts; per category the alternation order keeps the lowest-index
+    phrase, so the result is identical to scanning the phrase lists one by one.
+    """
+
+    def __init__(self, success_patterns=None, fail_patterns=None):
+        self.groups: dict[str, list[str]] = {
+            "claimed": _norm_phrases(ALREADY_CLAIMED_SUCCESS_PHRASES),
+            "missed": _norm_phrases(HARD_MISSED_PHRASES),
+            "fail": _norm_phrases(fail_patterns),
+        }
+        # Success patterns keep duplicates: "first two" is positional.
+        self.success: list[str] = [norm_text(x) for x in (success_patterns or []) if str(x or "").strip()]
+        self._rank = {cat: {p: i for i, p in reversed(list(enumerate(ps)))} for cat, ps in self.groups.items()}
+
+        everything = self.phrases
+        self._regex = None
+        if everything:
+            # Zero-width matches: a cheap "some phrase starts here" gate, then one
+            # optional lookahead per category and per success pattern.
+            parts = ["(?=" + "|".join(re.escape(p) for p in everything) + ")"]
+            self._cats: list[str] = []
+            for cat, phrases in self.groups.items():
+                if phrases:
+                    parts.append("(?=(" + "|".join(re.escape(p) for p in phrases) + ")|)")
+                    self._cats.append(cat)
+            for p in self.success:
+                parts.append("(?=(" + re.escape(p) + ")|)")
+            self._regex = re.compile("".join(parts))
+
+    @property
+    def phrases(self) -> list[str]:
+        """All normalized phrases (deduped), e.g. for the in-page observer."""
+        out: list[str] = []
+        for p in [*self.groups["claimed"], *self.groups["missed"], *self.groups["fail"], *self.success]:
+            if p not in out:
+                out.append(p)
+        return out
+
+    def match(self, text: str, *, order=DEFAULT_ORDER, success_any: bool = False) -> ResultMatch:
+        """Return the first category in `order` that matches, with its phrase and line.
+
+        success_any: a single success pattern is enough (warm-session rule);
+        otherwise all patterns must share a line, or the first two appear anywhere.
+        """
+        if self._regex is None:
+            return _NO_MATCH
+        lines = [" ".join(l.split()) for l in str(text or "").splitlines()]
+        lines = [l for l in lines if l]
+        lows = [l.lower() for l in lines]
+        tnorm = " ".join(lows)
+
+        starts: list[int] = []
+        pos = 0
+        for low in lows:
+            starts.append(pos)
+            pos += len(low) + 1
+
+        # best[cat] = (phrase index, phrase); first_line[phrase] = first line fully containing it
+        best: dict[str, tuple[int, str]] = {}
+        first_line: dict[str, int] = {}
+        succ_seen: set[int] = set()
+        succ_lines: dict[int, set[int]] = {}
+        n_cats = len(self._cats)
+        for m in self._regex.finditer(tnorm):
+            at = m.start()
+            li = bisect_right(starts, at) - 1
+            line_end = starts[li] + len(lows[li])
+            for gi, cat in enumerate(self._cats):
+                p = m.group(gi + 1)
+                if p is None:
+                    continue
+                idx = self._rank[cat][p]
+                cur = best.get(cat)
+                if cur is None or idx < cur[0]:
+                    best[cat] = (idx, p)
+                if p not in first_line and at + len(p) <= line_end:
+                    first_line[p] = li
+            for si, p in enumerate(self.success):
+                if m.group(n_cats + si + 1) is None:
+                    continue
+                succ_seen.add(si)
+                if at + len(p) <= line_end:
+                    succ_lines.setdefault(li, set()).add(si)
+                    if p not in first_line:
+                        first_line[p] = li
+
+        def _detail(p: str) -> str:
+            li = first_line.get(p)
+            return lines[li] if li is not None else p
+
+        for cat in order:
+            if cat != "success":
+                hit = best.get(cat)
+                if hit is not None:
+                    return ResultMatch(cat, hit[1], _detail(hit[1]))
+                continue
+            if not self.success:
+                continue
+            if success_any:
+                for si, p in enumerate(self.success):
+                    if si in succ_seen:
+                        return ResultMatch("success", p, _detail(p))
+                continue
+            need = set(range(len(self.success)))
+            for li in sorted(succ_lines):
+                if succ_lines[li] >= need:
+                    return ResultMatch("success", self.success[0], lines[li])
+            if len(self.success) >= 2 and {0, 1} <= succ_seen:
+                return ResultMatch("success", self.success[0], _detail(self.success[0]))
+        return _NO_MATCH
+
+    def classify(self, text: str, *, order=DEFAULT_ORDER, success_any: bool = False) -> tuple[str, str]:
+        """(status, detail) where status is success|missed|fail|none."""
+        m = self.match(text, order=order, success_any=success_any)
+        return m.status, m.line
+
+
+@lru_cache(maxsize=16)
+def _cached_matcher(success: tuple[str, ...], fail: tuple[str, ...]) -> ResultMatcher:
+    return ResultMatcher(list(success), list(fail))
+
+
+def get_result_matcher(success_patterns, fail_patterns) -> ResultMatcher:
+    """Compiled matcher for this pattern set (built once, then reused)."""
+    succ = tuple(str(x) for x in (success_patterns or []))
+    fail = tuple(str(x) for x in (fail_patterns or []))
+    return _cached_matcher(succ, fail)
+
+
 def classify_result_text(
     text: str, success_patterns: list[str] | None, fail_patterns: list[str] | None
 ) -> tuple[str, str]:
-    tnorm = norm_text(text)
-    lines = split_lines(text)
-
-    ok, detail = match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-    if ok:
-        return "success", detail
-
-    ok, detail = match_phrase_detail(tnorm, lines, HARD_MISSED_PHRASES)
-    if ok:
-        return "missed", detail
-
-    fail = [norm_text(x) for x in (fail_patterns or []) if str(x).strip()]
-    for pat in fail:
-        if pat and pat in tnorm:
-            detail = next((l for l in lines if pat in l.lower()), pat)
-            return "fail", detail
-
-    succ = [norm_text(x) for x in (success_patterns or []) if str(x).strip()]
-    if succ:
-        for l in lines:
-            low = l.lower()
-            if all(p in low for p in succ):
-                return "success", l
-        if len(succ) >= 2 and all(p in tnorm for p in succ[:2]):
-            detail = next((l for l in lines if succ[0] in l.lower()), succ[0])
-            return "success", detail
-
-    return "none", ""
+    return get_result_matcher(success_patterns, fail_patterns).classify(text)
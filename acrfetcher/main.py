@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import asyncio
 import csv
+import importlib.util
 import json
 import logging
 import os
@@ -9,17 +10,35 @@ import random
 import re
 import shutil
 import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple, Union
 
 from telethon import TelegramClient, events
-from telethon import functions, types
-from telethon.errors.rpcerrorlist import UserNotParticipantError, ChannelPrivateError
+from telethon import functions, types, utils as tl_utils
+from telethon.errors.rpcerrorlist import UserNotParticipantError, ChannelPrivateError, ChannelInvalidError
 import urllib.request
 import urllib.parse
 import ssl
 
 from ui_theme import theme
+from .accounts_store import effective_roles, parse_account_role, role_detects, role_opens
+from .detector import get_result_matcher
+from .resource_filter import ResourceFilter
+from .dedupe import DedupeStore
+from .post_store import PostStore
+from .rpc_stats import RpcStats
+from .channel_cache import ChannelCache
+from .models import RowState, UiEvent
+from .ui_watch import RowRenderCache, UiStateReducer
+from .utils import pad_display
+from .pw_driver import SharedPlaywright, driver_gone
+from .stats_store import StatsStore
+from .status_log import StatusLog
+from .tracing import Tracer
 # Telethon proxy support relies on PySocks.
 # We use socks constants (e.g., socks.HTTP) to avoid ambiguity across Telethon versions.
 try:
@@ -51,6 +70,10 @@ APP_VERSION = "0.1.55"
 
 _WEBHOOK_CFG = {}
 _WARM_CACHE: dict[str, "WarmBrowserSession"] = {}
+_SHARED_BROWSERS: Optional["SharedBrowserPool"] = None
+_POOL_CLOSE_TASKS: set = set()  # close_if_idle() of replaced pools (keeps a reference)
+# One Playwright driver (Node process) for every warm session, pool and cold detection.
+_PLAYWRIGHT = SharedPlaywright()
 _SUPPRESS_PREFLIGHT_ONCE = False
 _RUNTIME_PREFLIGHT_DONE = False
 DEFAULT_CONFIG: dict = {
@@ -87,6 +110,300 @@ DEFAULT_CONFIG: dict = {
 }
 
 
+def _warm_page_pool_size(cfg: dict) -> int:
+    """Pre-created tabs per warm session (1..8). 1 = single reused page (old behavior)."""
+    try:
+        n = int(cfg.get("warm_page_pool_size", 1) or 1)
+    except Exception:
+        n = 1
+    return max(1, min(8, n))
+
+
+def _browser_mode(cfg: dict) -> str:
+    """Warm browser layout: "per_account" (one Chromium each) or "shared" (contexts in K browsers)."""
+    mode = str(cfg.get("browser_mode", "per_account") or "per_account").strip().lower().replace("-", "_")
+    return mode if mode in ("per_account", "shared") else "per_account"
+
+
+def _result_detect_mode(cfg: dict) -> str:
+    """Result detection mode: "poll" (inner_text every result_poll_ms) or "push" (in-page observer)."""
+    mode = str(cfg.get("result_detect_mode", "poll") or "poll").strip().lower()
+    return mode if mode in ("poll", "push") else "poll"
+
+
+def _log_filter_stats(flt: Optional[ResourceFilter], url: str) -> None:
+    """Report one open's blocked requests / estimated bytes saved to the runtime log."""
+    if flt is None:
+        return
+    try:
+        st = flt.take_stats()
+        if st.blocked or st.allowed:
+            logging.getLogger("net").info("resource filter %s | %s", st.summary(), safe_url(url))
+    except Exception:
+        pass
+
+
+_RESULT_TEXT_BINDING = "__acrResultText"
+_RESULT_PHRASES_BINDING = "__acrResultPhrases"
+
+# Injected into every document of an observed page (top frame only).
+# Body text is matched against the phrase list INSIDE the page; Python is
+# only called when a known result phrase is present.
+_RESULT_OBSERVER_JS = r"""
+(() => {
+  if (window.top !== window || window.__acrResultObserver) return;
+  window.__acrResultObserver = true;
+  const norm = (s) => String(s || "").replace(/\s+/g, " ").trim().toLowerCase();
+  let phrases = null;
+  let last = "";
+  let queued = false;
+  const scan = () => {
+    queued = false;
+    if (!phrases || !document.body) return;
+    const raw = document.body.innerText || "";
+    const t = norm(raw);
+    if (t === last) return;
+    last = t;
+    if (phrases.some((p) => p && t.includes(p))) {
+      window.__acrResultText(raw);
+    }
+  };
+  const schedule = () => {
+    if (queued) return;
+    queued = true;
+    setTimeout(scan, 0);
+  };
+  window.__acrResultRescan = () => { last = ""; schedule(); };
+  const observe = () => {
+    new MutationObserver(schedule).observe(document.documentElement || document, {
+      childList: true, subtree: true, characterData: true,
+    });
+    schedule();
+  };
+  window.__acrResultPhrases().then((p) => { phrases = p || []; schedule(); }, () => {});
+  if (document.documentElement) observe();
+  else document.addEventListener("DOMContentLoaded", observe, { once: true });
+})();
+"""
+
+
+class ResultTextObserver:
+    """Push-based result detection for one Playwright page.
+
+    A MutationObserver inside the page matches body text against the known
+    result phrases and hands the text to Python the moment one appears, so we
+    don't pull the whole body over CDP every result_poll_ms.
+    """
+
+    def __init__(self, phrases: Optional[list] = None):
+        self.phrases: list[str] = [str(p) for p in (phrases or []) if p]
+        self._texts: asyncio.Queue[str] = asyncio.Queue(maxsize=8)
+
+    def _on_text(self, text) -> None:
+        if self._texts.full():
+            try:
+                self._texts.get_nowait()
+            except Exception:
+                pass
+        try:
+            self._texts.put_nowait(str(text or ""))
+        except Exception:
+            pass
+
+    def _get_phrases(self) -> list[str]:
+        return list(self.phrases)
+
+    async def install(self, page) -> bool:
+        """Expose bindings + init script on the page (before navigation)."""
+        try:
+            await page.expose_function(_RESULT_TEXT_BINDING, self._on_text)
+            await page.expose_function(_RESULT_PHRASES_BINDING, self._get_phrases)
+            await page.add_init_script(_RESULT_OBSERVER_JS)
+            return True
+        except Exception:
+            return False
+
+    def prime(self, phrases: list) -> None:
+        """Set phrases for the next navigation (read by each new document)."""
+        self.phrases = [str(p) for p in (phrases or []) if p]
+        self.drain()
+
+    def drain(self) -> None:
+        try:
+            while True:
+                self._texts.get_nowait()
+        except Exception:
+            pass
+
+    async def rearm(self, page) -> None:
+        """Drop signals from the previous document and rescan the current one."""
+        self.drain()
+        try:
+            await page.evaluate("() => window.__acrResultRescan && window.__acrResultRescan()")
+        except Exception:
+            pass
+
+    async def next_text(self, timeout_s: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._texts.get(), timeout=max(0.0, float(timeout_s)))
+        except asyncio.TimeoutError:
+            return None
+
+
+# Launch flags: aim for faster first paint / less background noise.
+_CHROMIUM_LAUNCH_ARGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-sync",
+    "--disable-features=TranslateUI",
+)
+
+
+class SharedBrowserPool:
+    """K Chromium processes hosting many isolated per-account contexts.
+
+    browser_mode="shared": instead of one launch_persistent_context per account,
+    each account gets browser.new_context() (own proxy + storage_state) inside the
+    least-loaded pooled browser. Browsers are launched lazily and relaunched if
+    they disconnect; everything stops when the last context is released.
+    """
+
+    def __init__(self, *, size: int = 1, headless: bool = True):
+        self.size = max(1, int(size or 1))
+        self.headless = bool(headless)
+        self._pw = None
+        self._browsers: list = [None] * self.size
+        self._load: list[int] = [0] * self.size
+        self._owner: dict = {}  # context -> browser slot
+        self._lock = asyncio.Lock()
+        self._slot_locks = [asyncio.Lock() for _ in range(self.size)]
+
+    async def new_context(self, *, proxy: Optional[dict] = None, storage_state: Optional[Path] = None):
+        async with self._lock:
+            if self._pw is not None and not _PLAYWRIGHT.is_current(self._pw):
+                self._pw = None  # the driver died and was replaced; its browsers are gone
+            if self._pw is None:
+                self._pw = await _PLAYWRIGHT.acquire()
+            pw = self._pw
+            slot = min(range(self.size), key=lambda i: self._load[i])
+            # Reserve the slot now: concurrent callers spread over the pool and the
+            # browsers are not closed while this context is being created.
+            self._load[slot] += 1
+        try:
+            browser = await self._slot_browser(slot, pw)
+            ctx_kwargs = {}
+            if proxy:
+                ctx_kwargs["proxy"] = proxy
+            if storage_state is not None and storage_state.exists():
+                ctx_kwargs["storage_state"] = str(storage_state)
+            ctx = await browser.new_context(**ctx_kwargs)
+        except BaseException:
+            self._load[slot] = max(0, self._load[slot] - 1)
+            raise
+        self._owner[ctx] = slot
+        return ctx
+
+    async def _slot_browser(self, slot: int, pw):
+        """The slot's browser, launched on demand. Only this slot waits for a cold launch."""
+        async with self._slot_locks[slot]:
+            browser = self._browsers[slot]
+            try:
+                alive = browser is not None and browser.is_connected()
+            except Exception:
+                alive = False
+            if alive:
+                return browser
+            try:
+                browser = await pw.chromium.launch(
+                    headless=self.headless,
+                    args=list(_CHROMIUM_LAUNCH_ARGS),
+                )
+            except Exception as e:
+                if driver_gone(e):
+                    _PLAYWRIGHT.invalidate(pw)
+                    if self._pw is pw:
+                        self._pw = None
+                raise
+            self._browsers[slot] = browser
+            return browser
+
+    async def release_context(self, ctx) -> None:
+        async with self._lock:
+            slot = self._owner.pop(ctx, None)
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+            if slot is not None:
+                self._load[slot] = max(0, self._load[slot] - 1)
+            if any(self._load):
+                return
+            await self._close_browsers()
+
+    async def _close_browsers(self) -> None:
+        for i, browser in enumerate(self._browsers):
+            try:
+                if browser is not None:
+                    await browser.close()
+            except Exception:
+                pass
+            self._browsers[i] = None
+        if self._pw is not None:
+            _PLAYWRIGHT.release(self._pw)
+        self._pw = None
+
+    async def close_if_idle(self) -> None:
+        """Stop the browsers if no context is checked out (otherwise the last release does)."""
+        async with self._lock:
+            if not any(self._load):
+                await self._close_browsers()
+
+    @property
+    def contexts(self) -> int:
+        return len(self._owner)
+
+    def stats(self) -> list[int]:
+        """Open contexts per pooled browser."""
+        return list(self._load)
+
+
+def _pool_close_done(t: asyncio.Task) -> None:
+    _POOL_CLOSE_TASKS.discard(t)
+    try:
+        if not t.cancelled() and t.exception() is not None:
+            logging.getLogger("browser").warning("closing replaced browser pool failed: %r", t.exception())
+    except Exception:
+        pass
+
+
+def _shared_browser_pool(cfg: dict, headless: bool) -> "SharedBrowserPool":
+    """Process-wide pool, rebuilt when shared_browser_count or headless changed.
+
+    A replaced pool keeps serving the contexts it already handed out and stops
+    its browsers when the last one is released (right away if it is idle).
+    """
+    global _SHARED_BROWSERS
+    try:
+        k = int(cfg.get("shared_browser_count", 1) or 1)
+    except Exception:
+        k = 1
+    size = max(1, min(16, k))
+    old = _SHARED_BROWSERS
+    if old is None or old.size != size or old.headless != bool(headless):
+        _SHARED_BROWSERS = SharedBrowserPool(size=size, headless=headless)
+        if old is not None:
+            try:
+                t = asyncio.get_running_loop().create_task(old.close_if_idle())
+                _POOL_CLOSE_TASKS.add(t)
+                t.add_done_callback(_pool_close_done)
+            except Exception:
+                pass
+    return _SHARED_BROWSERS
+
 
 class WarmBrowserSession:
     """Per-account Playwright session that stays alive between tasks.
@@ -101,6 +418,16 @@ class WarmBrowserSession:
     Notes:
       - We keep the default (mode "off") behavior identical to older builds.
       - For mode "use", we run a non-persistent context so we can load storage_state.
+
+    Shared mode (shared_pool given):
+      - the context comes from SharedBrowserPool; storage_state is loaded from
+        and saved back to <profile_dir>/storage_state.json (or storage_state_path
+        in "use" mode).
+
+    Page pool:
+      - start() pre-creates page_pool_size about:blank tabs; acquire_page() hands
+        one out and release_page() recycles it, so back-to-back posts can open
+        in parallel without paying new_page() on the hot path.
     """
 
     def __init__(
@@ -112,6 +439,10 @@ class WarmBrowserSession:
         wait_until: str = "commit",
         storage_state_mode: str = "off",
         storage_state_path: Optional[Path] = None,
+        push_detect: bool = False,
+        page_pool_size: int = 1,
+        shared_pool: Optional[SharedBrowserPool] = None,
+        resource_filter_cfg: Optional[dict] = None,
     ):
         self.profile_dir = profile_dir
         self.proxy = proxy if proxy else None
@@ -119,13 +450,26 @@ class WarmBrowserSession:
         self.wait_until = (wait_until or "commit").strip() or "commit"
         self.storage_state_mode = (storage_state_mode or "off").strip().lower()
         self.storage_state_path = storage_state_path
+        self.push_detect = bool(push_detect)
+        self.page_pool_size = max(1, int(page_pool_size or 1))
+        self.shared_pool = shared_pool
+        self.resource_filter_cfg = resource_filter_cfg
 
         self._pw = None
         self._browser = None  # only used for non-persistent contexts
         self._ctx = None
-        self._page = None
+        self._page = None  # first pool page (capture / legacy goto)
         self._lock = asyncio.Lock()
         self._capture_done = False
+        self._observers: dict = {}  # page -> ResultTextObserver
+        self._filters: dict = {}  # page -> ResourceFilter
+        self._observer_phrases: list[str] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._leased: dict = {}  # page -> pool generation it was handed out in
+        self._pages: set = set()  # pool pages of the current generation
+        self._restart_lock = asyncio.Lock()
+        self._pool_gen = 0  # bumped on close(); stale pages are not recycled
+        self._recycle_tasks: set = set()
 
     def _resolved_storage_path(self) -> Optional[Path]:
         if self.storage_state_mode in ("off", ""):
@@ -139,59 +483,94 @@ class WarmBrowserSession:
             pass
         return p
 
+    def _shared_storage_path(self) -> Path:
+        if self.storage_state_mode == "use":
+            sp = self._resolved_storage_path()
+            if sp is not None:
+                return sp
+        return self.profile_dir / "storage_state.json"
+
     async def start(self) -> None:
         async with self._lock:
-            if self._pw and self._ctx and self._page:
+            if self._ctx and self._page:
                 return
             try:
                 self.profile_dir.mkdir(parents=True, exist_ok=True)
             except Exception:
                 pass
 
-            from playwright.async_api import async_playwright
-            self._pw = await async_playwright().start()
+            if self.shared_pool is not None:
+                # Shared mode: an isolated context inside a pooled Chromium.
+                self._ctx = await self.shared_pool.new_context(
+                    proxy=self.proxy,
+                    storage_state=self._shared_storage_path(),
+                )
+                await self._fill_page_pool()
+                return
+
+            if self._pw is not None and not _PLAYWRIGHT.is_current(self._pw):
+                self._pw = None  # the driver died and was replaced
+            if self._pw is None:
+                self._pw = await _PLAYWRIGHT.acquire()
 
             # Launch flags: aim for faster first paint / less background noise.
             # (Safe defaults; do NOT change any user-visible behavior.)
-            launch_args = [
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-default-apps",
-                "--disable-extensions",
-                "--disable-background-networking",
-                "--disable-background-timer-throttling",
-                "--disable-sync",
-                "--disable-features=TranslateUI",
-            ]
+            launch_args = list(_CHROMIUM_LAUNCH_ARGS)
 
             mode = self.storage_state_mode
-            # "use" mode: we need a regular context to import storage_state.
-            if mode == "use":
-                self._browser = await self._pw.chromium.launch(
-                    headless=self.headless,
-                    proxy=self.proxy,
-                    args=launch_args,
-                )
-                ctx_kwargs = {}
-                sp = self._resolved_storage_path()
-                if sp is not None and sp.exists():
-                    ctx_kwargs["storage_state"] = str(sp)
-                self._ctx = await self._browser.new_context(**ctx_kwargs)
-            else:
-                # Default behavior: persistent profile folder (keeps you logged in).
-                self._ctx = await self._pw.chromium.launch_persistent_context(
-                    user_data_dir=str(self.profile_dir),
-                    headless=self.headless,
-                    proxy=self.proxy,
-                    args=launch_args,
-                )
-
-            self._page = await self._ctx.new_page()
-            # Keep a lightweight page open so the window exists immediately on first navigation.
             try:
-                await self._page.goto("about:blank", wait_until="commit", timeout=3000)
-            except Exception:
-                pass
+                # "use" mode: we need a regular context to import storage_state.
+                if mode == "use":
+                    self._browser = await self._pw.chromium.launch(
+                        headless=self.headless,
+                        proxy=self.proxy,
+                        args=launch_args,
+                    )
+                    ctx_kwargs = {}
+                    sp = self._resolved_storage_path()
+                    if sp is not None and sp.exists():
+                        ctx_kwargs["storage_state"] = str(sp)
+                    self._ctx = await self._browser.new_context(**ctx_kwargs)
+                else:
+                    # Default behavior: persistent profile folder (keeps you logged in).
+                    self._ctx = await self._pw.chromium.launch_persistent_context(
+                        user_data_dir=str(self.profile_dir),
+                        headless=self.headless,
+                        proxy=self.proxy,
+                        args=launch_args,
+                    )
+            except Exception as e:
+                if driver_gone(e):
+                    _PLAYWRIGHT.invalidate(self._pw)
+                    self._pw = None
+                raise
+
+            await self._fill_page_pool()
+
+    async def _fill_page_pool(self) -> None:
+        for _ in range(self.page_pool_size):
+            page = await self._new_pool_page()
+            if self._page is None:
+                self._page = page
+            self._idle.put_nowait(page)
+
+    async def _new_pool_page(self):
+        page = await self._ctx.new_page()
+        self._pages.add(page)
+        if self.resource_filter_cfg is not None:
+            flt = ResourceFilter.from_config(self.resource_filter_cfg)
+            if flt is not None and await flt.install(page):
+                self._filters[page] = flt
+        if self.push_detect:
+            obs = ResultTextObserver(self._observer_phrases)
+            if await obs.install(page):
+                self._observers[page] = obs
+        # Keep a lightweight page open so the window exists immediately on first navigation.
+        try:
+            await page.goto("about:blank", wait_until="commit", timeout=3000)
+        except Exception:
+            pass
+        return page
 
     async def maybe_capture_storage_state(self) -> None:
         """Capture storage_state once (interactive) for cross-platform server use."""
@@ -226,19 +605,64 @@ class WarmBrowserSession:
             except Exception:
                 print(f"storage_state save failed: {type(e).__name__}: {e}")
 
-    async def goto(self, url: str, *, timeout_ms: int = 15000):
-        """Navigate quickly. Returns the page."""
+    async def acquire_page(self):
+        """Take an idle pool page (waits if all are busy). Pair with release_page()."""
+        await self.start()
+        page = await self._idle.get()
+        try:
+            closed = page.is_closed()
+        except Exception:
+            closed = True
+        if closed:
+            # Tab was closed by hand (headed mode) or crashed: replace it.
+            self._pages.discard(page)
+            self._observers.pop(page, None)
+            self._filters.pop(page, None)
+            was_first = page is self._page
+            page = await self._new_pool_page()
+            if was_first:
+                self._page = page
+        self._leased[page] = self._pool_gen
+        return page
+
+    def release_page(self, page) -> None:
+        """Return a page to the pool. Headless pages are blanked in the background first."""
+        if self._leased.pop(page, None) != self._pool_gen:
+            return
+        obs = self._observers.get(page)
+        if obs is not None:
+            obs.drain()
+        if not self.headless:
+            # Headed: leave the result on screen until the tab is reused.
+            self._idle.put_nowait(page)
+            return
+
+        async def _recycle(gen: int):
+            try:
+                await page.goto("about:blank", wait_until="commit", timeout=3000)
+            except Exception:
+                pass
+            if gen == self._pool_gen:
+                self._idle.put_nowait(page)
+
+        t = asyncio.create_task(_recycle(self._pool_gen))
+        self._recycle_tasks.add(t)
+        t.add_done_callback(self._recycle_tasks.discard)
+
+    async def goto(self, url: str, *, timeout_ms: int = 15000, page=None):
+        """Navigate quickly. Returns the page (a fresh pool page if the browser had to restart)."""
         await self.start()
+        if page is None:
+            page = self._page
         try:
-            await self._page.goto(url, wait_until=self.wait_until, timeout=int(timeout_ms))
+            await page.goto(url, wait_until=self.wait_until, timeout=int(timeout_ms))
         except Exception as e:
             # If the browser was closed/crashed, restart once.
             msg = str(e).lower()
             if "target closed" in msg or "browser has been closed" in msg or "context closed" in msg:
-                await self.close()
-                await self.start()
+                page = await self._reopen(page)
                 try:
-                    await self._page.goto(url, wait_until=self.wait_until, timeout=int(timeout_ms))
+                    await page.goto(url, wait_until=self.wait_until, timeout=int(timeout_ms))
                 except Exception:
                     pass
             else:
@@ -251,10 +675,53 @@ class WarmBrowserSession:
         except Exception:
             pass
 
-        return self._page
+        return page
+
+    async def _reopen(self, page):
+        """Replace a dead page; restart the browser only when its context is gone."""
+        if page not in self._pages:
+            # Page from before a restart another holder already did: take a current one.
+            await self.start()
+            return await self.acquire_page()
+        leased = page in self._leased
+        gen = self._pool_gen
+        if self._ctx is not None:
+            # Just this tab died: swap it for a fresh one, other leased pages keep working.
+            try:
+                fresh = await self._new_pool_page()
+            except Exception:
+                fresh = None
+            if fresh is not None:
+                self._pages.discard(page)
+                self._observers.pop(page, None)
+                self._filters.pop(page, None)
+                if leased:
+                    self._leased[fresh] = self._leased.pop(page)
+                if page is self._page:
+                    self._page = fresh
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+                return fresh
+        # The context/browser is gone: restart it once. Other holders' pages are dead too;
+        # they skip the restart (generation moved on) and take a page from the new pool.
+        async with self._restart_lock:
+            if self._pool_gen == gen:
+                await self.close()
+        await self.start()
+        return (await self.acquire_page()) if leased else self._page
 
     async def close(self) -> None:
         async with self._lock:
+            if self.shared_pool is not None and self._ctx is not None:
+                # Save cookies/localStorage where start() loads them from for the next run.
+                try:
+                    await self._ctx.storage_state(path=str(self._shared_storage_path()))
+                except Exception:
+                    pass
+                await self.shared_pool.release_context(self._ctx)
+                self._ctx = None
             try:
                 if self._ctx:
                     await self._ctx.close()
@@ -265,15 +732,35 @@ class WarmBrowserSession:
                     await self._browser.close()
             except Exception:
                 pass
-            try:
-                if self._pw:
-                    await self._pw.stop()
-            except Exception:
-                pass
+            if self._pw is not None:
+                _PLAYWRIGHT.release(self._pw)
             self._pw = None
             self._browser = None
             self._ctx = None
             self._page = None
+            self._observers = {}
+            self._filters = {}
+            self._leased = {}
+            self._pages = set()
+            # Same queue object: acquire_page() waiters get the restarted pages.
+            while not self._idle.empty():
+                self._idle.get_nowait()
+            self._pool_gen += 1
+
+    def result_observer(self, page=None) -> Optional[ResultTextObserver]:
+        """In-page result observer for a pool page (push detection), or None when polling."""
+        return self._observers.get(page if page is not None else self._page)
+
+    def resource_filter(self, page) -> Optional[ResourceFilter]:
+        """Request filter attached to a pool page (None when resource_filter_enabled is off)."""
+        return self._filters.get(page)
+
+    def prime_observer(self, phrases: list) -> None:
+        """Phrases for the next goto (kept across browser restarts)."""
+        self._observer_phrases = list(phrases or [])
+        for obs in list(self._observers.values()):
+            # No drain here: other pool pages may be mid-detection (rearm drains per page).
+            obs.phrases = [str(p) for p in self._observer_phrases if p]
 
 
 def _default_data_dir() -> Path:
@@ -331,6 +818,8 @@ BUNDLED_ART_PATH = ASSETS_DIR / "menu_art.txt"
 LEGACY_ART_PATH = APP_ROOT / "menu_art.txt"
 DEFAULT_ACCOUNTS_PATH = DATA_DIR / "accounts.csv"
 LEGACY_ACCOUNTS_PATH = APP_ROOT / "accounts.csv"
+# Outcome counters (Got'em is derived from them); flushed off the event loop.
+_STATS = StatsStore(DATA_DIR / "state" / "stats.json")
 
 # Full-screen UI (prompt_toolkit/classic redraw) must not be corrupted by
 # background stdout/stderr noise. We keep all library logging in DATA_DIR/logs.
@@ -423,54 +912,9 @@ def _pad_ansi(s: str, width: int) -> str:
     Notes:
     - ANSI sequences have width 0.
     - Emoji / wide chars may have width 2 (terminal columns).
+    - Results are LRU-cached by (text, width); ASCII skips wcwidth (utils.pad_display).
     """
-    if width <= 0:
-        return ""
-    raw = s or ""
-    vis = _strip_ansi(raw)
-
-    # Display width helper (wcwidth if available, else len as fallback)
-    try:
-        from wcwidth import wcswidth, wcwidth
-    except Exception:
-        wcswidth = None
-        wcwidth = None
-
-    def _disp_w(txt: str) -> int:
-        if not txt:
-            return 0
-        if wcswidth:
-            w = wcswidth(txt)
-            return w if w >= 0 else len(txt)
-        return len(txt)
-
-    def _truncate_disp(txt: str, target: int) -> str:
-        """Truncate plain text to target display width (no ANSI)."""
-        if target <= 0:
-            return ""
-        if _disp_w(txt) <= target:
-            return txt
-        if target == 1:
-            return "…"
-        limit = target - 1  # room for ellipsis
-        out = []
-        w = 0
-        for ch in txt:
-            cw = (wcwidth(ch) if wcwidth else 1)
-            if cw < 0:
-                cw = 0
-            if w + cw > limit:
-                break
-            out.append(ch)
-            w += cw
-        return "".join(out) + "…"
-
-    vis_w = _disp_w(vis)
-    if vis_w > width:
-        # Truncate visible chars. To keep logic simple, drop ANSI on truncation.
-        return _truncate_disp(vis, width)
-
-    return raw + (" " * (width - vis_w))
+    return pad_display(s or "", int(width), "…")
 
 
 def zebraRow(idx: int, text: str) -> str:
@@ -514,6 +958,7 @@ def _truncate_middle_email(s: str, width: int) -> str:
     dom_keep = width - (user_keep + 2)
     return f"{user[:user_keep]}…@{domain[-dom_keep:]}"
 
+@lru_cache(maxsize=4096)
 def _fit_cell(text: str, width: int, kind: str = "right") -> str:
     """Fit plain (non-ANSI) text into width with ellipsis."""
     if kind == "email":
@@ -521,6 +966,7 @@ def _fit_cell(text: str, width: int, kind: str = "right") -> str:
     return _truncate_right(text, width)
 
 
+@lru_cache(maxsize=1024)
 def formatProxyMasked(raw: str, width: Optional[int] = None) -> str:
     s = (raw or "").strip()
     if not s or s in ("-", "—"):
@@ -646,6 +1092,8 @@ def colorizeStatus(code: str, detail: str = "") -> str:
     if c in ("DELAY",):
         d = (detail or "").strip()
         return theme.amber_text(f"⏳ DELAY {d}".strip() if d else "⏳ DELAY")
+    if c in ("CATCHUP", "CATCH_UP"):
+        return theme.cyan_text(f"⏪ CATCHUP {d}".strip() if d else "⏪ CATCHUP")
     if c in ("SUCCESS", "DONE"):
         return theme.lime_text("✅ SUCCESS")
     if c in ("MISSED", "MIST"):
@@ -809,7 +1257,7 @@ def parse_http_proxy(spec: str) -> Optional[dict]:
     return {"server": server}
 
 def load_accounts_csv(csv_path: Path) -> list[dict]:
-    """Load accounts.csv with columns: phone,email,proxy."""
+    """Load accounts.csv with columns: phone,email,proxy[,role]."""
     if csv_path.is_dir():
         csv_path = csv_path / "accounts.csv"
     if not csv_path.exists():
@@ -821,6 +1269,7 @@ def load_accounts_csv(csv_path: Path) -> list[dict]:
             phone = (r.get("phone") or r.get("Phone") or "").strip()
             email = (r.get("email") or r.get("Email") or "").strip()
             proxy_raw = (r.get("proxy") or r.get("Proxy") or "").strip()
+            role = parse_account_role(r.get("role") or r.get("Role") or "")
             if not phone:
                 continue
             rows.append({
@@ -829,6 +1278,7 @@ def load_accounts_csv(csv_path: Path) -> list[dict]:
                 "proxy_raw": proxy_raw,
                 "proxy": parse_http_proxy(proxy_raw),
                 "tg_proxy": parse_telethon_http_proxy(proxy_raw),
+                "role": role,
             })
     if not rows:
         raise ValueError("accounts.csv has no valid rows (need at least one with phone).")
@@ -1058,7 +1508,30 @@ def webhook_detect_chat_id(seconds: int = 20) -> tuple[bool, str]:
 
 
 def save_config(cfg: dict) -> None:
-    CONFIG_PATH.write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+    # tmp + os.replace: a crash mid-write never leaves a torn config.json.
+    tmp = CONFIG_PATH.with_name(CONFIG_PATH.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(cfg, ensure_ascii=False, indent=2))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, CONFIG_PATH)
+
+
+def gotem_count(cfg: dict) -> int:
+    """Got'em from the stats store (seeded once from the legacy config value)."""
+    try:
+        legacy = int(cfg.get("gotem", 0) or 0)
+        if legacy > 0:
+            _STATS.seed_gotem(legacy)
+            # Migrated: drop the legacy value so deleting stats.json really resets the counters.
+            cfg["gotem"] = 0
+            try:
+                save_config(cfg)
+            except Exception:
+                pass
+        return _STATS.gotem
+    except Exception:
+        return int(cfg.get("gotem", 0) or 0)
 
 def load_art() -> str:
     for pth in (BUNDLED_ART_PATH, LEGACY_ART_PATH):
@@ -1122,7 +1595,7 @@ def render_menu(cfg: dict) -> str:
     channel = str(cfg.get("channel", ""))
     pre = str(cfg.get("pre_open_delay_ms", ""))
     # cooldown removed in 0.1.20
-    got = str(cfg.get("gotem", 0))
+    got = str(gotem_count(cfg))
 
     def _center_ansi(s: str, width: int) -> str:
         vis = _strip_ansi(s)
@@ -1476,32 +1949,30 @@ async def ainput(prompt: str = "") -> str:
     return await loop.run_in_executor(None, lambda: input(prompt))
 
 
-HARD_MISSED_PHRASES = [
-    "expired",
-    "offer has expired",
-    "this offer has expired",
-    "no longer",
-    "not available",
-    "not availible",
-    "unavailable",
-]
-ALREADY_CLAIMED_SUCCESS_PHRASES = [
-    "already been claimed",
-    "already claimed",
-    "offer has already been claimed",
-    "this offer has already been claimed",
-]
-
-
-def _match_phrase_detail(tnorm: str, lines: list[str], phrases: list[str]) -> tuple[bool, str]:
-    for phrase in phrases:
-        p = str(phrase or "").strip().lower()
-        if not p:
-            continue
-        if p in tnorm:
-            detail = next((l for l in lines if p in l.lower()), p)
-            return True, detail
-    return False, ""
+# Order used by the cold Playwright detector: config success patterns win over fail patterns.
+_COLD_DETECT_ORDER = ("claimed", "missed", "success", "fail")
+
+
+@asynccontextmanager
+async def _persistent_context(**kwargs):
+    """launch_persistent_context on the shared driver; the context is closed on exit."""
+    pw = await _PLAYWRIGHT.acquire()
+    context = None
+    try:
+        try:
+            context = await pw.chromium.launch_persistent_context(**kwargs)
+        except Exception as e:
+            if driver_gone(e):
+                _PLAYWRIGHT.invalidate(pw)
+            raise
+        yield context
+    finally:
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        _PLAYWRIGHT.release(pw)
 
 
 async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, poll_ms: int, success_patterns, fail_patterns, profile_dir_override: Optional[Path] = None, proxy: Optional[dict] = None, headless: Optional[bool] = None) -> tuple[str, str]:
@@ -1511,16 +1982,14 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
 
     Returns: ("success"|"fail"|"timeout"|"error", detail_line)
     """
-    try:
-        from playwright.async_api import async_playwright
-    except Exception as e:
-        return ("error", f"Playwright not available: {type(e).__name__}: {e}")
+    if importlib.util.find_spec("playwright") is None:
+        return ("error", "Playwright not available: not installed")
 
     def norm(s: str) -> str:
         return re.sub(r"\s+", " ", str(s)).strip().lower()
 
-    succ = [norm(x) for x in (success_patterns or []) if str(x).strip()]
-    fail = [norm(x) for x in (fail_patterns or []) if str(x).strip()]
+    matcher = get_result_matcher(success_patterns, fail_patterns)
+    res_filter = ResourceFilter.from_config(cfg)
 
     # profile dir (can be overridden per account)
     if profile_dir_override is not None:
@@ -1669,13 +2138,19 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
             "twitch.tv", "instagram.com", "x.com", "twitter.com", "kick.com", "youtube.com", "youtu.be"
         ])
 
-        async with async_playwright() as p:
-            context = await p.chromium.launch_persistent_context(
-                user_data_dir=str(profile_dir),
-                headless=headless,
-                proxy=proxy if proxy else None,
-            )
+        async with _persistent_context(
+            user_data_dir=str(profile_dir),
+            headless=headless,
+            proxy=proxy if proxy else None,
+        ) as context:
             page = await context.new_page()
+            if res_filter is not None:
+                await res_filter.install(page)
+            observer: Optional[ResultTextObserver] = None
+            if _result_detect_mode(cfg) == "push":
+                observer = ResultTextObserver(matcher.phrases)
+                if not await observer.install(page):
+                    observer = None
             # Detect when the user closes the browser window (headed mode).
             browser_closed = asyncio.Event()
             def _on_close(*args, **kwargs):
@@ -1718,7 +2193,7 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
                         pass
                 # No networkidle wait here on purpose.
 
-            async def read_text() -> tuple[str, list]:
+            async def read_text() -> str:
                 try:
                     text = await page.inner_text("body")
                 except Exception:
@@ -1726,36 +2201,7 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
                         text = await page.evaluate("() => document.body ? document.body.innerText : ''")
                     except Exception:
                         text = ""
-                raw_lines = [re.sub(r"\s+", " ", l).strip() for l in str(text).splitlines()]
-                lines = [l for l in raw_lines if l]
-                return (str(text or ""), lines)
-
-            def match_fail(tnorm: str, lines: list) -> tuple[bool, str]:
-                for pat in fail:
-                    if pat and pat in tnorm:
-                        detail = next((l for l in lines if pat in l.lower()), pat)
-                        return True, detail
-                return False, ""
-
-            def match_missed(tnorm: str, lines: list) -> tuple[bool, str]:
-                ok, detail = _match_phrase_detail(tnorm, lines, HARD_MISSED_PHRASES)
-                if ok:
-                    return True, detail
-                return False, ""
-
-            def match_success(tnorm: str, lines: list) -> tuple[bool, str]:
-                ok, detail = _match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-                if ok:
-                    return True, detail
-                if succ:
-                    for l in lines:
-                        low = l.lower()
-                        if all(p in low for p in succ):
-                            return True, l
-                    if len(succ) >= 2 and all(p in tnorm for p in succ[:2]):
-                        detail = next((l for l in lines if succ[0] in l.lower()), succ[0])
-                        return True, detail
-                return False, ""
+                return str(text or "")
 
             await nav_first()
 
@@ -1780,6 +2226,57 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
                     pass
                 return ("skip", f"blocked domain={blocked} | url={final_url or url}")
 
+            async def judge(text: str) -> Optional[tuple[str, str]]:
+                """Classify one body snapshot; closes the context on a final result."""
+                # hard-success phrases must stay SUCCESS; config success beats fail here
+                res, detail = matcher.classify(text, order=_COLD_DETECT_ORDER)
+                if res in ("success", "missed"):
+                    await context.close()
+                    return (res, detail)
+
+                if res == "fail":
+                    dump_path = ""
+                    if dump_enabled("dump_on_fail", True):
+                        dump_path = await dump_page_artifacts(page, (page.url or url), reason="fail", detail=str(detail))
+                    await context.close()
+                    if dump_path:
+                        return ("fail", f"{detail} | dump={dump_path}")
+                    return ("fail", detail)
+                return None
+
+            last_snip = ""
+            reload_first = False
+            if observer is not None:
+                # Push mode: same overall window as the check schedule, but the page
+                # signals us as soon as a result phrase appears.
+                await observer.rearm(page)
+                push_deadline = time.time() + (max(1, checks_per_cycle - 1) * interval_ms * reload_cycles) / 1000.0
+                while True:
+                    if browser_closed.is_set():
+                        try:
+                            await context.close()
+                        except Exception:
+                            pass
+                        return ("user_stop", "browser closed")
+                    remaining_s = min(push_deadline - time.time(), 300 - (time.time() - start_t))
+                    if remaining_s <= 0:
+                        break
+                    text = await observer.next_text(min(1.0, remaining_s))
+                    if text is None:
+                        continue
+                    found = await judge(text)
+                    if found is not None:
+                        return found
+                # Judge the final snapshot too: a late result, or one the observer
+                # missed (init script not run on this document), is still caught.
+                text = await read_text()
+                found = await judge(text)
+                if found is not None:
+                    return found
+                last_snip = norm(text)[:220] if text else ""
+                # Then the regular check schedule, starting with a reload to recover a stuck page.
+                reload_first = True
+
             for cycle in range(reload_cycles):
                 # Hard stop: if user closed the window (headed) or we exceed 5 minutes, stop.
                 if browser_closed.is_set():
@@ -1794,7 +2291,7 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
                     except Exception:
                         pass
                     return ("timeout", "auto-stop after 5m")
-                if cycle > 0:
+                if cycle > 0 or reload_first:
                     status_info(f"🔄 RELOAD {cycle+1}/{reload_cycles}")
                     await nav_reload()
 
@@ -1812,34 +2309,10 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
                             pass
                         return ("timeout", "auto-stop after 5m")
                     status_info(f"🔁 CHECK {chk+1}/{checks_per_cycle} (cycle {cycle+1}/{reload_cycles})")
-                    text, lines = await read_text()
-                    tnorm = norm(text)
-
-                    # hard-success phrases must stay SUCCESS
-                    ok, detail = _match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-                    if ok:
-                        await context.close()
-                        return ("success", detail)
-
-                    ok, detail = match_missed(tnorm, lines)
-                    if ok:
-                        await context.close()
-                        return ("missed", detail)
-
-                    ok, detail = match_success(tnorm, lines)
-                    if ok:
-                        await context.close()
-                        return ("success", detail)
-
-                    ok, detail = match_fail(tnorm, lines)
-                    if ok:
-                        dump_path = ""
-                        if dump_enabled("dump_on_fail", True):
-                            dump_path = await dump_page_artifacts(page, (page.url or url), reason="fail", detail=str(detail))
-                        await context.close()
-                        if dump_path:
-                            return ("fail", f"{detail} | dump={dump_path}")
-                        return ("fail", detail)
+                    text = await read_text()
+                    found = await judge(text)
+                    if found is not None:
+                        return found
 
                     last_snip = norm(text)[:220] if text else ""
                     # wait between checks
@@ -1863,12 +2336,11 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
         try:
             status_info("🔐 LOGIN NEEDED: a browser window will open. Login once, then press Enter here.")
             # run headed just to let user login; we don't attempt detection here
-            async with async_playwright() as p:
-                context = await p.chromium.launch_persistent_context(
-                    user_data_dir=str(profile_dir),
-                    headless=False,
-                    proxy=proxy if proxy else None,
-                )
+            async with _persistent_context(
+                user_data_dir=str(profile_dir),
+                headless=False,
+                proxy=proxy if proxy else None,
+            ) as context:
                 page = await context.new_page()
                 try:
                     await page.goto(url, wait_until="domcontentloaded")
@@ -1888,26 +2360,22 @@ async def detect_result_via_playwright(url: str, cfg: dict, timeout_ms: int, pol
         return await run_once(headless=bool(headless))
     except Exception as e:
         return ("error", f"{type(e).__name__}: {e}")
+    finally:
+        _log_filter_stats(res_filter, url)
 
 
 async def detect_result_playwright_keep_open(url: str, cfg: dict, timeout_ms: int, poll_ms: int, success_patterns, fail_patterns, profile_dir: Path, proxy: Optional[dict], headless: bool) -> tuple[str, str, object, object]:
     """Like detect_result_via_playwright(), but keeps Chromium window/context open.
 
     Returns: (res, detail, playwright_handle, context_handle)
-    Caller MUST close: await context.close(); await playwright.stop()
+    Caller MUST close: await context.close(); _PLAYWRIGHT.release(playwright)
     """
-    try:
-        from playwright.async_api import async_playwright
-    except Exception as e:
-        return ("error", f"Playwright not available: {type(e).__name__}: {e}", None, None)
-
-    def norm(s: str) -> str:
-        return re.sub(r"\s+", " ", str(s)).strip().lower()
+    if importlib.util.find_spec("playwright") is None:
+        return ("error", "Playwright not available: not installed", None, None)
 
-    succ = [norm(x) for x in (success_patterns or []) if str(x).strip()]
-    fail = [norm(x) for x in (fail_patterns or []) if str(x).strip()]
+    matcher = get_result_matcher(success_patterns, fail_patterns)
 
-    async def read_text(page) -> tuple[str, list]:
+    async def read_text(page) -> str:
         try:
             text = await page.inner_text("body")
         except Exception:
@@ -1915,48 +2383,25 @@ async def detect_result_playwright_keep_open(url: str, cfg: dict, timeout_ms: in
                 text = await page.evaluate("() => document.body ? document.body.innerText : ''")
             except Exception:
                 text = ""
-        raw_lines = [re.sub(r"\s+", " ", l).strip() for l in str(text).splitlines()]
-        lines = [l for l in raw_lines if l]
-        return (str(text or ""), lines)
-
-    def match_fail(tnorm: str, lines: list) -> tuple[bool, str]:
-        for pat in fail:
-            if pat and pat in tnorm:
-                detail = next((l for l in lines if pat in l.lower()), pat)
-                return True, detail
-        return False, ""
-
-    def match_missed(tnorm: str, lines: list) -> tuple[bool, str]:
-        ok, detail = _match_phrase_detail(tnorm, lines, HARD_MISSED_PHRASES)
-        if ok:
-            return True, detail
-        return False, ""
-
-    def match_success(tnorm: str, lines: list) -> tuple[bool, str]:
-        ok, detail = _match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-        if ok:
-            return True, detail
-        if succ:
-            for l in lines:
-                low = l.lower()
-                if all(p in low for p in succ):
-                    return True, l
-            if len(succ) >= 2 and all(p in tnorm for p in succ[:2]):
-                detail = next((l for l in lines if succ[0] in l.lower()), succ[0])
-                return True, detail
-        return False, ""
+        return str(text or "")
 
     try:
         profile_dir.mkdir(parents=True, exist_ok=True)
     except Exception:
         pass
 
-    pw = await async_playwright().start()
-    context = await pw.chromium.launch_persistent_context(
-        user_data_dir=str(profile_dir),
-        headless=bool(headless),
-        proxy=proxy if proxy else None,
-    )
+    pw = await _PLAYWRIGHT.acquire()
+    try:
+        context = await pw.chromium.launch_persistent_context(
+            user_data_dir=str(profile_dir),
+            headless=bool(headless),
+            proxy=proxy if proxy else None,
+        )
+    except BaseException as e:
+        if driver_gone(e):
+            _PLAYWRIGHT.invalidate(pw)
+        _PLAYWRIGHT.release(pw)
+        raise
     page = await context.new_page()
     try:
         await page.goto(url, wait_until="domcontentloaded")
@@ -1979,20 +2424,10 @@ async def detect_result_playwright_keep_open(url: str, cfg: dict, timeout_ms: in
         if (__import__('time').time() - start_t) * 1000 >= timeout_ms_eff:
             return ("timeout", f"no match after {int((__import__('time').time()-start_t)*1000)}ms", pw, context)
 
-        text, lines = await read_text(page)
-        tnorm = norm(text)
-        ok, detail = _match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-        if ok:
-            return ("success", detail, pw, context)
-        ok, detail = match_missed(tnorm, lines)
-        if ok:
-            return ("missed", detail, pw, context)
-        ok, detail = match_fail(tnorm, lines)
-        if ok:
-            return ("fail", detail, pw, context)
-        ok, detail = match_success(tnorm, lines)
-        if ok:
-            return ("success", detail, pw, context)
+        text = await read_text(page)
+        res, detail = matcher.classify(text)
+        if res != "none":
+            return (res, detail, pw, context)
 
         if i < attempts - 1:
             await __import__('asyncio').sleep(delay_s)
@@ -2000,22 +2435,22 @@ async def detect_result_playwright_keep_open(url: str, cfg: dict, timeout_ms: in
     return ("timeout", f"no match after {int((__import__('time').time()-start_t)*1000)}ms", pw, context)
 
 
-async def detect_result_via_warm_session(session: 'WarmBrowserSession', url: str, cfg: dict, timeout_ms: int, poll_ms: int, success_patterns, fail_patterns) -> tuple[str, str]:
+async def detect_result_via_warm_session(session: 'WarmBrowserSession', url: str, cfg: dict, timeout_ms: int, poll_ms: int, success_patterns, fail_patterns, trace=None) -> tuple[str, str]:
     """Navigate using an already-started Playwright session (per-account warm browser).
 
     Optimized for FAST OPENING:
     - navigation uses session.wait_until (default: commit)
     - avoids networkidle waits
-    - detection polls lightly (poll_ms)
-    """
+    - detection polls lightly (poll_ms), or in result_detect_mode="push" waits
+      for the in-page observer to signal a result phrase
 
-    def norm(s: str) -> str:
-        return re.sub(r"\s+", " ", str(s)).strip().lower()
+    trace: optional tracing.Trace; gets "navigate" (page + goto) and "result" marks.
+    """
 
-    succ = [norm(x) for x in (success_patterns or []) if str(x).strip()]
-    fail = [norm(x) for x in (fail_patterns or []) if str(x).strip()]
+    # Warm-session rule: any single success pattern counts as SUCCESS.
+    matcher = get_result_matcher(success_patterns, fail_patterns)
 
-    async def read_text(page) -> tuple[str, list]:
+    async def read_text(page) -> str:
         try:
             text = await page.inner_text("body")
         except Exception:
@@ -2023,71 +2458,67 @@ async def detect_result_via_warm_session(session: 'WarmBrowserSession', url: str
                 text = await page.evaluate("() => document.body ? document.body.innerText : ''")
             except Exception:
                 text = ""
-        raw_lines = [re.sub(r"\s+", " ", l).strip() for l in str(text).splitlines()]
-        lines = [l for l in raw_lines if l]
-        return (str(text or ""), lines)
-
-    def match_fail(tnorm: str, lines: list) -> tuple[bool, str]:
-        for pat in fail:
-            if pat and pat in tnorm:
-                detail = next((l for l in lines if pat in l.lower()), pat)
-                return True, detail
-        return False, ""
-
-    def match_missed(tnorm: str, lines: list) -> tuple[bool, str]:
-        ok, detail = _match_phrase_detail(tnorm, lines, HARD_MISSED_PHRASES)
-        if ok:
-            return True, detail
-        return False, ""
-
-    def match_success(tnorm: str, lines: list) -> tuple[bool, str]:
-        ok, detail = _match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-        if ok:
-            return True, detail
-        if succ:
-            # any-of substring
-            for p in succ:
-                if p and p in tnorm:
-                    detail = next((l for l in lines if p in l.lower()), p)
-                    return True, detail
-            # all-in-one-line heuristic
-            for l in lines:
-                low = l.lower()
-                if all(p in low for p in succ):
-                    return True, l
-        return False, ""
-
-    # Navigate fast (browser is already warm)
-    nav_timeout = int(cfg.get("goto_timeout_ms", 15000))
-    page = await session.goto(url, timeout_ms=nav_timeout)
+        return str(text or "")
 
-    start_t = time.time()
-    poll_ms = int(poll_ms or 500)
-    timeout_ms = int(timeout_ms or 15000)
+    def classify(text: str) -> Optional[tuple[str, str]]:
+        res, detail = matcher.classify(text, success_any=True)
+        if res == "none":
+            return None
+        return (res, detail)
 
-    while (time.time() - start_t) * 1000 < timeout_ms:
-        text, lines = await read_text(page)
-        tnorm = norm(text)
+    push = _result_detect_mode(cfg) == "push"
+    if push:
+        session.prime_observer(matcher.phrases)
 
-        ok, detail = _match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
-        if ok:
-            return ("success", detail)
+    # Navigate fast (browser is already warm) on a page from the session pool.
+    nav_timeout = int(cfg.get("goto_timeout_ms", 15000))
+    page = await session.acquire_page()
+    flt = session.resource_filter(page)
+    if flt is not None:
+        flt.take_stats()  # drop requests from the about:blank recycle
+    try:
+        page = await session.goto(url, timeout_ms=nav_timeout, page=page)
+        if trace is not None:
+            trace.mark("navigate")
 
-        ok, detail = match_missed(tnorm, lines)
-        if ok:
-            return ("missed", detail)
+        start_t = time.time()
+        poll_ms = int(poll_ms or 500)
+        timeout_ms = int(timeout_ms or 15000)
 
-        ok, detail = match_fail(tnorm, lines)
-        if ok:
-            return ("fail", detail)
+        observer = session.result_observer(page) if push else None
+        if observer is not None:
+            # Push mode: the page signals us when a result phrase appears.
+            await observer.rearm(page)
+            while True:
+                remaining_s = timeout_ms / 1000.0 - (time.time() - start_t)
+                if remaining_s <= 0:
+                    break
+                text = await observer.next_text(remaining_s)
+                if text is None:
+                    break
+                found = classify(text)
+                if found is not None:
+                    return found
+            # One read of the page before giving up: catches a result the observer
+            # missed (init script not run on this document, expose_function failed).
+            found = classify(await read_text(page))
+            if found is not None:
+                return found
+            return ("timeout", f"no match after {int((time.time()-start_t)*1000)}ms")
 
-        ok, detail = match_success(tnorm, lines)
-        if ok:
-            return ("success", detail)
+        while (time.time() - start_t) * 1000 < timeout_ms:
+            found = classify(await read_text(page))
+            if found is not None:
+                return found
 
-        await asyncio.sleep(max(0.05, poll_ms / 1000.0))
+            await asyncio.sleep(max(0.05, poll_ms / 1000.0))
 
-    return ("timeout", f"no match after {int((time.time()-start_t)*1000)}ms")
+        return ("timeout", f"no match after {int((time.time()-start_t)*1000)}ms")
+    finally:
+        if trace is not None:
+            trace.mark("result")
+        _log_filter_stats(flt, url)
+        session.release_page(page)
 
 
 
@@ -2140,8 +2571,20 @@ async def resolve_channel_entity(client: TelegramClient, channel_ref: str):
 
 
 
-async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
-    """Multi-account watcher. Keeps menu visuals; shows a status table via periodic redraw."""
+async def watch_multi(
+    cfg: dict,
+    *,
+    resume: bool = False,
+    client_factory=None,
+    quit_event: Optional[asyncio.Event] = None,
+) -> None:
+    """Multi-account watcher. Keeps menu visuals; shows a status table via periodic redraw.
+
+    client_factory: called like TelegramClient(session, api_id, api_hash, **kw)
+    instead of it (offline benchmark: scripts/bench_pipeline.py).
+    quit_event: setting it quits the watcher like the "quit" command.
+    """
+    make_client = client_factory or TelegramClient
     api_id = int(cfg["api_id"])
     api_hash = str(cfg["api_hash"])
 
@@ -2167,8 +2610,9 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
     # UI mode:
     # - classic: clear+redraw (old behavior)
     # - ptk: prompt_toolkit TUI with a persistent command line
+    # - none: no screen and no command input (headless benchmark / scripted runs)
     ui_mode = str(cfg.get("ui_mode", "ptk") or "ptk").strip().lower()
-    if ui_mode not in ("classic", "ptk"):
+    if ui_mode not in ("classic", "ptk", "none"):
         ui_mode = "ptk"
 
     # Monitoring mode for NEW architecture.
@@ -2197,10 +2641,16 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
     csv_path = resolve_accounts_csv_path(csv_raw)
     accounts = load_accounts_csv(csv_path)
 
+    # Roles (NEW mode): detectors only listen/poll, openers only open. Without any
+    # detector (or any opener) in the CSV every account falls back to "both".
+    for a, role in zip(accounts, effective_roles([str(a.get("role") or "both") for a in accounts])):
+        a["role"] = role
+    detector_count = sum(1 for a in accounts if role_detects(a["role"]))
+
     # Auto-throttle: each account must not poll more often than once per 10s.
-    # With N accounts, tick interval must be >= 10 / N seconds.
+    # With N polling (detector) accounts, tick interval must be >= 10 / N seconds.
     try:
-        min_tick = 10.0 / float(max(1, len(accounts)))
+        min_tick = 10.0 / float(max(1, detector_count))
         if poll_interval_sec < min_tick:
             poll_interval_sec = min_tick
     except Exception:
@@ -2223,55 +2673,138 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         resume = True
         _SUPPRESS_PREFLIGHT_ONCE = False
 
+    # Resolved channel (id + access hash) and membership per account, kept across
+    # runs so run/stop cycles skip invite import/check and GetParticipant.
+    # Entries are dropped only when the account hits a channel access error.
+    channel_cache_on = bool(cfg.get("channel_cache_enabled", True))
+    channel_cache = ChannelCache(DATA_DIR / "state" / "channels.json")
+
+    def _channel_cache_key(a: dict) -> str:
+        return re.sub(r'[^0-9A-Za-z_\-]+', '_', str(a.get("phone") or "").strip())
+
+    async def resolve_channel_cached(client: TelegramClient, a: dict) -> tuple[object, bool]:
+        """(entity, from_cache). Cache misses resolve via RPC and are stored."""
+        key = _channel_cache_key(a)
+        if channel_cache_on:
+            ent = channel_cache.entity(key, channel)
+            if ent is not None:
+                return ent, True
+        ent = await resolve_channel_entity(client, channel)
+        if channel_cache_on:
+            channel_cache.put(key, channel, ent)
+        return ent, False
+
+    def _channel_access_lost(label: str, e: BaseException) -> None:
+        """Forget the cached channel for an account that lost access (or has a stale hash)."""
+        if not channel_cache_on or not isinstance(e, (ChannelPrivateError, ChannelInvalidError, UserNotParticipantError)):
+            return
+        try:
+            for a in accounts:
+                if acct_label(a) == label:
+                    channel_cache.invalidate(_channel_cache_key(a), channel)
+                    break
+        except Exception:
+            pass
+
     if not resume:
-        # PRE-FLIGHT AUTH (sequential): Telethon interactive login prompts are NOT concurrency-safe.
-        # We log in accounts one-by-one (if needed) to create .session files, then run parallel watchers without prompts.
+        # PRE-FLIGHT AUTH: valid sessions are checked concurrently (bounded by
+        # preflight_concurrency). Telethon interactive login prompts are NOT
+        # concurrency-safe, so accounts that need a code are queued and logged in
+        # one-by-one afterwards; then parallel watchers run without prompts.
         clear()
         status_info("Pre-flight: checking Telegram sessions for all accounts...")
-        for a in accounts:
+        session_dir_pf = DATA_DIR / "sessions"
+        session_dir_pf.mkdir(parents=True, exist_ok=True)
+        try:
+            pf_limit = max(1, int(cfg.get("preflight_concurrency", 8) or 8))
+        except Exception:
+            pf_limit = 8
+        pf_sem = asyncio.Semaphore(pf_limit)
+        needs_login: list[dict] = []
+
+        async def _pf_channel_check(c, a: dict, label_pf: str) -> None:
+            # quick channel access check (gives clearer errors early); openers never read the channel
+            if watch_mode != "old" and str(a.get("role") or "both") == "opener":
+                return
+            try:
+                await resolve_channel_cached(c, a)
+            except Exception:
+                status_error(f"{label_pf}: cannot access channel {channel} (join it / check @tag)")
+
+        async def _pf_check(a: dict) -> None:
             phone_pf = str(a.get("phone") or "").strip()
             label_pf = acct_label(a)
             if not phone_pf:
                 status_error(f"{label_pf}: missing phone in accounts.csv")
-                continue
-            session_dir_pf = DATA_DIR / "sessions"
-            session_dir_pf.mkdir(parents=True, exist_ok=True)
+                return
             session_file_pf = session_dir_pf / re.sub(r'[^0-9A-Za-z_\-]+', '_', phone_pf)
-            try:
-                status_info(f"Auth check: {label_pf}")
-                c = TelegramClient(str(session_file_pf), api_id, api_hash)
-                await c.connect()
-                if not await c.is_user_authorized():
-                    status_info(f"{label_pf}: login required. Requesting code...")
-                    # This will prompt for code/password for THIS account only (sequentially).
-                    await c.start(phone=phone_pf)
-                # quick channel access check (gives clearer errors early)
+            async with pf_sem:
+                c = None
                 try:
-                    await resolve_channel_entity(c, channel)
-                except Exception:
-                    status_error(f"{label_pf}: cannot access channel {channel} (join it / check @tag)")
-                await c.disconnect()
-            except Exception as e:
-                try:
-                    await c.disconnect()
-                except Exception:
-                    pass
-                status_error(f"{label_pf}: auth error {type(e).__name__}: {e}")
-        status_info("Pre-flight done. Starting watchers...")
+                    c = make_client(str(session_file_pf), api_id, api_hash)
+                    await c.connect()
+                    if not await c.is_user_authorized():
+                        needs_login.append(a)
+                    else:
+                        await _pf_channel_check(c, a, label_pf)
+                        status_info(f"Auth check: {label_pf} OK")
+                except Exception as e:
+                    status_error(f"{label_pf}: auth error {type(e).__name__}: {e}")
+                finally:
+                    try:
+                        if c is not None:
+                            await c.disconnect()
+                    except Exception:
+                        pass
+
+        await asyncio.gather(*(_pf_check(a) for a in accounts), return_exceptions=True)
+
+        # Interactive logins: strictly sequential, in accounts.csv order.
+        order = {id(a): i for i, a in enumerate(accounts)}
+        for a in sorted(needs_login, key=lambda x: order.get(id(x), 0)):
+            phone_pf = str(a.get("phone") or "").strip()
+            label_pf = acct_label(a)
+            session_file_pf = session_dir_pf / re.sub(r'[^0-9A-Za-z_\-]+', '_', phone_pf)
+            c = None
+            try:
+                c = make_client(str(session_file_pf), api_id, api_hash)
+                await c.connect()
+                status_info(f"{label_pf}: login required. Requesting code...")
+                # This will prompt for code/password for THIS account only (sequentially).
+                await c.start(phone=phone_pf)
+                await _pf_channel_check(c, a, label_pf)
+                await c.disconnect()
+            except Exception as e:
+                try:
+                    if c is not None:
+                        await c.disconnect()
+                except Exception:
+                    pass
+                status_error(f"{label_pf}: auth error {type(e).__name__}: {e}")
+        status_info("Pre-flight done. Starting watchers...")
         await asyncio.sleep(0.6)
         _RUNTIME_PREFLIGHT_DONE = True
 
-    # shared UI state
-    state: dict[str, dict] = {}
+    # shared UI state: rows change only through the reducer (set_row -> UiEvent),
+    # which tracks dirty rows and wakes the renderer.
+    ui = UiStateReducer()
+    state: dict[str, RowState] = ui.state
     default_idle_status = "MONITORING" if watch_mode != "old" else "WAITING"
     for a in accounts:
-        state[acct_label(a)] = {
-            "phone": a.get("phone"),
-            "proxy": a.get("proxy_raw", ""),
-            "status": default_idle_status,
-            "detail": "",
-            "ticket": "—",
-        }
+        ui.init_row(acct_label(a), RowState(
+            phone=str(a.get("phone") or ""),
+            proxy=str(a.get("proxy_raw", "") or ""),
+            status=default_idle_status,
+            ticket="—",
+        ))
+    try:
+        ui_max_fps = max(1.0, float(cfg.get("ui_max_fps", 10) or 10))
+    except Exception:
+        ui_max_fps = 10.0
+
+    def _row_status(label: str) -> str:
+        row = state.get(label)
+        return str(row.status or "") if row is not None else ""
 
     # While the watch screen is running, suppress any status_* prints (log to file instead).
     global _UI_QUIET
@@ -2285,7 +2818,6 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
     warm_cache = _WARM_CACHE
     stop_reason: dict[str, str] = {"mode": "run"}  # run | pause | quit
     quit_all = asyncio.Event()
-    gotem_lock = asyncio.Lock()
 
     def _looks_like_proxy_issue(msg: str) -> bool:
         s = str(msg or "").lower()
@@ -2313,17 +2845,12 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             return "CLOSED"
         return ""
 
-    async def bump_gotem() -> None:
-        async with gotem_lock:
-            try:
-                cur = int(cfg.get("gotem", 0) or 0)
-            except Exception:
-                cur = 0
-            cfg["gotem"] = cur + 1
-            try:
-                save_config(cfg)
-            except Exception:
-                pass
+    def record_outcome(label: str, res: str) -> None:
+        # success/missed/fail/timeout per account; the write is coalesced and off the loop.
+        try:
+            _STATS.bump(label, str(res))
+        except Exception:
+            pass
 
     def _send_cmd(cmd: str) -> None:
         try:
@@ -2336,6 +2863,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             stop_reason["mode"] = mode
             if mode == "pause":
                 ui_paused.set()
+                ui.touch()
             if mode == "quit":
                 quit_all.set()
             stop_all.set()
@@ -2352,54 +2880,19 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         _logs_dir.mkdir(parents=True, exist_ok=True)
     except Exception:
         pass
-    _status_log_path = _logs_dir / "status_live.tsv"
-    _status_log_q: asyncio.Queue[str] = asyncio.Queue()
-
-    async def _status_log_writer():
-        """Background writer: serializes all status updates into a live file."""
-        try:
-            f = open(_status_log_path, "a", encoding="utf-8")
-        except Exception:
-            f = None
-        if f is None:
-            return
-
-        def _w(s: str) -> None:
-            try:
-                if f is not None:
-                    f.write(s)
-                    f.flush()
-            except Exception:
-                pass
-        try:
-            # header if empty
-            try:
-                if f.tell() == 0:
-                    _w("ts\taccount\tstatus\tticket\tdetail\n")
-            except Exception:
-                pass
-            while (not quit_all.is_set()) or (not _status_log_q.empty()):
-                try:
-                    line = await asyncio.wait_for(_status_log_q.get(), timeout=0.5)
-                except asyncio.TimeoutError:
-                    continue
-                try:
-                    f.write(line)
-                    f.flush()
-                except Exception:
-                    pass
-        finally:
-            try:
-                    f.close()
-            except Exception:
-                pass
+    # Batched + rotated (size/day, gzip in a background thread); see status_log.py.
+    status_log = StatusLog(
+        _logs_dir / "status_live.tsv",
+        batch_lines=int(cfg.get("status_log_batch_lines", 64) or 64),
+        flush_ms=int(cfg.get("status_log_flush_ms", 250) or 0),
+        max_bytes=int(float(cfg.get("status_log_max_mb", 10) or 0) * 1024 * 1024),
+        rotate_daily=bool(cfg.get("status_log_rotate_daily", True)),
+        keep=int(cfg.get("status_log_keep", 14) or 0),
+    )
 
     def _log_status(label: str, status: str, detail: str = "", ticket: str = "") -> None:
-        ts = time.strftime("%Y-%m-%d %H:%M:%S")
-        # keep it raw codes (no ANSI), best for grepping
-        line = f"{ts}\t{label}\t{status}\t{ticket or ''}\t{(detail or '').replace(chr(10), ' ').replace(chr(13), ' ')}\n"
         try:
-            _status_log_q.put_nowait(line)
+            status_log.log(label, status, detail, ticket)
         except Exception:
             pass
 
@@ -2442,15 +2935,12 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         NOTE: Some high-frequency UI statuses (e.g. POLL) should not be logged.
         """
         row = state.get(label)
-        if not row:
+        if row is None:
             return
-        row["status"] = status
-        row["detail"] = detail
-        if ticket:
-            row["ticket"] = ticket
+        ui.apply(UiEvent(kind="status", label=label, status=status, detail=detail or "", ticket=ticket or "", ts_ms=int(time.time() * 1000)))
         if log:
             try:
-                _log_status(label, status, detail, row.get("ticket") or ticket)
+                _log_status(label, status, detail, row.ticket or ticket)
             except Exception:
                 pass
 
@@ -2463,7 +2953,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             if lb.startswith("__"):
                 continue
             try:
-                set_row_ui(lb, status, detail, ticket=row.get("ticket") or "", log=False)
+                set_row_ui(lb, status, detail, ticket=row.ticket or "", log=False)
             except Exception:
                 pass
 
@@ -2506,7 +2996,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             if stop_all.is_set():
                 return
             try:
-                cur = str(state.get(label, {}).get("status") or "")
+                cur = _row_status(label)
             except Exception:
                 cur = ""
             if cur == expect_status and watch_mode != "old":
@@ -2526,14 +3016,92 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
 
     # POST_FOUND events are deduped globally (not per-account).
     post_q: asyncio.Queue = asyncio.Queue(maxsize=200)
-    seen_posts: dict[tuple[int, int], int] = {}  # (chat_id, msg_id) -> ts_ms
+    seen_posts = DedupeStore(dedup_ttl_sec)  # (chat_id, msg_id)
+
+    # Accepted posts + per-channel last-seen id survive stop/run and restarts.
+    post_store = PostStore(DATA_DIR / "state" / "posts.log", ttl_s=dedup_ttl_sec)
+
+    def _load_seen_posts() -> DedupeStore:
+        """Fresh dedupe store pre-filled with the persisted recent post keys."""
+        store = DedupeStore(dedup_ttl_sec)
+        try:
+            post_store.load()
+            wall_now, mono_now = time.time(), time.monotonic()
+            for key, ts in post_store.recent(wall_now):
+                store.add(key, now=mono_now - max(0.0, wall_now - ts))
+        except Exception:
+            pass
+        return store
+
+    # Per-account RPC latency / error / FloodWait stats (hedge target selection).
+    rpc_stats = RpcStats()
+
+    # Per-post latency spans (tg -> queue -> link -> fanout -> webview/delay ->
+    # navigate -> result): JSONL in logs/traces.jsonl, p50/p95 in the footer.
+    tracer = None
+    if bool(cfg.get("trace_enabled", True)):
+        # Size-rotated and gzipped like status_live.tsv (see status_log.py).
+        tracer = Tracer(
+            DATA_DIR / "logs" / "traces.jsonl",
+            max_bytes=int(float(cfg.get("trace_log_max_mb", 10) or 0) * 1024 * 1024),
+            keep=int(cfg.get("trace_log_keep", 5) or 0),
+        )
+
+    # Connection ramp-up: at most ramp_concurrency accounts connect / resolve / join /
+    # start a browser at once (ramp_per_proxy_host per proxy host), so big fleets
+    # come online in waves instead of one connect storm.
+    try:
+        ramp_sem = asyncio.Semaphore(max(1, int(cfg.get("ramp_concurrency", 8) or 8)))
+    except Exception:
+        ramp_sem = asyncio.Semaphore(8)
+    try:
+        ramp_host_limit = max(1, int(cfg.get("ramp_per_proxy_host", 2) or 2))
+    except Exception:
+        ramp_host_limit = 2
+    ramp_host_sems: dict[str, asyncio.Semaphore] = {}
+    ramp: dict = {"t0": 0.0, "ready": set(), "settled": set(), "done_s": None}
+
+    def _ramp_host(account: dict) -> str:
+        if not account.get("tg_proxy"):
+            return ""
+        raw = str(account.get("proxy_raw") or "").strip()
+        return raw.split(":", 1)[0].strip().lower()
+
+    async def _ramp_acquire(account: dict) -> list[asyncio.Semaphore]:
+        """Wait for a ramp slot (proxy host first, then global); returns the semaphores held."""
+        held: list[asyncio.Semaphore] = []
+        host = _ramp_host(account)
+        try:
+            if host:
+                sem = ramp_host_sems.get(host)
+                if sem is None:
+                    sem = asyncio.Semaphore(ramp_host_limit)
+                    ramp_host_sems[host] = sem
+                await sem.acquire()
+                held.append(sem)
+            await ramp_sem.acquire()
+            held.append(ramp_sem)
+        except BaseException:
+            _ramp_release(held)
+            raise
+        return held
+
+    def _ramp_release(held: list[asyncio.Semaphore]) -> None:
+        while held:
+            try:
+                held.pop().release()
+            except Exception:
+                pass
 
-    def _seen_cleanup(now_ms: int) -> None:
+    def _ramp_settle(label: str, ready: bool) -> None:
+        """Account finished starting (MONITORING or failed); report once all have."""
         try:
-            ttl_ms = int(dedup_ttl_sec * 1000)
-            for k, ts in list(seen_posts.items()):
-                if now_ms - int(ts) > ttl_ms:
-                    seen_posts.pop(k, None)
+            if ready:
+                ramp["ready"].add(label)
+            ramp["settled"].add(label)
+            if ramp["done_s"] is None and len(ramp["settled"]) >= len(accounts) and not stop_all.is_set():
+                ramp["done_s"] = time.monotonic() - float(ramp["t0"])
+                status_info(f"ramp-up: {len(ramp['ready'])}/{len(accounts)} MONITORING in {ramp['done_s']:.1f}s")
         except Exception:
             pass
 
@@ -2551,12 +3119,15 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             msg_id = int(getattr(msg, "id", 0) or 0)
             if not chat_id or not msg_id:
                 return
-            now_ms = int(time.time() * 1000)
-            _seen_cleanup(now_ms)
-            key = (chat_id, msg_id)
-            if key in seen_posts:
+            if seen_posts.seen((chat_id, msg_id)):
                 return
-            seen_posts[key] = now_ms
+            try:
+                post_store.mark_seen(chat_id, msg_id)
+                if post_store.compact_due:
+                    # fsync in a worker thread, not on the detection path.
+                    _spawn_run(post_store.acompact())
+            except Exception:
+                pass
 
             # Truthful UI: mark NEWMSG ONLY when this post is accepted by
             # the global dedupe.
@@ -2564,40 +3135,133 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 set_row(detector_label, "NEWMSG", f"id={msg_id}")
             except Exception:
                 pass
+            trace = None
+            if tracer is not None:
+                trace = tracer.begin((chat_id, msg_id), detector_label)
+                try:
+                    # Telegram-side lag: post date -> received here (1s resolution).
+                    posted = getattr(msg, "date", None)
+                    if posted is not None:
+                        trace.add("tg", max(0.0, time.time() - posted.timestamp()) * 1000.0)
+                except Exception:
+                    pass
             try:
-                post_q.put_nowait((detector_label, chat_id, msg_id))
+                # Carry the received message: link extraction runs on it without an RPC.
+                post_q.put_nowait((detector_label, chat_id, msg_id, msg, trace))
             except asyncio.QueueFull:
                 # Drop if overwhelmed; FCFS prefers freshness.
                 pass
         except Exception:
             pass
 
-    async def link_hunt_once(detector_label: str, chat_id: int, msg_id: int) -> tuple[Optional[str], Optional[str]]:
+    def _prefetch_bot_apps(url: str) -> None:
+        # Resolve the bot peer/app for every account now, before fanout,
+        # so each open only sends RequestAppWebViewRequest.
+        try:
+            norm_url = normalize_telegram_link(url)
+            for _lb, _rt in list(runtimes.items()):
+                _cl = _rt.get("client")
+                if _cl is not None and _rt.get("open_q") is not None:
+                    _spawn_run(prefetch_miniapp_app(_cl, norm_url))
+        except Exception:
+            pass
+
+    # Keyed by chat: a fleet (re)connecting at once catches up each channel once.
+    catchup_inflight: set[int] = set()
+    catchup_last: dict[int, tuple[Optional[int], float]] = {}  # chat -> (watermark after, monotonic)
+    catchup_fresh_s = 10.0
+    try:
+        catchup_limit = max(1, min(100, int(cfg.get("catchup_limit", 20) or 20)))
+    except Exception:
+        catchup_limit = 20
+
+    async def catch_up(label: str, reason: str = "connect") -> None:
+        """Replay posts newer than the persisted watermark through the bus.
+
+        Runs when an account (re)connects: one get_messages(min_id=watermark,
+        limit=catchup_limit) call; missed posts are emitted oldest first and
+        logged as CATCHUP. The watermark is used whatever its age (the account
+        may have been down longer than the dedupe TTL), but posts older than
+        event_dedup_ttl_sec are not replayed. Without any watermark it only
+        records the top id. Skipped while another account catches up the same
+        channel, or caught up to the same watermark in the last 10s.
+        """
+        if stop_all.is_set():
+            return
+        rt = runtimes.get(label) or {}
+        client = rt.get("client")
+        ch_ent = rt.get("ch_ent")
+        if client is None or ch_ent is None:
+            return
+        try:
+            chat_key = int(tl_utils.get_peer_id(ch_ent))
+        except Exception:
+            return
+        if chat_key in catchup_inflight:
+            return
+        last = catchup_last.get(chat_key)
+        if last is not None and time.monotonic() - last[1] < catchup_fresh_s and last[0] == post_store.watermark(chat_key):
+            return
+        catchup_inflight.add(chat_key)
+        try:
+            wm = post_store.watermark(chat_key)
+            with rpc_stats.measure(label):
+                if wm is None:
+                    msgs = await client.get_messages(ch_ent, limit=1)
+                else:
+                    msgs = await client.get_messages(ch_ent, min_id=wm, limit=catchup_limit)
+            catchup_last[chat_key] = (wm, time.monotonic())
+            if wm is None:
+                if msgs:
+                    post_store.set_watermark(chat_key, int(getattr(msgs[0], "id", 0) or 0))
+                    catchup_last[chat_key] = (post_store.watermark(chat_key), time.monotonic())
+                return
+            newer = sorted(
+                (m for m in (msgs or []) if int(getattr(m, "id", 0) or 0) > wm),
+                key=lambda m: int(getattr(m, "id", 0) or 0),
+            )
+            if not newer:
+                post_store.confirm_watermark(chat_key)
+                return
+            now_wall = time.time()
+            missed = []
+            for m in newer:
+                try:
+                    posted = getattr(m, "date", None)
+                    if posted is not None and now_wall - posted.timestamp() > dedup_ttl_sec:
+                        continue
+                except Exception:
+                    pass
+                missed.append(m)
+            if missed:
+                set_row(label, "CATCHUP", f"{len(missed)} missed ({reason})")
+                for m in missed:
+                    await emit_post_found(label, m)
+            post_store.set_watermark(chat_key, int(getattr(newer[-1], "id", 0) or 0))
+            catchup_last[chat_key] = (post_store.watermark(chat_key), time.monotonic())
+        except Exception as e:
+            _channel_access_lost(label, e)
+        finally:
+            catchup_inflight.discard(chat_key)
+
+    async def link_hunt_once(detector_label: str, chat_id: int, msg_id: int, msg=None) -> tuple[Optional[str], Optional[str]]:
         """Find miniapp/launch URL for a post ONE time with retry schedule.
 
+        msg: the already-received message (live event / poll). Links are taken
+        from it directly; the message is re-fetched only if it has no link AND
+        its reply markup or entities are missing (not delivered yet).
+
+        Re-fetch is hedged: the detector account starts first; if it has not
+        found a link after link_hunt_hedge_ms, the link_hunt_hedge_count fastest
+        other ready accounts (by RpcStats) fetch too, and the first URL wins.
+
         Returns (url, ticket) or (None, ticket/None).
         """
         retry_ms = [0, 200, 500, 1000, 1500]
         ticket = None
-        rt = runtimes.get(detector_label)
-        if not rt:
-            return None, None
-        client = rt.get("client")
-        ch_ent = rt.get("ch_ent")
-        if client is None or ch_ent is None:
-            return None, None
 
-        for d in retry_ms:
-            if stop_all.is_set():
-                return None, ticket
-            if d:
-                await asyncio.sleep(d / 1000)
-            try:
-                m = await client.get_messages(ch_ent, ids=msg_id)
-            except Exception:
-                m = None
-            if not m:
-                continue
+        def extract(m) -> Optional[str]:
+            nonlocal ticket
             try:
                 txt = getattr(m, "raw_text", "") or getattr(m, "message", "") or ""
                 if ticket is None:
@@ -2610,18 +3274,106 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 u_any, _src_any = extract_any_url(m)
                 if u_any:
                     url = u_any
+            return url or None
+
+        if msg is not None:
+            try:
+                url = extract(msg)
+            except Exception:
+                url = None
             if url:
+                _prefetch_bot_apps(url)
                 return url, ticket
+            if getattr(msg, "reply_markup", None) is not None and getattr(msg, "entities", None):
+                # Complete message without a link: a re-fetch would return the same thing.
+                return None, ticket
+
+        async def fetch_on(lb: str) -> Optional[str]:
+            rt = runtimes.get(lb)
+            if not rt:
+                return None
+            client = rt.get("client")
+            ch_ent = rt.get("ch_ent")
+            if client is None or ch_ent is None:
+                return None
+            for d in retry_ms:
+                if stop_all.is_set():
+                    return None
+                if d:
+                    await asyncio.sleep(d / 1000)
+                try:
+                    with rpc_stats.measure(lb):
+                        m = await client.get_messages(ch_ent, ids=msg_id)
+                except Exception as e:
+                    _channel_access_lost(lb, e)
+                    m = None
+                if not m:
+                    continue
+                url = extract(m)
+                if url:
+                    return url
+            return None
+
+        def hedge_targets() -> list[str]:
+            try:
+                n = max(0, min(4, int(cfg.get("link_hunt_hedge_count", 2) or 0)))
+            except Exception:
+                n = 2
+            if n <= 0:
+                return []
+            det_ent = (runtimes.get(detector_label) or {}).get("ch_ent")
+            # Message ids are per-account in basic groups; only channels/supergroups share them.
+            if not isinstance(det_ent, types.Channel):
+                return []
+            others = [
+                lb for lb, rt in list(runtimes.items())
+                if lb != detector_label and rt.get("client") is not None
+                and isinstance(rt.get("ch_ent"), types.Channel)
+                and int(getattr(rt.get("ch_ent"), "id", 0) or 0) == int(det_ent.id)
+            ]
+            return rpc_stats.fastest(others, n=n)
+
+        try:
+            hedge_s = max(0.0, float(cfg.get("link_hunt_hedge_ms", 300) or 0) / 1000.0)
+        except Exception:
+            hedge_s = 0.3
+
+        tasks = {asyncio.create_task(fetch_on(detector_label))}
+        hedged = False
+        url = None
+        try:
+            while tasks and url is None:
+                done, _pending = await asyncio.wait(
+                    tasks, timeout=None if hedged else hedge_s, return_when=asyncio.FIRST_COMPLETED
+                )
+                for t in done:
+                    tasks.discard(t)
+                    try:
+                        url = url or t.result()
+                    except Exception:
+                        pass
+                if url is None and not hedged and (not done or not tasks):
+                    # Detector is slow (or gave up): ask the fastest other accounts too.
+                    hedged = True
+                    for lb in hedge_targets():
+                        tasks.add(asyncio.create_task(fetch_on(lb)))
+        finally:
+            for t in tasks:
+                t.cancel()
+
+        if url:
+            _prefetch_bot_apps(url)
+            return url, ticket
         return None, ticket
 
-    async def fanout_open(url: str, ticket: str, post_key: tuple[int, int]):
-        """Broadcast OPEN to ALL accounts (warm headless)."""
+    async def fanout_open(url: str, ticket: str, post_key: tuple[int, int], trace=None):
+        """Broadcast OPEN to ALL accounts (warm headless); each gets its own fork of trace."""
         for lb, rt in list(runtimes.items()):
             oq = rt.get("open_q")
             if oq is None:
                 continue
             try:
-                oq.put_nowait((url, ticket or "", post_key))
+                oq.put_nowait((url, ticket or "", post_key, trace.fork(lb) if trace is not None else None))
             except asyncio.QueueFull:
                 # If a particular account is backed up, skip it (FCFS).
                 pass
@@ -2630,18 +3382,24 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         """Single consumer: POST_FOUND -> link-hunt once -> fanout OPEN."""
         while not stop_all.is_set():
             try:
-                detector_label, chat_id, msg_id = await asyncio.wait_for(post_q.get(), timeout=0.5)
+                detector_label, chat_id, msg_id, msg, trace = await asyncio.wait_for(post_q.get(), timeout=0.5)
             except asyncio.TimeoutError:
                 continue
             except asyncio.CancelledError:
                 break
 
             try:
+                if trace is not None:
+                    trace.mark("queue")
                 # UI hint: who detected.
                 set_row(detector_label, "POST", f"id={msg_id}")
 
-                url, ticket = await link_hunt_once(detector_label, chat_id, msg_id)
+                url, ticket = await link_hunt_once(detector_label, chat_id, msg_id, msg)
+                if trace is not None:
+                    trace.mark("link")
                 if not url:
+                    if trace is not None:
+                        trace.finish("no_link")
                     set_row(detector_label, "NO_LINK", "no miniapp link", ticket=ticket or "")
                     # Return to MONITORING shortly.
                     if watch_mode != "old":
@@ -2649,7 +3407,9 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                     continue
 
                 # One-shot broadcast.
-                await fanout_open(url, ticket or "", (chat_id, msg_id))
+                await fanout_open(url, ticket or "", (chat_id, msg_id), trace)
+                if trace is not None:
+                    trace.finish("fanout")
             finally:
                 try:
                     post_q.task_done()
@@ -2657,10 +3417,37 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                     pass
 
     async def poll_scheduler_loop():
-        """Staggered polling: one account per second queries latest message."""
+        """Staggered polling: one account per tick queries latest message.
+
+        Adaptive (RpcStats.poll_floors): accounts in FloodWait, with a high
+        error rate or far slower than the median are throttled to
+        poll_health_max_factor x 10s; their share of the polls goes to the
+        healthy accounts, so the total poll rate stays at N/10s. Each tick polls
+        the eligible account that waited longest.
+        """
         labels = [acct_label(a) for a in accounts]
-        idx = 0
         last_seen_id: Optional[int] = None
+        per_account_floor_s = 10.0
+        try:
+            health_max_factor = max(1.0, float(cfg.get("poll_health_max_factor", 4.0) or 4.0))
+        except Exception:
+            health_max_factor = 4.0
+        last_poll: dict[str, float] = {}
+        try:
+            batch_limit = max(1, min(100, int(cfg.get("poll_batch_limit", 10) or 10)))
+        except Exception:
+            batch_limit = 10
+
+        def pick_account(now: float) -> tuple[Optional[str], float]:
+            """(label, 0) for the account to poll now, or (None, seconds until one is eligible)."""
+            ready: list[str] = []
+            for lb in labels:
+                ev = runtimes_ready.get(lb)
+                rt = runtimes.get(lb)
+                if ev is None or not ev.is_set() or not rt or rt.get("client") is None or rt.get("ch_ent") is None:
+                    continue
+                ready.append(lb)
+            return rpc_stats.next_poller(ready, last_poll, per_account_floor_s, health_max_factor, now=now)
 
         # Wait until at least one runtime is ready.
         while not stop_all.is_set():
@@ -2668,12 +3455,25 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 break
             await asyncio.sleep(0.1)
 
+        # Resume from the persisted watermark when it is recent: posts that arrived
+        # while stopped are caught up on the first tick (dedupe prevents re-opens).
+        chat_key: Optional[int] = None
+        for rt in list(runtimes.values()):
+            try:
+                chat_key = int(tl_utils.get_peer_id(rt.get("ch_ent")))
+                break
+            except Exception:
+                continue
+        if chat_key is not None:
+            try:
+                last_seen_id = post_store.watermark(chat_key, max_age_s=dedup_ttl_sec)
+            except Exception:
+                last_seen_id = None
+
         # Initialize baseline: take current latest message id and do NOT emit.
-        for _ in range(len(labels) * 2):
-            if stop_all.is_set():
-                return
-            lb = labels[idx % len(labels)]
-            idx += 1
+        for lb in labels + labels:
+            if stop_all.is_set() or last_seen_id is not None:
+                break
             ev = runtimes_ready.get(lb)
             if ev is None or not ev.is_set():
                 continue
@@ -2685,12 +3485,25 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             if client is None or ch_ent is None:
                 continue
             try:
-                m = await client.get_messages(ch_ent, limit=1)
+                with rpc_stats.measure(lb):
+                    m = await client.get_messages(ch_ent, limit=1)
                 if m:
                     last_seen_id = int(getattr(m[0], "id", 0) or 0)
                     break
             except Exception:
                 continue
+        if stop_all.is_set():
+            return
+
+        def save_watermark() -> None:
+            if chat_key is not None and last_seen_id:
+                try:
+                    post_store.set_watermark(chat_key, last_seen_id)
+                except Exception:
+                    pass
+
+        save_watermark()
+
         # POLL indicator is a UI overlay (does NOT overwrite persistent statuses).
         # It is set immediately when we pick the account for this tick, and held long
         # enough to be visible in the render loop.
@@ -2698,52 +3511,70 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
 
         while not stop_all.is_set():
             t0 = time.time()
+            tick_s = float(poll_interval_sec)
             try:
-                lb = labels[idx % len(labels)]
-                idx += 1
+                lb, wait_s = pick_account(time.monotonic())
+                if lb is None:
+                    # Everyone is inside their floor or FloodWait: wait for the first one.
+                    tick_s = max(0.05, min(wait_s, tick_s))
+                    continue
+                last_poll[lb] = time.monotonic()
 
                 # Set truthful UI overlay: THIS account is polling right now.
                 global _POLL_OVERLAY_LABEL, _POLL_OVERLAY_UNTIL
                 _POLL_OVERLAY_LABEL = lb
                 _POLL_OVERLAY_UNTIL = time.time() + max(min_poll_indicator_sec, float(poll_interval_sec) * 0.9)
+                ui.touch()
 
-                ev = runtimes_ready.get(lb)
-                if ev is None or not ev.is_set():
-                    await asyncio.sleep(0.05)
-                    continue
-                rt = runtimes.get(lb)
-                if not rt:
-                    await asyncio.sleep(0.05)
-                    continue
+                rt = runtimes.get(lb) or {}
                 client = rt.get("client")
                 ch_ent = rt.get("ch_ent")
                 if client is None or ch_ent is None:
                     await asyncio.sleep(0.05)
                     continue
 
+                # One RPC per tick: everything newer than last_seen_id (newest
+                # batch_limit if a burst is larger), emitted oldest -> newest.
+                polled = False
                 try:
-                    msgs = await client.get_messages(ch_ent, limit=1)
-                except Exception:
+                    with rpc_stats.measure(lb):
+                        if last_seen_id is None:
+                            msgs = await client.get_messages(ch_ent, limit=1)
+                        else:
+                            msgs = await client.get_messages(ch_ent, min_id=last_seen_id, limit=batch_limit)
+                    polled = True
+                except Exception as e:
+                    _channel_access_lost(lb, e)
                     msgs = None
                 if msgs:
-                    m0 = msgs[0]
-                    mid = int(getattr(m0, "id", 0) or 0)
+                    new_msgs = sorted(
+                        (m for m in msgs if int(getattr(m, "id", 0) or 0) > (last_seen_id or 0)),
+                        key=lambda m: int(getattr(m, "id", 0) or 0),
+                    )
                     if last_seen_id is None:
-                        last_seen_id = mid
-                    elif mid > last_seen_id:
-                        last_seen_id = mid
-                        # emit exactly the latest one (FCFS target)
-                        await emit_post_found(lb, m0)
-                # else: nothing
+                        last_seen_id = int(getattr(msgs[0], "id", 0) or 0)
+                    else:
+                        for m in new_msgs:
+                            last_seen_id = max(last_seen_id, int(getattr(m, "id", 0) or 0))
+                            await emit_post_found(lb, m)
+                if polled:
+                    # Also after an empty poll: confirms the watermark, so a restart
+                    # after a long quiet spell still resumes from it.
+                    save_watermark()
             finally:
                 elapsed = time.time() - t0
-                sleep_s = max(0.0, float(poll_interval_sec) - elapsed)
+                sleep_s = max(0.0, tick_s - elapsed)
                 await asyncio.sleep(sleep_s)
 
     async def keepalive_loop():
-        """Staggered keepalive: one account per tick makes a cheap request."""
+        """Staggered keepalive: one account per tick makes a cheap request.
+
+        A keepalive that succeeds after a failure means the account reconnected:
+        it triggers a catch-up for posts missed while it was down.
+        """
         labels = [acct_label(a) for a in accounts]
         idx = 0
+        down: set[str] = set()
         while not stop_all.is_set():
             t0 = time.time()
             lb = labels[idx % len(labels)]
@@ -2754,18 +3585,30 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 if rt and rt.get("client") is not None:
                     client = rt["client"]
                     try:
-                        # cheapest reliable keepalive
-                        await client.get_me()
+                        # cheapest reliable keepalive (also feeds RPC latency stats)
+                        with rpc_stats.measure(lb):
+                            await client.get_me()
+                        if monitor_mode != "poll_only" and rt.get("ch_ent") is not None and lb not in down:
+                            # Live updates are flowing for this detector: nothing was missed.
+                            try:
+                                post_store.confirm_watermark(int(tl_utils.get_peer_id(rt["ch_ent"])))
+                            except Exception:
+                                pass
+                        if lb in down:
+                            down.discard(lb)
+                            _spawn_run(catch_up(lb, "reconnect"))
                     except Exception:
-                        pass
+                        down.add(lb)
             elapsed = time.time() - t0
             sleep_s = max(0.0, float(keepalive_interval_sec) - elapsed)
             await asyncio.sleep(sleep_s)
 
 
 
-    async def ensure_joined(client: TelegramClient, ch_ent, label: str) -> bool:
+    async def ensure_joined(client: TelegramClient, ch_ent, label: str) -> Optional[bool]:
         # If account is not a participant of the target channel/group, try joining it.
+        # True: member (confirmed), False: join failed, None: could not check (FloodWait,
+        # network) -- the run goes on, but membership is not cached.
         try:
             # Only channels/supergroups support channels.GetParticipantRequest/JoinChannelRequest.
             if not isinstance(ch_ent, types.Channel):
@@ -2794,7 +3637,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             return False
         except Exception:
             # If we cannot check, don't block the run.
-            return True
+            return None
     async def auto_stop_5m():
         # Auto-stop guard for headed (non-headless) runs.
         # IMPORTANT: In OLD (test) mode the user wants the final status to stay on-screen
@@ -2806,100 +3649,153 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             # keep UI simple: just stop everything
             _request_stop("pause")
 
-    def build_watch_text() -> str:
+    # Render caches: borders/header and account/proxy cells never change during a
+    # run; a row line is rebuilt only when the row is dirty or its render key
+    # (status after overlay, detail, ticket, zebra parity, animation phase) moves.
+    row_cache = RowRenderCache()
+    static_cells: dict[str, tuple[str, str]] = {}
+    frame_parts: dict[str, str] = {}
+
+    def _frame_parts() -> dict[str, str]:
+        if not frame_parts:
+            def _header_label(txt: str) -> str:
+                return f" {theme.gray_text('▌')} {theme.gray_text(txt)}"
+
+            b_v = dimBorder("│")
+            frame_parts.update(
+                b_v=b_v,
+                top=dimBorder("┌" + "─"*W_ACC + "┬" + "─"*W_ST + "┬" + "─"*W_TK + "┬" + "─"*W_PR + "┐", bright=True),
+                mid=dimBorder("├" + "─"*W_ACC + "┼" + "─"*W_ST + "┼" + "─"*W_TK + "┼" + "─"*W_PR + "┤"),
+                bot=dimBorder("└" + "─"*W_ACC + "┴" + "─"*W_ST + "┴" + "─"*W_TK + "┴" + "─"*W_PR + "┘"),
+                header=(
+                    b_v + _pad_ansi(_header_label("Account"), W_ACC) +
+                    b_v + _pad_ansi(_header_label("Status"), W_ST) +
+                    b_v + _pad_ansi(_header_label("Ticket"), W_TK) +
+                    b_v + _pad_ansi(_header_label("Proxy"), W_PR) + b_v
+                ),
+            )
+        return frame_parts
+
+    def _static_cells(label: str, row: RowState) -> tuple[str, str]:
+        cells = static_cells.get(label)
+        if cells is None:
+            acc_cell = _pad_ansi(" " + _fit_cell(str(label), W_ACC-1, kind="email"), W_ACC)
+            pr_cell = _pad_ansi(" " + formatProxyMasked(str(row.proxy or "-"), W_PR-1), W_PR)
+            cells = (acc_cell, pr_cell)
+            static_cells[label] = cells
+        return cells
+
+    def build_watch_text(dirty: Optional[set[str]] = None) -> str:
         """Render the watch screen into a single ANSI string.
 
         Used both by classic clear+redraw and by prompt_toolkit TUI.
+        dirty: rows changed since the last frame (their cached lines are dropped).
         """
         # WATCH SCREEN: table-only layout (as requested)
         # Fixed widths (do NOT depend on terminal size) so the panel doesn't
         # "breathe" when the window size changes. Long values are clipped
         # with ellipsis so borders never break.
         # Proxy width (W_PR) is derived once from accounts.csv.
+        if dirty:
+            row_cache.discard(dirty)
+        parts = _frame_parts()
+        b_v = parts["b_v"]
+        paused = ui_paused.is_set()
+        try:
+            overlay_label = _POLL_OVERLAY_LABEL if time.time() < float(_POLL_OVERLAY_UNTIL) else None
+        except Exception:
+            overlay_label = None
+        phase = _MONITOR_PHASE % 4
+        st_cells: dict[tuple[str, str], str] = {}
 
-        def line_top():
-            return dimBorder("┌" + "─"*W_ACC + "┬" + "─"*W_ST + "┬" + "─"*W_TK + "┬" + "─"*W_PR + "┐", bright=True)
-        def line_mid():
-            return dimBorder("├" + "─"*W_ACC + "┼" + "─"*W_ST + "┼" + "─"*W_TK + "┼" + "─"*W_PR + "┤")
-        def line_bot():
-            return dimBorder("└" + "─"*W_ACC + "┴" + "─"*W_ST + "┴" + "─"*W_TK + "┴" + "─"*W_PR + "┘")
-
-        def _header_label(txt: str) -> str:
-            return f" {theme.gray_text('▌')} {theme.gray_text(txt)}"
-
-        b_v = dimBorder("│")
-
-        lines: list[str] = []
-        lines.append(line_top())
-        header = (
-            b_v + _pad_ansi(_header_label("Account"), W_ACC) +
-            b_v + _pad_ansi(_header_label("Status"), W_ST) +
-            b_v + _pad_ansi(_header_label("Ticket"), W_TK) +
-            b_v + _pad_ansi(_header_label("Proxy"), W_PR) + b_v
-        )
-        lines.append(header)
-        lines.append(line_mid())
+        lines: list[str] = [parts["top"], parts["header"], parts["mid"]]
         row_idx = 0
         for label, row in state.items():
             if str(label).startswith("__"):
                 continue
-            acc = str(label)
-            proxy = str(row.get("proxy") or "-")
-            ticket = str(row.get("ticket") or "-")
-            if ui_paused.is_set():
-                st_code = "STOPPED"
-            else:
-                st_code = str(row.get("status") or "WAITING")
-            detail = str(row.get("detail") or "")
+            st_code = "STOPPED" if paused else str(row.status or "WAITING")
+            detail = str(row.detail or "")
+            ticket = str(row.ticket or "-")
 
             # Truthful UI overlay: show 📡 POLL only for the account currently doing the poll tick.
             # Do NOT override important statuses like OPENING/SUCCESS/ERROR.
-            try:
-                global _POLL_OVERLAY_LABEL, _POLL_OVERLAY_UNTIL
-                if (label == _POLL_OVERLAY_LABEL) and (time.time() < float(_POLL_OVERLAY_UNTIL)):
-                    if str(st_code).upper() in ("WAITING", "IDLE", "MONITORING", "POLL"):
-                        st_code = "POLL"
-            except Exception:
-                pass
-
-            st = _status_cell(st_code, detail)
-            tk_plain = "—" if (ticket.strip() in ("", "-", "—")) else _fit_cell(ticket, W_TK-1)
-            tk_colored = theme.gray_text("—") if tk_plain == "—" else theme.purple_text(tk_plain)
-            pr_colored = formatProxyMasked(proxy, W_PR-1)
-
-            # Clip values (visible width) before padding
-            acc_cell = _pad_ansi(" " + _fit_cell(acc, W_ACC-1, kind="email"), W_ACC)
-            st_cell  = _pad_ansi(" " + st, W_ST)
-            tk_cell  = _pad_ansi(" " + tk_colored, W_TK)
-            pr_cell  = _pad_ansi(" " + pr_colored, W_PR)
-            row_line = b_v + acc_cell + b_v + st_cell + b_v + tk_cell + b_v + pr_cell + b_v
-            lines.append(zebraRow(row_idx, row_line))
+            if label == overlay_label and st_code.upper() in ("WAITING", "IDLE", "MONITORING", "POLL"):
+                st_code = "POLL"
+
+            key = (st_code, detail, ticket, row_idx % 2, phase if st_code.upper() == "MONITORING" else 0)
+
+            def _build(st_code=st_code, detail=detail, ticket=ticket, row=row, label=label, idx=row_idx) -> str:
+                st_cell = st_cells.get((st_code, detail))
+                if st_cell is None:
+                    st_cell = _pad_ansi(" " + _status_cell(st_code, detail), W_ST)
+                    st_cells[(st_code, detail)] = st_cell
+                tk_plain = "—" if (ticket.strip() in ("", "-", "—")) else _fit_cell(ticket, W_TK-1)
+                tk_colored = theme.gray_text("—") if tk_plain == "—" else theme.purple_text(tk_plain)
+                acc_cell, pr_cell = _static_cells(label, row)
+                tk_cell = _pad_ansi(" " + tk_colored, W_TK)
+                return zebraRow(idx, b_v + acc_cell + b_v + st_cell + b_v + tk_cell + b_v + pr_cell + b_v)
+
+            lines.append(row_cache.get(label, key, _build))
             row_idx += 1
-        lines.append(line_bot())
+        lines.append(parts["bot"])
         mode_val = theme.pink_text(watch_mode.upper()) if str(watch_mode).lower() == "new" else theme.white_text(watch_mode.upper())
+        ramp_txt = ""
+        if watch_mode != "old" and accounts:
+            try:
+                ready_val = f"{len(ramp['ready'])}/{len(accounts)}"
+                if ramp["done_s"] is not None:
+                    ready_val += f" ({ramp['done_s']:.1f}s)"
+                ramp_txt = f"{theme.gray_text('|')}  {theme.gray_text('Ready:')} {theme.cyan_text(ready_val)}  "
+            except Exception:
+                ramp_txt = ""
+        lat_txt = ""
+        if tracer is not None:
+            try:
+                lat_txt = tracer.summary()
+            except Exception:
+                lat_txt = ""
         if ui_mode == "ptk":
             lines.append(
                 f"{theme.gray_text('Mode:')} {mode_val}  "
                 f"{theme.gray_text('|')}  {theme.gray_text('Channel:')} {theme.cyan_text(channel or '—')}  "
+                f"{ramp_txt}"
                 f"{theme.gray_text('|')}  {theme.gray_text('Commands:')} {theme.purple_text('stop, run, quit')}"
             )
         else:
             lines.append(
                 f"{theme.gray_text('Mode:')} {mode_val}  "
                 f"{theme.gray_text('|')}  {theme.gray_text('Channel:')} {theme.cyan_text(channel or '—')}  "
+                f"{ramp_txt}"
                 f"{theme.gray_text('|')}  {theme.gray_text('Commands:')} {theme.purple_text('stop, run, quit')}"
             )
+        if lat_txt:
+            lines.append(f"{theme.gray_text('Latency p50/p95 ms:')} {theme.white_text(lat_txt)}")
         return "\n".join(lines)
 
-    async def render_loop():
-        while not quit_all.is_set():
-            # Advance monitoring animation deterministically per redraw.
-            if not ui_paused.is_set():
+    # Frames are event driven: a row change (set_row -> reducer) triggers one,
+    # coalesced to ui_max_fps; otherwise the MONITORING dots tick every 0.7s.
+    anim_next = [time.monotonic()]
+
+    async def _next_frame(animate: bool) -> set[str]:
+        dirty = await ui.next_frame(max_fps=ui_max_fps, idle_s=anim_next[0] - time.monotonic())
+        now = time.monotonic()
+        if now >= anim_next[0]:
+            anim_next[0] = now + 0.7
+            if animate:
                 global _MONITOR_PHASE
                 _MONITOR_PHASE = (_MONITOR_PHASE + 1) % 4
+        return dirty
+
+    async def render_loop():
+        last_text = None
+        while not quit_all.is_set():
+            dirty = await _next_frame(not ui_paused.is_set())
+            text = build_watch_text(dirty)
+            if text == last_text:
+                continue
+            last_text = text
             clear()
-            print(build_watch_text())
-            await asyncio.sleep(0.7)
+            print(text)
 
     async def input_loop():
         while not quit_all.is_set():
@@ -3025,16 +3921,17 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             pass
 
         async def render_task():
+            last_text = None
             while True:
                 if quit_all.is_set():
                     break
-                if not stop_all.is_set():
-                    if not ui_paused.is_set():
-                        global _MONITOR_PHASE
-                        _MONITOR_PHASE = (_MONITOR_PHASE + 1) % 4
-                output_control.text = ANSI(build_watch_text())
+                dirty = await _next_frame(not stop_all.is_set() and not ui_paused.is_set())
+                text = build_watch_text(dirty)
+                if text == last_text:
+                    continue
+                last_text = text
+                output_control.text = ANSI(text)
                 app.invalidate()
-                await asyncio.sleep(0.7)
 
         rt = asyncio.create_task(render_task())
         try:
@@ -3055,7 +3952,14 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         session_file = session_dir / re.sub(r'[^0-9A-Za-z_\-]+', '_', phone)
 
         client: Optional[TelegramClient] = None
-        processed: dict = {}
+        processed = DedupeStore(max(0, dup_window) / 1000.0)  # (chat_id, msg_id)
+        # Openers (NEW mode) skip update processing and the channel entirely:
+        # they only need a connection for RequestAppWebViewRequest.
+        is_opener = watch_mode != "old" and not role_detects(account.get("role"))
+        client_kwargs = {"receive_updates": False} if is_opener else {}
+        # Detector-only accounts (NEW mode) never open: no browser, no open
+        # workers and no open_q in their runtime, so fanout_open skips them.
+        is_detector_only = watch_mode != "old" and not role_opens(account.get("role"))
 
         # Per-account queues:
         # - msg_q: OLD mode one-shot processing pipeline (kept intact)
@@ -3069,26 +3973,33 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             if stop_all.is_set():
                 return
             try:
-                cur = str(state.get(label, {}).get('status') or '')
+                cur = _row_status(label)
             except Exception:
                 cur = ''
             if cur == expect_status and watch_mode != 'old':
                 set_row(label, new_status)
 
 
+        def _prefetch_webview(url: str, *, warm_browser: bool = True) -> asyncio.Task:
+            """Start the WebView URL RPC (and browser warm-up) now, overlapping the pre-open delay."""
+            if warm_browser and warm_session is not None:
+                _spawn_run(warm_session.start())
+            return asyncio.create_task(get_webview_url_for_miniapp(client, url))
+
+        async def _sleep_until(deadline: float, prefetch: asyncio.Task) -> None:
+            try:
+                await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+            except BaseException:
+                prefetch.cancel()
+                raise
+
         # Core handler used by OLD mode (paste message link and open once).
         async def handle_message(msg_in):
             try:
                 msg = msg_in
                 key = (msg.chat_id, msg.id)
-                t = int(time.time() * 1000)
-
-                for k, ts in list(processed.items()):
-                    if t - ts > max(dup_window, 60_000):
-                        processed.pop(k, None)
-                if key in processed and (t - processed[key]) < dup_window:
+                if processed.seen(key):
                     return
-                processed[key] = t
 
                 url = extract_launch_url(msg, launch_text)
                 if not url and cfg.get("miniapp_link_fallback", True):
@@ -3113,19 +4024,22 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         _spawn_run(_reset_status_after(120, "BADLINK", "MONITORING"))
                     return
 
+                # IMPORTANT: Result detection must run on the Telegram WebView URL.
+                # Even in non-headless mode (when we open the Mini App for you to see),
+                # we still fetch the WebView URL and pass it to Playwright.
+                # The RPC starts now and runs during the pre-open delay.
+                wv_task = _prefetch_webview(url, warm_browser=not (watch_mode == "old" and not headless_mode))
                 delay_ms = choose_delay_ms(pre_spec)
+                deadline = time.monotonic() + delay_ms / 1000
                 if delay_ms > 0:
                     set_row(label, "DELAY", f"{delay_ms}ms")
-                    await asyncio.sleep(delay_ms / 1000)
+                    await _sleep_until(deadline, wv_task)
 
                 set_row(label, "OPENING")
 
-                # IMPORTANT: Result detection must run on the Telegram WebView URL.
-                # Even in non-headless mode (when we open the Mini App for you to see),
-                # we still fetch the WebView URL and pass it to Playwright.
                 play_url = url
                 try:
-                    wurl = await get_webview_url_for_miniapp(client, url)
+                    wurl = await wv_task
                     if wurl:
                         play_url = wurl
                     else:
@@ -3170,11 +4084,9 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                             headless=headless_mode
                         )
 
-
-
+                record_outcome(label, res)
                 if res == "success":
                     set_row(label, "SUCCESS", detail)
-                    await bump_gotem()
                     try:
                         if webhook_enabled():
                             await webhook_send_async(f"✅ SUCCESS ({label}): {detail}")
@@ -3219,8 +4131,11 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         # (account-specific) and opens it in its warm browser.
         _last_open_key: Optional[tuple[int, int]] = None
 
-        async def handle_open(url: str, ticket: str, post_key: tuple[int, int]):
+        async def handle_open(url: str, ticket: str, post_key: tuple[int, int], trace=None):
             nonlocal _last_open_key
+            outcome = "aborted"
+            if trace is not None:
+                trace.mark("fanout")
             try:
                 if stop_all.is_set():
                     return
@@ -3236,7 +4151,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
 
                 # UI ticket best-effort
                 if ticket:
-                    set_row(label, state.get(label, {}).get("status") or "MONITORING", ticket=ticket)
+                    set_row(label, _row_status(label) or "MONITORING", ticket=ticket)
 
                 if open_only_tg and not is_telegram_link(url):
                     set_row(label, "BADLINK", "not tg link")
@@ -3244,24 +4159,36 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         _spawn_run(_reset_status_after(120, "BADLINK", "MONITORING"))
                     return
 
+                # WebView RPC + browser warm-up start now and overlap the delay;
+                # navigation happens at the delay deadline.
+                wv_task = _prefetch_webview(url)
+                if trace is not None:
+                    wv_t0 = time.monotonic()
+                    wv_task.add_done_callback(lambda _t: trace.add("webview", (time.monotonic() - wv_t0) * 1000.0))
                 delay_ms = choose_delay_ms(pre_spec)
+                deadline = time.monotonic() + delay_ms / 1000
                 if delay_ms > 0:
                     set_row(label, "DELAY", f"{delay_ms}ms", ticket=ticket or "")
-                    await asyncio.sleep(delay_ms / 1000)
+                    await _sleep_until(deadline, wv_task)
 
                 set_row(label, "OPENING", ticket=ticket or "")
 
                 play_url = url
                 try:
-                    wurl = await get_webview_url_for_miniapp(client, url)
+                    wurl = await wv_task
                     if wurl:
                         play_url = wurl
                     else:
+                        outcome = "no_webview"
                         set_row(label, "ERROR", "no webview url", ticket=ticket or "")
                         return
                 except Exception as e:
+                    outcome = "no_webview"
                     set_row(label, "ERROR", f"webview {type(e).__name__}", ticket=ticket or "")
                     return
+                if trace is not None:
+                    # Pre-open delay plus any WebView RPC time beyond it.
+                    trace.mark("delay")
 
                 result_timeout_ms = int(cfg.get("result_timeout_ms", 15000))
                 result_poll_ms = int(cfg.get("result_poll_ms", 500))
@@ -3273,6 +4200,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         warm_session,
                         play_url, cfg, result_timeout_ms, result_poll_ms,
                         success_patterns, fail_patterns,
+                        trace=trace,
                     )
                 else:
                     res, detail = await detect_result_via_playwright(
@@ -3282,10 +4210,13 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         proxy=proxy,
                         headless=headless_mode,
                     )
+                    if trace is not None:
+                        trace.mark("result")
+                outcome = str(res)
+                record_outcome(label, res)
 
                 if res == "success":
                     set_row(label, "SUCCESS", detail, ticket=ticket or "")
-                    await bump_gotem()
                     try:
                         if webhook_enabled():
                             await webhook_send_async(f"✅ SUCCESS ({label}): {detail}")
@@ -3317,11 +4248,15 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                     set_row(label, "ERROR", detail, ticket=ticket or "")
 
             except Exception as e:
+                outcome = "error"
                 msg = f"{type(e).__name__}: {e}"
                 if proxy and _looks_like_proxy_issue(msg):
                     set_row(label, "PROXY_WEBR", _short_proxy_hint(msg) or type(e).__name__, ticket=ticket or "")
                 else:
                     set_row(label, "ERROR", msg, ticket=ticket or "")
+            finally:
+                if trace is not None:
+                    trace.finish(outcome)
 
         async def worker_loop():
             while not stop_all.is_set():
@@ -3341,7 +4276,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         pass
 
         worker_t: Optional[asyncio.Task] = None
-        open_t: Optional[asyncio.Task] = None
+        open_ts: list[asyncio.Task] = []
 
         async def open_worker_loop():
             while not stop_all.is_set():
@@ -3350,8 +4285,8 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 except asyncio.CancelledError:
                     break
                 try:
-                    u, tk, pkey = item
-                    await handle_open(u, tk, pkey)
+                    u, tk, pkey, tr = item
+                    await handle_open(u, tk, pkey, tr)
                 except Exception:
                     pass
                 finally:
@@ -3360,10 +4295,13 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                     except Exception:
                         pass
 
+        ramp_held: list[asyncio.Semaphore] = []
         try:
+            set_row(label, "WAITING", "ramp-up")
+            ramp_held = await _ramp_acquire(account)
             set_row(label, "LOGIN")
             tg_proxy = account.get("tg_proxy")
-            client = TelegramClient(str(session_file), api_id, api_hash, proxy=tg_proxy)
+            client = make_client(str(session_file), api_id, api_hash, proxy=tg_proxy, **client_kwargs)
 
             # Connect with a hard timeout + retry, so one bad proxy state doesn't kill the whole run.
             connect_timeout = float(cfg.get("tg_connect_timeout_sec", 15.0) or 15.0)
@@ -3385,34 +4323,51 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         pass
                     # Recreate client to avoid stuck sockets
                     try:
-                        client = TelegramClient(str(session_file), api_id, api_hash, proxy=tg_proxy)
+                        client = make_client(str(session_file), api_id, api_hash, proxy=tg_proxy, **client_kwargs)
                     except Exception:
                         pass
+                    # Back off outside the ramp slot: a dead proxy must not keep
+                    # healthy accounts waiting in ramp-up.
+                    _ramp_release(ramp_held)
                     await asyncio.sleep(min(backoff, 30.0))
                     backoff = min(backoff * 2.0, 30.0)
+                    if stop_all.is_set():
+                        break
+                    ramp_held = await _ramp_acquire(account)
             if not await client.is_user_authorized():
                 set_row(label, "ERROR", "not authorized (login required)")
                 return
 
-            try:
-                ch_ent = await resolve_channel_entity(client, channel)
-            except Exception:
-                set_row(label, "ERROR", "no access to channel")
-                return
+            ch_ent = None
+            if not is_opener:
+                try:
+                    ch_ent, ch_cached = await resolve_channel_cached(client, account)
+                except Exception:
+                    set_row(label, "ERROR", "no access to channel")
+                    return
 
-            # If the account isn't in the channel/group, try joining it once.
-            try:
-                ok = await ensure_joined(client, ch_ent, label)
-            except Exception:
-                ok = True
-            if not ok:
-                return
+                # If the account isn't in the channel/group, try joining it once
+                # (skipped when membership is already cached).
+                cache_key = _channel_cache_key(account)
+                if not (ch_cached and channel_cache.joined(cache_key, channel)):
+                    try:
+                        ok = await ensure_joined(client, ch_ent, label)
+                    except Exception:
+                        ok = None
+                    if ok is False:
+                        if channel_cache_on:
+                            channel_cache.invalidate(cache_key, channel)
+                        return
+                    # Only a confirmed membership is cached: after a transient error
+                    # (FloodWait, network) the next run checks again.
+                    if ok and channel_cache_on:
+                        channel_cache.set_joined(cache_key, channel, True)
 
             # Warm browser: in headless runs, prestart Chromium so that on the first
             # post we don't pay launch cost (and the OPENING -> SUCCESS transition is snappier).
             try:
-                warm_session = warm_cache.get(label)
-                if warm_session is None:
+                warm_session = None if is_detector_only else warm_cache.get(label)
+                if warm_session is None and not is_detector_only:
                     storage_mode = str(cfg.get("storage_state_mode", "off") or "off").strip().lower()
                     storage_state_path = None
                     if storage_mode in ("use", "capture"):
@@ -3427,6 +4382,9 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         storage_state_path = pth
 
                     goto_wait_until = str(cfg.get("goto_wait_until", "commit") or "commit").strip() or "commit"
+                    shared_pool = None
+                    if _browser_mode(cfg) == "shared":
+                        shared_pool = _shared_browser_pool(cfg, bool(headless_mode))
                     warm_session = WarmBrowserSession(
                         profile_dir=profile_dir,
                         proxy=proxy,
@@ -3434,32 +4392,48 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         wait_until=goto_wait_until,
                         storage_state_mode=storage_mode,
                         storage_state_path=storage_state_path,
+                        push_detect=_result_detect_mode(cfg) == "push",
+                        page_pool_size=_warm_page_pool_size(cfg),
+                        shared_pool=shared_pool,
+                        resource_filter_cfg=cfg if cfg.get("resource_filter_enabled", False) else None,
                     )
                     warm_cache[label] = warm_session
                 if headless_mode and warm_session is not None:
-                    _spawn_run(warm_session.start())
+                    # Inside the ramp slot, so browser launches are staggered too.
+                    try:
+                        await warm_session.start()
+                    except Exception:
+                        pass
             except Exception:
                 warm_session = None
 
             # Start per-account workers.
             if watch_mode == "old":
                 worker_t = asyncio.create_task(worker_loop())
-            else:
-                open_t = asyncio.create_task(open_worker_loop())
+            elif not is_detector_only:
+                # One open worker per warm pool page so back-to-back posts open in parallel.
+                n_open = warm_session.page_pool_size if warm_session is not None else 1
+                for _ in range(n_open):
+                    open_ts.append(asyncio.create_task(open_worker_loop()))
 
             # Register runtime for shared bus/poll/keepalive (NEW architecture).
             try:
                 runtimes[label] = {
                     "client": client,
                     "ch_ent": ch_ent,
-                    "open_q": open_q,
+                    "open_q": None if is_detector_only else open_q,
                     "warm_session": warm_session,
+                    "role": "opener" if is_opener else str(account.get("role") or "both"),
                 }
                 ev = runtimes_ready.get(label)
                 if ev is not None:
                     ev.set()
             except Exception:
                 pass
+            if watch_mode != "old" and not is_opener:
+                # Replay anything posted while this account was offline / stopped.
+                _spawn_run(catch_up(label, "connect"))
+            _ramp_release(ramp_held)
 
 
             if watch_mode == "old":
@@ -3488,8 +4462,8 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                     await asyncio.sleep(0.5)
                 return
 
-            # LIVE monitor only if mode includes LIVE.
-            if monitor_mode in ("live_only", "live+poll"):
+            # LIVE monitor only if mode includes LIVE (detectors only).
+            if monitor_mode in ("live_only", "live+poll") and not is_opener:
                 @client.on(events.NewMessage(chats=ch_ent))
                 async def handler(event):
                     if stop_all.is_set():
@@ -3507,6 +4481,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                         pass
 
             set_row(label, "MONITORING")
+            _ramp_settle(label, True)
             while not stop_all.is_set():
                 await asyncio.sleep(0.5)
 
@@ -3514,16 +4489,18 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
             set_row(label, "ERROR", f"{type(e).__name__}: {e}")
 
         finally:
+            _ramp_release(ramp_held)
+            _ramp_settle(label, False)
             try:
                 if worker_t is not None:
                     worker_t.cancel()
             except Exception:
                 pass
-            try:
-                if open_t is not None:
-                    open_t.cancel()
-            except Exception:
-                pass
+            for t in open_ts:
+                try:
+                    t.cancel()
+                except Exception:
+                    pass
             try:
                 if client:
                     await client.disconnect()
@@ -3543,7 +4520,7 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                     if ctx_keep is not None:
                         await ctx_keep.close()
                     if pw_keep is not None:
-                        await pw_keep.stop()
+                        _PLAYWRIGHT.release(pw_keep)
                 except Exception:
                     pass
 
@@ -3573,13 +4550,15 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 # Do not print to stdout/stderr: it corrupts the full-screen UI.
                 await asyncio.sleep(0.5)
 
-    log_t = asyncio.create_task(_status_log_writer())
+    # Runs until cancelled in the finally below (after the last run stopped), then flushes.
+    log_t = asyncio.create_task(status_log.run())
+    trace_t = asyncio.create_task(tracer.run()) if tracer is not None else None
     render_t: Optional[asyncio.Task] = None
     input_t: Optional[asyncio.Task] = None
     ui_t: Optional[asyncio.Task] = None
     if ui_mode == "ptk":
         ui_t = asyncio.create_task(ptk_ui_loop())
-    else:
+    elif ui_mode == "classic":
         render_t = asyncio.create_task(render_loop())
         input_t = asyncio.create_task(input_loop())
 
@@ -3597,10 +4576,12 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         runtimes = {}
         runtimes_ready = {acct_label(a): asyncio.Event() for a in accounts}
         post_q = asyncio.Queue(maxsize=200)
-        seen_posts = {}
+        seen_posts = _load_seen_posts()
         ui_paused.clear()
+        ui.touch()
         stop_reason["mode"] = "run"
         _set_all_rows(default_idle_status)
+        ramp.update(t0=time.monotonic(), ready=set(), settled=set(), done_s=None)
         try:
             global _POLL_OVERLAY_LABEL, _POLL_OVERLAY_UNTIL
             _POLL_OVERLAY_LABEL = None
@@ -3653,10 +4634,14 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
         except Exception:
             pass
         run_extras.clear()
+        try:
+            post_store.close()
+        except Exception:
+            pass
 
         try:
             _drain_queue(post_q)
-            _drain_queue(_status_log_q)
+            status_log.flush()
         except Exception:
             pass
         try:
@@ -3718,6 +4703,14 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
     if ui_mode == "ptk":
         ui_exit_t = asyncio.create_task(_ui_exit_watcher())
 
+    async def _quit_event_watcher():
+        await quit_event.wait()
+        _request_stop("quit")
+
+    quit_ev_t: Optional[asyncio.Task] = None
+    if quit_event is not None:
+        quit_ev_t = asyncio.create_task(_quit_event_watcher())
+
     run_tasks: list[asyncio.Task] = []
     run_active = False
     cmd_task: Optional[asyncio.Task] = None
@@ -3796,7 +4789,25 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 await _stop_run(run_tasks)
         except Exception:
             pass
-        for t in (log_t, render_t, input_t):
+        # Writers flush on cancel; gzip threads are joined off the loop by aclose().
+        for t in (log_t, trace_t):
+            if t is not None:
+                t.cancel()
+        try:
+            await asyncio.gather(*(t for t in (log_t, trace_t) if t is not None), return_exceptions=True)
+        except Exception:
+            pass
+        for w in (status_log, tracer):
+            try:
+                if w is not None:
+                    await w.aclose()
+            except Exception:
+                pass
+        try:
+            await _STATS.aclose()
+        except Exception:
+            pass
+        for t in (render_t, input_t, quit_ev_t):
             try:
                 if t is not None:
                     t.cancel()
@@ -3845,6 +4856,13 @@ async def watch_multi(cfg: dict, *, resume: bool = False) -> None:
                 warm_cache.clear()
             except Exception:
                 pass
+        # After the warm sessions above are closed: stop the shared Playwright
+        # driver too (kept if a keep-open window still holds it).
+        if quit_all.is_set() and _PLAYWRIGHT.refs == 0:
+            try:
+                await _PLAYWRIGHT.shutdown()
+            except Exception:
+                pass
         return
 async def set_channel(cfg: dict) -> None:
     clear()
@@ -3941,25 +4959,124 @@ def parse_miniapp_direct_link(url: str) -> tuple[Optional[str], Optional[str], O
         return None, None, None
 
 
+class BotAppCache:
+    """Per-client cache of (bot input peer, InputBotAppShortName) by (bot, short_name).
+
+    Input peers carry a per-account access_hash, so there is one cache per
+    TelegramClient. Concurrent lookups of the same key share one resolve; failed
+    resolves are not cached. Entries expire after ttl_sec; at most max_items are
+    kept (least recently used evicted first).
+    """
+
+    def __init__(self, ttl_sec: float = 1800.0, max_items: int = 64):
+        self.ttl_sec = float(ttl_sec)
+        self.max_items = max(1, int(max_items))
+        self._items: "OrderedDict[tuple[str, str], tuple[float, asyncio.Future]]" = OrderedDict()
+
+    @staticmethod
+    def _key(bot_username: str, short_name: str) -> tuple[str, str]:
+        return (str(bot_username or "").lower(), str(short_name or "").lower())
+
+    async def _resolve(self, client, bot_username: str, short_name: str):
+        bot_peer = await client.get_input_entity(bot_username)
+        return bot_peer, types.InputBotAppShortName(bot_id=bot_peer, short_name=short_name)
+
+    async def get(self, client, bot_username: str, short_name: str):
+        key = self._key(bot_username, short_name)
+        now = time.monotonic()
+        hit = self._items.get(key)
+        if hit is not None and hit[0] > now:
+            self._items.move_to_end(key)
+            fut = hit[1]
+        else:
+            fut = asyncio.ensure_future(self._resolve(client, bot_username, short_name))
+            self._items[key] = (now + self.ttl_sec, fut)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        try:
+            # shield: a cancelled caller (e.g. prefetch) must not cancel the shared resolve
+            return await asyncio.shield(fut)
+        except Exception:
+            cur = self._items.get(key)
+            if cur is not None and cur[1] is fut:
+                self._items.pop(key, None)
+            raise
+
+    def invalidate(self, bot_username: str, short_name: str) -> None:
+        self._items.pop(self._key(bot_username, short_name), None)
+
+
+_BOT_APP_CACHES: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def bot_app_cache(client) -> BotAppCache:
+    cache = _BOT_APP_CACHES.get(client)
+    if cache is None:
+        cache = BotAppCache()
+        _BOT_APP_CACHES[client] = cache
+    return cache
+
+
+async def prefetch_miniapp_app(client, miniapp_url: str) -> None:
+    """Warm the bot peer/app cache for a Mini App link (best-effort)."""
+    bot_username, short_name, _start = parse_miniapp_direct_link(miniapp_url)
+    if not bot_username or not short_name:
+        return
+    try:
+        await bot_app_cache(client).get(client, bot_username, short_name)
+    except Exception:
+        pass
+
+
+# RPC errors meaning the cached bot peer/app handle is stale (not FloodWait, timeouts, network).
+_STALE_BOT_APP_ERRORS = (
+    "PEER_ID_INVALID",
+    "USER_ID_INVALID",
+    "BOT_INVALID",
+    "BOT_APP_INVALID",
+    "BOT_APP_SHORTNAME_INVALID",
+    "BOT_APP_BOT_INVALID",
+    "INPUT_USER_DEACTIVATED",
+    "ACCESS_HASH",
+)
+
+
+def _is_stale_bot_app_error(e: BaseException) -> bool:
+    if type(e).__name__ in ("PeerIdInvalidError", "UserIdInvalidError", "BotInvalidError", "InputUserDeactivatedError"):
+        return True
+    msg = f"{getattr(e, 'message', '') or ''} {e}".upper()
+    return any(code in msg for code in _STALE_BOT_APP_ERRORS)
+
+
 async def get_webview_url_for_miniapp(client, miniapp_url: str) -> Optional[str]:
     """
     Request the real Telegram WebView URL for a bot Mini App deep link.
     Requires Telethon version that includes messages.RequestAppWebViewRequest.
+    Bot peer/app handles come from the per-client BotAppCache, so the hot path
+    is a single RequestAppWebViewRequest.
     """
     bot_username, short_name, start_param = parse_miniapp_direct_link(miniapp_url)
     if not bot_username or not short_name:
         return None
 
-    bot_peer = await client.get_input_entity(bot_username)
-    inp_app = types.InputBotAppShortName(bot_id=bot_peer, short_name=short_name)
+    cache = bot_app_cache(client)
+    bot_peer, inp_app = await cache.get(client, bot_username, short_name)
 
-    res = await client(functions.messages.RequestAppWebViewRequest(
-        peer=bot_peer,
-        app=inp_app,
-        platform="macos",
-        write_allowed=True,
-        start_param=start_param or None
-    ))
+    try:
+        res = await client(functions.messages.RequestAppWebViewRequest(
+            peer=bot_peer,
+            app=inp_app,
+            platform="macos",
+            write_allowed=True,
+            start_param=start_param or None
+        ))
+    except Exception as e:
+        # Stale peer/app (bot changed, access hash invalid): resolve again next time.
+        # FloodWait / timeouts / connection errors keep the entry.
+        if _is_stale_bot_app_error(e):
+            cache.invalidate(bot_username, short_name)
+        raise
     return getattr(res, "url", None)
 
 async def main():
@@ -4006,8 +5123,8 @@ async def main():
             await set_watch_mode(cfg)
 
         elif choice == "5":
-            cfg["gotem"] = 0
-            save_config(cfg)
+            gotem_count(cfg)
+            _STATS.reset_gotem()
             status_info("Got'em reset to 0.")
             await asyncio.sleep(0.8)
 
@@ -4041,9 +5158,17 @@ async def main():
         elif choice == "7":
             break
 
+async def _main_and_cleanup() -> None:
+    try:
+        await main()
+    finally:
+        await _PLAYWRIGHT.shutdown()
+        await _STATS.aclose()
+
+
 def run_cli() -> None:
     try:
-        asyncio.run(main())
+        asyncio.run(_main_and_cleanup())
     except KeyboardInterrupt:
         clear()
         print("Bye")
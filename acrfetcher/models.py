@@ -11,6 +11,7 @@ class AccountRecord:
     proxy_raw: str
     proxy: Optional[dict]
     tg_proxy: Any
+    role: str = "both"  # detector | opener | both
 
 
 @dataclass(slots=True)
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class PostStore:
+    """On-disk dedupe keys + per-channel last-seen id (watermark).
+
+    Append-only JSONL log under DATA_DIR: one record per accepted post
+    ({"k": "seen", "c": chat_id, "m": msg_id, "t": ts}) or watermark move
+    ({"k": "wm", ...}). load() replays it (a torn last line is ignored) and
+    compacts. Once compact_every appends piled up, compact_due is set and the
+    owner runs acompact() (fsync in a worker thread, off the detection path),
+    keeping watermarks and posts younger than ttl_s. Timestamps are wall
+    clock so they survive restarts.
+
+    The watermark moves freely via set_watermark() (poll / catch-up results).
+    A live post (mark_seen) only moves it when its id is the next one, so an
+    out-of-order post never skips ids that were not seen; a post that fills
+    the gap carries the watermark over the ids already seen.
+
+    A watermark's ts is when it was last confirmed (a poll/catch-up that found
+    nothing newer counts), not when the post arrived: on a quiet channel the
+    same id is re-appended at most every confirm_every_s, and close() writes
+    the latest confirmation, so a restart still finds a fresh watermark.
+    """
+
+    def __init__(self, path: Path, ttl_s: float = 1800.0, compact_every: int = 2000, confirm_every_s: float = 60.0):
+        self.path = Path(path)
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.compact_every = max(10, int(compact_every))
+        self.confirm_every_s = max(0.0, float(confirm_every_s))
+        self._seen: dict[tuple[int, int], float] = {}
+        self._wm: dict[int, tuple[int, float]] = {}  # chat_id -> (msg_id, ts)
+        self._wm_saved: dict[int, float] = {}  # chat_id -> ts of the last persisted watermark
+        self._fh = None
+        self._appends = 0
+        self._since: Optional[list] = None  # records appended while acompact() runs
+
+    # -- loading / compaction -------------------------------------------------
+
+    def load(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else float(now)
+        self._seen.clear()
+        self._wm.clear()
+        self._wm_saved.clear()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self._apply(rec.get("k"), int(rec["c"]), int(rec["m"]), float(rec.get("t", 0)))
+                    except Exception:
+                        continue
+        except FileNotFoundError:
+            pass
+        except Exception:
+            pass
+        self.compact(now)
+
+    def _apply(self, kind, chat_id: int, msg_id: int, ts: float) -> None:
+        if kind == "seen":
+            self._seen[(chat_id, msg_id)] = ts
+            self._advance_seen(chat_id, msg_id, ts)
+        elif kind == "wm":
+            self._bump_wm(chat_id, msg_id, ts)
+
+    def _bump_wm(self, chat_id: int, msg_id: int, ts: float) -> bool:
+        cur = self._wm.get(chat_id)
+        if cur is None or msg_id > cur[0]:
+            self._wm[chat_id] = (msg_id, ts)
+            return True
+        if msg_id == cur[0] and ts > cur[1]:
+            self._wm[chat_id] = (msg_id, ts)
+        return False
+
+    def _advance_seen(self, chat_id: int, msg_id: int, ts: float) -> bool:
+        """Watermark move for a live post: first id, or contiguous (then through seen ids)."""
+        cur = self._wm.get(chat_id)
+        if cur is None:
+            return self._bump_wm(chat_id, msg_id, ts)
+        if msg_id != cur[0] + 1:
+            return False
+        top = msg_id
+        while (chat_id, top + 1) in self._seen:
+            top += 1
+        return self._bump_wm(chat_id, top, ts)
+
+    def _snapshot(self, now: float) -> tuple[dict, list]:
+        cutoff = now - self.ttl_s
+        self._seen = {k: ts for k, ts in self._seen.items() if ts > cutoff}
+        return dict(self._wm), sorted(self._seen.items(), key=lambda kv: kv[1])
+
+    def _write_tmp(self, wm: dict, seen: list) -> Optional[Path]:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for chat_id, (msg_id, ts) in wm.items():
+                    f.write(json.dumps({"k": "wm", "c": chat_id, "m": msg_id, "t": ts}) + "\n")
+                for (chat_id, msg_id), ts in seen:
+                    f.write(json.dumps({"k": "seen", "c": chat_id, "m": msg_id, "t": ts}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return tmp
+        except Exception:
+            return None
+
+    @property
+    def compact_due(self) -> bool:
+        return self._appends >= self.compact_every and self._since is None
+
+    def compact(self, now: Optional[float] = None) -> None:
+        """Rewrite the log with live state only (atomic replace). Blocks on fsync."""
+        now = time.time() if now is None else float(now)
+        wm, seen = self._snapshot(now)
+        self._close_fh()
+        tmp = self._write_tmp(wm, seen)
+        if tmp is not None:
+            try:
+                os.replace(tmp, self.path)
+                self._wm_saved = {chat_id: ts for chat_id, (_m, ts) in wm.items()}
+            except Exception:
+                pass
+        self._appends = 0
+
+    async def acompact(self, now: Optional[float] = None) -> None:
+        """compact() with the write + fsync in a worker thread.
+
+        Records appended meanwhile still go to the old log and are written
+        again to the new one after the swap, so nothing is lost.
+        """
+        if self._since is not None:
+            return
+        now = time.time() if now is None else float(now)
+        wm, seen = self._snapshot(now)
+        self._appends = 0
+        self._since = []
+        try:
+            tmp = await asyncio.to_thread(self._write_tmp, wm, seen)
+            since, self._since = self._since, None
+            if tmp is None:
+                return
+            self._close_fh()
+            try:
+                os.replace(tmp, self.path)
+            except Exception:
+                return
+            self._wm_saved = {chat_id: ts for chat_id, (_m, ts) in wm.items()}
+            for rec in since:
+                self._append(*rec)
+        finally:
+            self._since = None
+
+    # -- writes ---------------------------------------------------------------
+
+    def _append(self, kind: str, chat_id: int, msg_id: int, ts: float) -> None:
+        try:
+            if self._fh is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.path, "a", encoding="utf-8")
+            self._fh.write(json.dumps({"k": kind, "c": chat_id, "m": msg_id, "t": ts}) + "\n")
+            self._fh.flush()
+        except Exception:
+            return
+        if self._since is not None:
+            self._since.append((kind, chat_id, msg_id, ts))
+        cur = self._wm.get(chat_id)
+        if cur is not None and cur[0] == msg_id:
+            self._wm_saved[chat_id] = max(ts, self._wm_saved.get(chat_id, 0.0))
+        self._appends += 1
+
+    def mark_seen(self, chat_id: int, msg_id: int, now: Optional[float] = None) -> None:
+        ts = time.time() if now is None else float(now)
+        key = (int(chat_id), int(msg_id))
+        self._seen[key] = ts
+        self._advance_seen(key[0], key[1], ts)
+        self._append("seen", key[0], key[1], ts)
+
+    def set_watermark(self, chat_id: int, msg_id: int, now: Optional[float] = None) -> None:
+        """Move the watermark up, or confirm it when msg_id is the current one."""
+        ts = time.time() if now is None else float(now)
+        chat_id, msg_id = int(chat_id), int(msg_id)
+        if self._bump_wm(chat_id, msg_id, ts):
+            self._append("wm", chat_id, msg_id, ts)
+            return
+        cur = self._wm.get(chat_id)
+        if cur is not None and cur[0] == msg_id and ts - self._wm_saved.get(chat_id, 0.0) >= self.confirm_every_s:
+            self._append("wm", chat_id, msg_id, ts)
+
+    def confirm_watermark(self, chat_id: int, now: Optional[float] = None) -> None:
+        """Nothing newer than the current watermark was missed (as of now)."""
+        cur = self._wm.get(int(chat_id))
+        if cur is not None:
+            self.set_watermark(int(chat_id), cur[0], now)
+
+    def _close_fh(self) -> None:
+        try:
+            if self._fh is not None:
+                self._fh.close()
+        except Exception:
+            pass
+        self._fh = None
+
+    def close(self) -> None:
+        # Persist confirmations still inside the confirm_every_s throttle.
+        for chat_id, (msg_id, ts) in list(self._wm.items()):
+            if ts > self._wm_saved.get(chat_id, 0.0):
+                self._append("wm", chat_id, msg_id, ts)
+        self._close_fh()
+
+    # -- reads ----------------------------------------------------------------
+
+    def watermark(self, chat_id: int, max_age_s: Optional[float] = None, now: Optional[float] = None) -> Optional[int]:
+        """Last seen msg id for chat_id (None if unknown or older than max_age_s)."""
+        cur = self._wm.get(int(chat_id))
+        if cur is None:
+            return None
+        if max_age_s is not None:
+            now = time.time() if now is None else float(now)
+            if now - cur[1] > float(max_age_s):
+                return None
+        return cur[0]
+
+    def recent(self, now: Optional[float] = None) -> list[tuple[tuple[int, int], float]]:
+        """Seen post keys younger than ttl_s, oldest first, as ((chat_id, msg_id), wall_ts)."""
+        now = time.time() if now is None else float(now)
+        cutoff = now - self.ttl_s
+        return sorted(((k, ts) for k, ts in self._seen.items() if ts > cutoff), key=lambda kv: kv[1])
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+
+async def _start_playwright() -> Any:
+    from playwright.async_api import async_playwright
+    return await async_playwright().start()
+
+
+def _driver_alive(pw: Any) -> bool:
+    """False once the driver connection is closed or the Node process exited."""
+    try:
+        conn = pw._impl_obj._connection
+    except Exception:
+        return True
+    if getattr(conn, "_closed_error", None) is not None:
+        return False
+    proc = getattr(getattr(conn, "_transport", None), "_proc", None)
+    return getattr(proc, "returncode", None) is None
+
+
+def driver_gone(exc: BaseException) -> bool:
+    """True for errors meaning the driver itself died (not just a browser/page)."""
+    return "connection closed" in str(exc).lower()
+
+
+class SharedPlaywright:
+    """One Playwright driver (Node process + pipe) for the whole process.
+
+    Warm sessions, the shared browser pool and cold detections acquire() it
+    (started lazily on first use) and release() it when they close. Reaching
+    zero references does not stop the driver, so stop/run cycles and per-post
+    cold opens reuse it; shutdown() stops it on quit.
+
+    A driver that died (OOM, crash) is replaced on the next acquire(); callers
+    that see a dead driver first can invalidate() it.
+    """
+
+    def __init__(
+        self,
+        starter: Optional[Callable[[], Awaitable[Any]]] = None,
+        alive: Optional[Callable[[Any], bool]] = None,
+    ):
+        self._starter = starter or _start_playwright
+        self._alive = alive or _driver_alive
+        self._pw: Any = None
+        self._refs = 0
+        self._lock = asyncio.Lock()
+        self.starts = 0
+
+    @property
+    def refs(self) -> int:
+        return self._refs
+
+    @property
+    def running(self) -> bool:
+        return self._pw is not None
+
+    async def acquire(self) -> Any:
+        """The driver (starting it if needed); pair with release()."""
+        async with self._lock:
+            if self._pw is not None and not self._alive(self._pw):
+                self.invalidate(self._pw)
+            if self._pw is None:
+                self._pw = await self._starter()
+                self.starts += 1
+            self._refs += 1
+            return self._pw
+
+    def is_current(self, pw: Any) -> bool:
+        return pw is not None and pw is self._pw
+
+    def invalidate(self, pw: Any) -> None:
+        """Forget a dead driver: references to it are void, the next acquire() starts a new one."""
+        if pw is None or pw is not self._pw:
+            return
+        self._pw = None
+        self._refs = 0
+
+    def release(self, pw: Any = None) -> None:
+        """Drop one reference (ignored for a driver that was already shut down)."""
+        if pw is not None and pw is not self._pw:
+            return
+        self._refs = max(0, self._refs - 1)
+
+    async def shutdown(self) -> None:
+        async with self._lock:
+            pw, self._pw = self._pw, None
+            self._refs = 0
+            if pw is None:
+                return
+            try:
+                await pw.stop()
+            except Exception:
+                pass
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+
+DEFAULT_BLOCK_TYPES = ("image", "media", "font")
+
+DEFAULT_BLOCK_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mc.yandex.ru",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "sentry.io",
+)
+
+# Rough transfer size per aborted request (bytes). Aborted requests never get a
+# response, so "bytes saved" is an estimate by resource type.
+ESTIMATED_BYTES = {
+    "image": 40_000,
+    "media": 400_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 60_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "websocket": 0,
+}
+_DEFAULT_ESTIMATE = 5_000
+
+
+def _host_key(h: str) -> str:
+    h = (h or "").strip().lower().rstrip(".")
+    if h.startswith("www."):
+        h = h[4:]
+    return h
+
+
+def _domain_list(raw: Any, default: tuple[str, ...] = ()) -> tuple[str, ...]:
+    if raw is None:
+        raw = default
+    if isinstance(raw, str):
+        raw = [x for x in raw.replace(";", ",").split(",")]
+    out: list[str] = []
+    for x in raw or []:
+        d = _host_key(str(x))
+        if d and d not in out:
+            out.append(d)
+    return tuple(out)
+
+
+def _host_matches(host: str, domains: tuple[str, ...]) -> str:
+    for d in domains:
+        if host == d or host.endswith("." + d):
+            return d
+    return ""
+
+
+@dataclass(slots=True)
+class FilterStats:
+    blocked: int = 0
+    allowed: int = 0
+    bytes_saved: int = 0
+    by_reason: dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        kb = self.bytes_saved // 1024
+        return f"blocked={self.blocked} allowed={self.allowed} saved~{kb}KB"
+
+
+class ResourceFilter:
+    """page.route() filter that aborts heavy/irrelevant requests during detection.
+
+    Order per request: allowlisted host -> continue; blocked domain -> abort;
+    blocked resource type -> abort; otherwise continue. The document itself is
+    never blocked.
+
+    Playwright disables the HTTP cache on a page with a route handler, so a
+    filtered warm page re-downloads scripts/stylesheets on every open; that
+    can outweigh the bytes saved (hence off by default).
+    """
+
+    def __init__(
+        self,
+        *,
+        block_types=DEFAULT_BLOCK_TYPES,
+        block_domains=DEFAULT_BLOCK_DOMAINS,
+        allow_domains=(),
+    ):
+        self.block_types = frozenset(str(t).strip().lower() for t in (block_types or []) if str(t).strip())
+        self.block_domains = _domain_list(block_domains)
+        self.allow_domains = _domain_list(allow_domains)
+        self.stats = FilterStats()
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> Optional["ResourceFilter"]:
+        """Filter from cfg, or None when resource_filter_enabled is off (default)."""
+        if not bool(cfg.get("resource_filter_enabled", False)):
+            return None
+        types = cfg.get("resource_filter_block_types", list(DEFAULT_BLOCK_TYPES))
+        if isinstance(types, str):
+            types = [x for x in types.replace(";", ",").split(",")]
+        return cls(
+            block_types=types,
+            block_domains=_domain_list(cfg.get("resource_filter_block_domains"), DEFAULT_BLOCK_DOMAINS),
+            allow_domains=_domain_list(cfg.get("resource_filter_allow_domains"), ()),
+        )
+
+    def decide(self, url: str, resource_type: str) -> str:
+        """Block reason ("domain:<d>" / "type:<t>") or "" to let the request through."""
+        rtype = str(resource_type or "").lower()
+        if rtype == "document":
+            return ""
+        try:
+            host = _host_key(urlsplit(str(url or "")).hostname or "")
+        except Exception:
+            host = ""
+        if host and _host_matches(host, self.allow_domains):
+            return ""
+        if host:
+            d = _host_matches(host, self.block_domains)
+            if d:
+                return f"domain:{d}"
+        if rtype in self.block_types:
+            return f"type:{rtype}"
+        return ""
+
+    def record(self, reason: str, resource_type: str) -> None:
+        st = self.stats
+        if not reason:
+            st.allowed += 1
+            return
+        st.blocked += 1
+        st.bytes_saved += ESTIMATED_BYTES.get(str(resource_type or "").lower(), _DEFAULT_ESTIMATE)
+        st.by_reason[reason] = st.by_reason.get(reason, 0) + 1
+
+    def take_stats(self) -> FilterStats:
+        """Counters since the last call (one open), then reset."""
+        st, self.stats = self.stats, FilterStats()
+        return st
+
+    async def _handle(self, route) -> None:
+        req = route.request
+        try:
+            rtype = req.resource_type
+            reason = self.decide(req.url, rtype)
+        except Exception:
+            rtype, reason = "", ""
+        self.record(reason, rtype)
+        try:
+            if reason:
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+
+    async def install(self, target) -> bool:
+        """Attach to a Playwright page or context (before navigation)."""
+        try:
+            await target.route("**/*", self._handle)
+            return True
+        except Exception:
+            return False
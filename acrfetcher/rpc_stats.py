@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+
+@dataclass(slots=True)
+class RpcStat:
+    latency_s: Optional[float] = None  # EWMA of successful call latency
+    error_rate: float = 0.0  # EWMA of 0/1 failures
+    calls: int = 0
+    errors: int = 0
+    flood_until: float = 0.0  # monotonic deadline of the last FloodWait
+
+
+class RpcStats:
+    """Per-account RPC health: EWMA latency, EWMA error rate and FloodWait deadlines.
+
+    Keys are account labels. Used to pick hedge targets for link hunting and to
+    pace polling.
+    """
+
+    def __init__(self, alpha: float = 0.3, default_latency_s: float = 0.5):
+        self.alpha = min(1.0, max(0.01, float(alpha)))
+        self.default_latency_s = float(default_latency_s)
+        self._stats: dict[str, RpcStat] = {}
+
+    def get(self, key: str) -> RpcStat:
+        st = self._stats.get(key)
+        if st is None:
+            st = RpcStat()
+            self._stats[key] = st
+        return st
+
+    def record(self, key: str, latency_s: float, ok: bool = True) -> None:
+        st = self.get(key)
+        a = self.alpha
+        st.calls += 1
+        if ok:
+            lat = max(0.0, float(latency_s))
+            st.latency_s = lat if st.latency_s is None else (a * lat + (1 - a) * st.latency_s)
+            st.error_rate = (1 - a) * st.error_rate
+        else:
+            st.errors += 1
+            st.error_rate = a + (1 - a) * st.error_rate
+
+    def record_flood(self, key: str, seconds: float, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        st = self.get(key)
+        st.flood_until = max(st.flood_until, now + max(0.0, float(seconds)))
+
+    def flood_wait_left(self, key: str, now: Optional[float] = None) -> float:
+        st = self._stats.get(key)
+        if st is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, st.flood_until - now)
+
+    def latency(self, key: str) -> float:
+        """EWMA latency, or default_latency_s for accounts with no successful call yet."""
+        st = self._stats.get(key)
+        if st is None or st.latency_s is None:
+            return self.default_latency_s
+        return st.latency_s
+
+    def error_rate(self, key: str) -> float:
+        st = self._stats.get(key)
+        return 0.0 if st is None else st.error_rate
+
+    def score(self, key: str) -> float:
+        """Expected cost of a call on this account (lower is better)."""
+        return self.latency(key) * (1.0 + 4.0 * self.error_rate(key))
+
+    def fastest(self, keys: Iterable[str], n: int = 1, now: Optional[float] = None) -> list[str]:
+        """Up to n keys with the lowest score, skipping accounts in FloodWait."""
+        now = time.monotonic() if now is None else now
+        ready = [k for k in keys if self.flood_wait_left(k, now) <= 0]
+        ready.sort(key=self.score)
+        return ready[: max(0, int(n))]
+
+    def poll_floors(
+        self,
+        keys: Iterable[str],
+        base_s: float,
+        max_factor: float = 4.0,
+        *,
+        slow_ratio: float = 3.0,
+        max_error_rate: float = 0.25,
+        min_s: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> dict[str, float]:
+        """Minimum seconds between polls per key.
+
+        The keys together get a budget of len(keys)/base_s polls per second. Only
+        clearly unhealthy keys are throttled to max_factor x base_s: FloodWait,
+        error rate >= max_error_rate, or score >= slow_ratio x the median score.
+        The budget they give up is shared by the healthy keys (floor below base_s,
+        never below min_s, default base_s/2), so normal latency spread between
+        proxies does not lower the total poll rate.
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        now = time.monotonic() if now is None else now
+        base_s = float(base_s)
+        min_s = base_s / 2.0 if min_s is None else float(min_s)
+        slow_floor = base_s * max(1.0, float(max_factor))
+        scores = sorted(self.score(k) for k in keys)
+        median = scores[(len(scores) - 1) // 2]
+        out: dict[str, float] = {}
+        healthy: list[str] = []
+        spent = 0.0  # polls/s used by throttled keys
+        for k in keys:
+            if self.flood_wait_left(k, now) > 0:
+                out[k] = slow_floor
+                continue
+            if self.error_rate(k) >= max_error_rate or (median > 0 and self.score(k) / median >= slow_ratio):
+                out[k] = slow_floor
+                spent += 1.0 / slow_floor
+                continue
+            healthy.append(k)
+        if healthy:
+            left = len(keys) / base_s - spent
+            floor = len(healthy) / left if left > 0 else base_s
+            for k in healthy:
+                out[k] = min(base_s, max(min_s, floor))
+        return out
+
+    def next_poller(
+        self,
+        keys: Iterable[str],
+        last_poll: dict[str, float],
+        base_s: float,
+        max_factor: float = 4.0,
+        now: Optional[float] = None,
+    ) -> tuple[Optional[str], float]:
+        """(key, 0) for the key to poll now, or (None, seconds until one is eligible).
+
+        Among keys past their poll_floors() gap and out of FloodWait, the one that
+        waited longest wins.
+        """
+        keys = list(keys)
+        now = time.monotonic() if now is None else now
+        floors = self.poll_floors(keys, base_s, max_factor, now=now)
+        eligible: list[str] = []
+        wait_s = float(base_s)
+        for k in keys:
+            ready_at = max(last_poll.get(k, 0.0) + floors[k], now + self.flood_wait_left(k, now))
+            if ready_at <= now:
+                eligible.append(k)
+            else:
+                wait_s = min(wait_s, ready_at - now)
+        if not eligible:
+            return None, wait_s
+        return min(eligible, key=lambda k: last_poll.get(k, 0.0)), 0.0
+
+    @contextmanager
+    def measure(self, key: str) -> Iterator[None]:
+        """Time the wrapped call; exceptions count as errors (FloodWait also sets the deadline)."""
+        t0 = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            secs = getattr(e, "seconds", None)
+            if isinstance(secs, (int, float)) and "flood" in type(e).__name__.lower():
+                self.record_flood(key, secs)
+            if isinstance(e, Exception):
+                self.record(key, time.monotonic() - t0, ok=False)
+            raise
+        else:
+            self.record(key, time.monotonic() - t0, ok=True)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+OUTCOMES = ("success", "missed", "fail", "timeout")
+
+
+def _zero() -> dict[str, int]:
+    return {k: 0 for k in OUTCOMES}
+
+
+class StatsStore:
+    """Per-account and global outcome counters, on disk (DATA_DIR/state/stats.json).
+
+    bump() only updates memory and schedules a flush; bumps within
+    flush_delay_s are coalesced into one write, done in a worker thread
+    (tmp + fsync + os.replace, so a crash never leaves a torn file).
+    Without a running event loop the write happens inline. "Got'em" is the
+    global success count minus the base stored by reset_gotem().
+    """
+
+    def __init__(self, path: Path, flush_delay_s: float = 1.0):
+        self.path = Path(path)
+        self.flush_delay_s = max(0.0, float(flush_delay_s))
+        self._accounts: dict[str, dict[str, int]] = {}
+        self._total = _zero()
+        self._gotem_base = 0
+        self._loaded = False
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        self.writes = 0
+
+    # -- load / save -----------------------------------------------------------
+
+    def load(self) -> None:
+        self._accounts = {}
+        self._total = _zero()
+        self._gotem_base = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if isinstance(raw, dict):
+                for k in OUTCOMES:
+                    self._total[k] = int((raw.get("total") or {}).get(k, 0) or 0)
+                for acct, counts in (raw.get("accounts") or {}).items():
+                    if isinstance(counts, dict):
+                        self._accounts[str(acct)] = {k: int(counts.get(k, 0) or 0) for k in OUTCOMES}
+                self._gotem_base = int(raw.get("gotem_base", 0) or 0)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            pass
+        self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def snapshot(self) -> dict:
+        self._ensure_loaded()
+        return {
+            "total": dict(self._total),
+            "gotem_base": self._gotem_base,
+            "accounts": {a: dict(c) for a, c in self._accounts.items()},
+        }
+
+    def _write(self, data: dict) -> None:
+        with self._write_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(self.path.name + ".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self.writes += 1
+            except Exception:
+                pass
+
+    def _schedule(self) -> None:
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_now()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.flush_delay_s)
+            self._dirty = False
+            await asyncio.to_thread(self._write, self.snapshot())
+
+    def flush_now(self) -> None:
+        """Write pending changes synchronously (shutdown / no event loop)."""
+        if self._dirty or not self.exists:
+            self._dirty = False
+            self._write(self.snapshot())
+
+    async def aclose(self) -> None:
+        """Cancel the pending delayed flush and write whatever is left."""
+        t, self._flush_task = self._flush_task, None
+        if t is not None and not t.done():
+            t.cancel()
+            try:
+                await t
+            except BaseException:
+                pass
+        if self._dirty:
+            self._dirty = False
+            await asyncio.to_thread(self._write, self.snapshot())
+
+    # -- counters --------------------------------------------------------------
+
+    def bump(self, account: str, outcome: str, n: int = 1) -> bool:
+        """Count one outcome for account; False (nothing recorded) for other outcomes."""
+        if outcome not in OUTCOMES:
+            return False
+        self._ensure_loaded()
+        counts = self._accounts.get(str(account))
+        if counts is None:
+            counts = _zero()
+            self._accounts[str(account)] = counts
+        counts[outcome] += int(n)
+        self._total[outcome] += int(n)
+        self._schedule()
+        return True
+
+    def counts(self, account: Optional[str] = None) -> dict[str, int]:
+        self._ensure_loaded()
+        if account is None:
+            return dict(self._total)
+        return dict(self._accounts.get(str(account)) or _zero())
+
+    @property
+    def gotem(self) -> int:
+        self._ensure_loaded()
+        return max(0, self._total["success"] - self._gotem_base)
+
+    def reset_gotem(self) -> None:
+        self._ensure_loaded()
+        self._gotem_base = self._total["success"]
+        self._schedule()
+
+    def seed_gotem(self, n: int) -> None:
+        """One-time migration of the legacy config 'gotem' (only for a new store)."""
+        self._ensure_loaded()
+        if self.exists or int(n or 0) <= 0:
+            return
+        self._total["success"] += int(n)
+        self._dirty = True
+        self.flush_now()
@@ -26,6 +26,7 @@ class StatusCode(str, Enum):
     JOINED = "JOINED"
     JOINFAIL = "JOINFAIL"
     DELAY = "DELAY"
+    CATCHUP = "CATCHUP"
 
 
 ALIASES: dict[str, StatusCode] = {
@@ -44,6 +45,7 @@ ALIASES: dict[str, StatusCode] = {
     "NEW_MESSAGE": StatusCode.NEWMSG,
     "NEWMSG_EVENT": StatusCode.NEWMSG,
     "JOIN_FAILED": StatusCode.JOINFAIL,
+    "CATCH_UP": StatusCode.CATCHUP,
 }
 
 
@@ -104,4 +106,6 @@ def status_label(code: str, detail: str = "") -> str:
         return "⚠️ JOIN FAILED"
     if st == StatusCode.DELAY:
         return f"⏳ DELAY {d}".strip() if d else "⏳ DELAY"
+    if st == StatusCode.CATCHUP:
+        return f"⏪ CATCHUP {d}".strip() if d else "⏪ CATCHUP"
     return str(code or "")
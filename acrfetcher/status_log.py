@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+HEADER = "ts\taccount\tstatus\tticket\tdetail\n"
+
+
+def format_status_line(label: str, status: str, detail: str = "", ticket: str = "", ts: Optional[float] = None) -> str:
+    """One TSV row; raw status codes (no ANSI), newlines in detail flattened."""
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+    clean = (detail or "").replace("\n", " ").replace("\r", " ")
+    return f"{stamp}\t{label}\t{status}\t{ticket or ''}\t{clean}\n"
+
+
+def _gzip_segment(src: Path) -> None:
+    """src -> src.gz via a temp file; src is removed only after the .gz is complete."""
+    dst = src.with_name(src.name + ".gz")
+    tmp = src.with_name(src.name + ".gz.tmp")
+    try:
+        with open(src, "rb") as fi, gzip.open(tmp, "wb", compresslevel=6) as fo:
+            shutil.copyfileobj(fi, fo, 1024 * 1024)
+        os.replace(tmp, dst)
+        src.unlink()
+    except Exception:
+        try:
+            tmp.unlink()
+        except Exception:
+            pass
+
+
+class StatusLog:
+    """Batched, rotating writer for DATA_DIR/logs/status_live.tsv.
+
+    put() only appends to an in-memory batch; run() writes the batch with one
+    write+flush when it reaches batch_lines or is flush_ms old (so a line is
+    on disk at most flush_ms after it was logged). Before each write the file
+    is rotated when it exceeds max_bytes or the local day changed: it is
+    renamed to status_live-YYYYmmdd-HHMMSS.tsv and gzipped in a background
+    thread; only the newest `keep` segments are kept.
+
+    header is written at the top of every new file ("" for none, e.g. JSONL).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_lines: int = 64,
+        flush_ms: int = 250,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_daily: bool = True,
+        keep: int = 14,
+        header: str = HEADER,
+    ):
+        self.path = Path(path)
+        self.batch_lines = max(1, int(batch_lines))
+        self.flush_s = max(0.0, float(flush_ms) / 1000.0)
+        self.max_bytes = max(0, int(max_bytes))
+        self.rotate_daily = bool(rotate_daily)
+        self.keep = max(0, int(keep))
+        self.header = header or ""
+        self._buf: list[str] = []
+        self._first = 0.0
+        self._wake: Optional[asyncio.Event] = None
+        self._fh = None
+        self._size = 0
+        self._day = ""
+        self._threads: list[threading.Thread] = []
+        self._gz_lock = threading.Lock()
+        self.writes = 0
+        self.rotations = 0
+
+    # -- producer side ---------------------------------------------------------
+
+    def put(self, line: str) -> None:
+        first = not self._buf
+        if first:
+            self._first = time.monotonic()
+        self._buf.append(line)
+        # Wake the writer on the first line (arms the flush_ms timer) and when the batch is full.
+        if (first or len(self._buf) >= self.batch_lines) and self._wake is not None:
+            self._wake.set()
+
+    def log(self, label: str, status: str, detail: str = "", ticket: str = "") -> None:
+        self.put(format_status_line(label, status, detail, ticket))
+
+    @property
+    def pending(self) -> int:
+        return len(self._buf)
+
+    # -- writer ------------------------------------------------------------------
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Flush batches until stop is set or the task is cancelled, then flush and close.
+
+        Does not wait for gzip threads (that would block the loop); aclose() does.
+        """
+        self._wake = asyncio.Event()
+        try:
+            while stop is None or not stop.is_set():
+                if self._buf:
+                    timeout = max(0.0, self._first + self.flush_s - time.monotonic())
+                else:
+                    timeout = 0.5
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if self._buf and (
+                    len(self._buf) >= self.batch_lines or time.monotonic() - self._first >= self.flush_s
+                ):
+                    self.flush()
+        finally:
+            self._wake = None
+            self.flush()
+            self.close(wait_s=0.0)
+
+    def flush(self) -> None:
+        """Write everything buffered now (one write + flush)."""
+        if not self._buf:
+            return
+        lines, self._buf = self._buf, []
+        try:
+            self._ensure_open()
+            if self._fh is None:
+                return
+            data = "".join(lines)
+            self._fh.write(data)
+            self._fh.flush()
+            self._size += len(data.encode("utf-8"))
+            self.writes += 1
+        except Exception:
+            pass
+
+    def _ensure_open(self) -> None:
+        day = time.strftime("%Y%m%d")
+        if self._fh is not None:
+            if (self.max_bytes and self._size >= self.max_bytes) or (self.rotate_daily and day != self._day):
+                self._rotate()
+            else:
+                return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            st = self.path.stat()
+            old_day = time.strftime("%Y%m%d", time.localtime(st.st_mtime))
+            if st.st_size and (
+                (self.max_bytes and st.st_size >= self.max_bytes) or (self.rotate_daily and old_day != day)
+            ):
+                self._rotate()
+        except FileNotFoundError:
+            pass
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._size = self._fh.tell()
+        self._day = day
+        if self._size == 0 and self.header:
+            self._fh.write(self.header)
+            self._size = len(self.header.encode("utf-8"))
+
+    def _rotate(self) -> None:
+        try:
+            if self._fh is not None:
+                self._fh.close()
+        except Exception:
+            pass
+        self._fh = None
+        try:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            seg = self.path.with_name(f"{self.path.stem}-{stamp}{self.path.suffix}")
+            n = 1
+            while seg.exists() or seg.with_name(seg.name + ".gz").exists():
+                seg = self.path.with_name(f"{self.path.stem}-{stamp}-{n}{self.path.suffix}")
+                n += 1
+            os.replace(self.path, seg)
+            self.rotations += 1
+        except FileNotFoundError:
+            return
+        except Exception:
+            return
+        t = threading.Thread(target=self._compress_and_prune, name="status-log-gzip", daemon=True)
+        self._threads = [x for x in self._threads if x.is_alive()]
+        self._threads.append(t)
+        t.start()
+
+    def segments(self) -> list[Path]:
+        """Rotated segments (plain or .gz), oldest first."""
+        pat = f"{self.path.stem}-*{self.path.suffix}"
+        found = list(self.path.parent.glob(pat)) + list(self.path.parent.glob(pat + ".gz"))
+        return sorted(found, key=lambda p: p.name)
+
+    def _compress_and_prune(self) -> None:
+        # Also picks up segments left uncompressed by an earlier run.
+        with self._gz_lock:
+            for seg in self.segments():
+                if seg.suffix != ".gz":
+                    _gzip_segment(seg)
+            segs = self.segments()
+            for old in segs[: max(0, len(segs) - self.keep)]:
+                try:
+                    old.unlink()
+                except Exception:
+                    pass
+
+    @property
+    def running(self) -> bool:
+        """True while run() is flushing batches."""
+        return self._wake is not None
+
+    async def aclose(self, wait_s: float = 5.0) -> None:
+        """Flush, close and wait for gzip threads in a worker thread (off the event loop)."""
+        self.flush()
+        await asyncio.to_thread(self.close, wait_s)
+
+    def close(self, wait_s: float = 5.0) -> None:
+        try:
+            if self._fh is not None:
+                self._fh.close()
+        except Exception:
+            pass
+        self._fh = None
+        deadline = time.monotonic() + max(0.0, wait_s)
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = [t for t in self._threads if t.is_alive()]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Optional
+
+from .status_log import StatusLog
+
+# Footer order; stages missing from the window are skipped.
+STAGE_ORDER = ("tg", "queue", "link", "fanout", "webview", "delay", "navigate", "result", "total")
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[idx]
+
+
+class Trace:
+    """Timings for one post (kind "post") or one account's open of it (kind "open").
+
+    mark(stage) records the time since the previous mark (sequential stages);
+    add(stage, ms) records an overlapping stage measured elsewhere. finish()
+    hands the record to the tracer once.
+    """
+
+    __slots__ = ("tracer", "kind", "post_key", "account", "t0", "last", "stages", "attrs", "done")
+
+    def __init__(self, tracer: "Tracer", kind: str, post_key: tuple[int, int], account: str, t0: Optional[float] = None):
+        self.tracer = tracer
+        self.kind = kind
+        self.post_key = post_key
+        self.account = account
+        self.t0 = time.monotonic() if t0 is None else float(t0)
+        self.last = time.monotonic()
+        self.stages: dict[str, float] = {}
+        self.attrs: dict[str, Any] = {}
+        self.done = False
+
+    def mark(self, stage: str) -> float:
+        now = time.monotonic()
+        ms = (now - self.last) * 1000.0
+        self.last = now
+        self.stages[stage] = self.stages.get(stage, 0.0) + ms
+        return ms
+
+    def add(self, stage: str, ms: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + max(0.0, float(ms))
+
+    def fork(self, account: str) -> "Trace":
+        """Per-account open trace sharing this post's start time (total is detect -> result)."""
+        return Trace(self.tracer, "open", self.post_key, account, t0=self.t0)
+
+    def finish(self, res: str = "") -> None:
+        if self.done:
+            return
+        self.done = True
+        self.tracer.record(self, res)
+
+
+class Tracer:
+    """Span sink: JSONL per finished trace + rolling p50/p95 per stage.
+
+    path=None keeps only the in-memory window (no file). The file is written
+    through a StatusLog, so it is rotated at max_bytes and only the newest
+    `keep` gzipped segments are kept. While run() is active records are
+    batched; without it each record is written right away.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        window: int = 200,
+        *,
+        max_bytes: int = 10 * 1024 * 1024,
+        keep: int = 5,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.window = max(10, int(window))
+        self._samples: dict[str, deque] = {}
+        self._log: Optional[StatusLog] = None
+        if self.path is not None:
+            self._log = StatusLog(self.path, max_bytes=max_bytes, rotate_daily=False, keep=keep, header="")
+        self._version = 0
+        self._summary_cache: tuple[int, str] = (-1, "")
+
+    def begin(self, post_key: tuple[int, int], account: str) -> Trace:
+        return Trace(self, "post", (int(post_key[0]), int(post_key[1])), str(account))
+
+    def record(self, trace: Trace, res: str = "") -> None:
+        stages = dict(trace.stages)
+        if trace.kind == "open":
+            stages["total"] = (time.monotonic() - trace.t0) * 1000.0
+        for stage, ms in stages.items():
+            dq = self._samples.get(stage)
+            if dq is None:
+                dq = deque(maxlen=self.window)
+                self._samples[stage] = dq
+            dq.append(ms)
+        self._version += 1
+        rec = {
+            "ts": round(time.time(), 3),
+            "kind": trace.kind,
+            "post": f"{trace.post_key[0]}:{trace.post_key[1]}",
+            "account": trace.account,
+            "res": res,
+            "stages": {k: round(v, 1) for k, v in stages.items()},
+        }
+        if trace.attrs:
+            rec.update(trace.attrs)
+        self._write(rec)
+
+    def _write(self, rec: dict) -> None:
+        if self._log is None:
+            return
+        try:
+            self._log.put(json.dumps(rec, ensure_ascii=False) + "\n")
+            if not self._log.running:
+                self._log.flush()
+        except Exception:
+            pass
+
+    def percentiles(self, stage: str) -> Optional[tuple[float, float]]:
+        dq = self._samples.get(stage)
+        if not dq:
+            return None
+        vals = sorted(dq)
+        return _percentile(vals, 0.50), _percentile(vals, 0.95)
+
+    def summary(self) -> str:
+        """'link 120/340 · webview 80/150 · ...' (p50/p95 ms), cached until new data."""
+        if self._summary_cache[0] == self._version:
+            return self._summary_cache[1]
+        parts = []
+        for stage in STAGE_ORDER:
+            pq = self.percentiles(stage)
+            if pq is not None:
+                parts.append(f"{stage} {pq[0]:.0f}/{pq[1]:.0f}")
+        text = " · ".join(parts)
+        self._summary_cache = (self._version, text)
+        return text
+
+    async def run(self, stop=None) -> None:
+        """Batched writer task for the trace file (see StatusLog.run)."""
+        if self._log is not None:
+            await self._log.run(stop)
+
+    async def aclose(self) -> None:
+        if self._log is not None:
+            await self._log.aclose()
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.flush()
+            self._log.close()
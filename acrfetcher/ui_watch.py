@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import Callable, Hashable, Iterable
 from dataclasses import dataclass, field
 
 from .models import RowState, UiEvent
@@ -8,24 +10,63 @@ from .models import RowState, UiEvent
 
 @dataclass(slots=True)
 class UiStateReducer:
+    """Watch-table row state. Every change goes through apply(); changed rows
+    are collected in `dirty` and wake the renderer via `changed`."""
+
     state: dict[str, RowState] = field(default_factory=dict)
     events: asyncio.Queue[UiEvent] = field(default_factory=asyncio.Queue)
+    dirty: set[str] = field(default_factory=set)
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+    last_frame: float = 0.0
 
     def init_row(self, label: str, row: RowState) -> None:
         self.state[label] = row
+        self.dirty.add(label)
+        self.changed.set()
 
     async def emit(self, event: UiEvent) -> None:
         await self.events.put(event)
 
-    def apply(self, event: UiEvent) -> None:
+    def apply(self, event: UiEvent) -> bool:
+        """Apply one event; True if the row actually changed."""
         row = self.state.get(event.label)
         if row is None:
-            return
+            return False
+        before = (row.status, row.detail, row.ticket)
         if event.status:
             row.status = event.status
         row.detail = event.detail or ""
         if event.ticket:
             row.ticket = event.ticket
+        if (row.status, row.detail, row.ticket) == before:
+            return False
+        self.dirty.add(event.label)
+        self.changed.set()
+        return True
+
+    def touch(self) -> None:
+        """Request a frame without changing any row (pause flag, overlays, footer)."""
+        self.changed.set()
+
+    def take_dirty(self) -> set[str]:
+        dirty, self.dirty = self.dirty, set()
+        self.changed.clear()
+        return dirty
+
+    async def next_frame(self, *, max_fps: float = 10.0, idle_s: float = 0.7) -> set[str]:
+        """Wait for a change (or idle_s), then coalesce to at most max_fps frames/s.
+
+        Returns the labels changed since the previous frame.
+        """
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout=max(0.0, idle_s))
+        except asyncio.TimeoutError:
+            pass
+        gap = self.last_frame + 1.0 / max(0.5, float(max_fps)) - time.monotonic()
+        if gap > 0:
+            await asyncio.sleep(gap)
+        self.last_frame = time.monotonic()
+        return self.take_dirty()
 
     async def reduce_once(self) -> None:
         event = await self.events.get()
@@ -43,3 +84,31 @@ class UiStateReducer:
                 await asyncio.wait_for(self.reduce_once(), timeout=0.25)
             except asyncio.TimeoutError:
                 continue
+
+
+class RowRenderCache:
+    """Rendered table line per row, rebuilt only when its render key changes."""
+
+    __slots__ = ("_lines", "hits", "misses")
+
+    def __init__(self) -> None:
+        self._lines: dict[str, tuple[Hashable, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, label: str, key: Hashable, build: Callable[[], str]) -> str:
+        hit = self._lines.get(label)
+        if hit is not None and hit[0] == key:
+            self.hits += 1
+            return hit[1]
+        line = build()
+        self._lines[label] = (key, line)
+        self.misses += 1
+        return line
+
+    def discard(self, labels: Iterable[str]) -> None:
+        for label in labels:
+            self._lines.pop(label, None)
+
+    def clear(self) -> None:
+        self._lines.clear()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Optional
 
 
@@ -11,49 +12,74 @@ def strip_ansi(s: str) -> str:
     return ANSI_RE.sub("", s or "")
 
 
-def pad_ansi(s: str, width: int) -> str:
-    if width <= 0:
-        return ""
-    raw = s or ""
-    vis = strip_ansi(raw)
-    try:
-        from wcwidth import wcswidth, wcwidth
-    except Exception:
-        wcswidth = None
-        wcwidth = None
-
-    def disp_w(txt: str) -> int:
-        if not txt:
-            return 0
-        if wcswidth:
-            w = wcswidth(txt)
-            return w if w >= 0 else len(txt)
+_WCWIDTH: Optional[tuple] = None
+
+
+def _wc() -> tuple:
+    """(wcswidth, wcwidth) imported once; (None, None) without the wcwidth package."""
+    global _WCWIDTH
+    if _WCWIDTH is None:
+        try:
+            from wcwidth import wcswidth, wcwidth
+            _WCWIDTH = (wcswidth, wcwidth)
+        except Exception:
+            _WCWIDTH = (None, None)
+    return _WCWIDTH
+
+
+@lru_cache(maxsize=4096)
+def display_width(txt: str) -> int:
+    """Terminal columns of plain (non-ANSI) text. ASCII never touches wcwidth."""
+    if not txt:
+        return 0
+    if txt.isascii():
         return len(txt)
+    wcswidth, _wcwidth = _wc()
+    if wcswidth:
+        w = wcswidth(txt)
+        return w if w >= 0 else len(txt)
+    return len(txt)
+
 
-    def truncate_disp(txt: str, target: int) -> str:
-        if target <= 0:
-            return ""
-        if disp_w(txt) <= target:
-            return txt
-        if target == 1:
-            return "..."
-        limit = target - 3
-        out = []
-        w = 0
-        for ch in txt:
-            cw = (wcwidth(ch) if wcwidth else 1)
-            if cw < 0:
-                cw = 0
-            if w + cw > limit:
-                break
-            out.append(ch)
-            w += cw
-        return "".join(out) + "..."
-
-    vis_w = disp_w(vis)
+def truncate_display(txt: str, target: int, ellipsis: str = "...") -> str:
+    """Truncate plain text to target display width, ending with ellipsis."""
+    if target <= 0:
+        return ""
+    if display_width(txt) <= target:
+        return txt
+    if target == 1:
+        return ellipsis
+    limit = target - len(ellipsis)
+    if txt.isascii() and txt.isprintable():
+        return txt[: max(0, limit)] + ellipsis
+    _wcswidth, wcwidth = _wc()
+    out = []
+    w = 0
+    for ch in txt:
+        cw = (wcwidth(ch) if wcwidth else 1)
+        if cw < 0:
+            cw = 0
+        if w + cw > limit:
+            break
+        out.append(ch)
+        w += cw
+    return "".join(out) + ellipsis
+
+
+@lru_cache(maxsize=8192)
+def pad_display(s: str, width: int, ellipsis: str = "...") -> str:
+    """Pad (or truncate, dropping ANSI) to width columns; cached by (text, width, ellipsis)."""
+    if width <= 0:
+        return ""
+    vis = strip_ansi(s) if "\x1b" in s else s
+    vis_w = display_width(vis)
     if vis_w > width:
-        return truncate_disp(vis, width)
-    return raw + (" " * (width - vis_w))
+        return truncate_display(vis, width, ellipsis)
+    return s + (" " * (width - vis_w))
+
+
+def pad_ansi(s: str, width: int) -> str:
+    return pad_display(s or "", int(width), "...")
 
 
 def normalize_telegram_link(url: str) -> str:
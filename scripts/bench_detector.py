@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-phrase result classification vs compiled ResultMatcher.
+
+Usage:
+  python3 scripts/bench_detector.py [page.txt ...]
+
+Without arguments it uses every DATA_DIR/logs/*/page.txt dump (written by the
+detector on fail/timeout) and falls back to a few synthetic mini-app pages.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from acrfetcher.config_store import DEFAULT_CONFIG, resolve_data_dir  # noqa: E402
+from acrfetcher.detector import (  # noqa: E402
+    ALREADY_CLAIMED_SUCCESS_PHRASES,
+    HARD_MISSED_PHRASES,
+    ResultMatcher,
+    match_phrase_detail,
+    norm_text,
+    split_lines,
+)
+
+SYNTHETIC = {
+    "loading": "Loading...\n" + "Menu\nProfile\nLeaderboard\nRules\n" * 40,
+    "expired": "Menu\nProfile\n" * 60 + "Sorry!\nThis offer has expired.\nKeep an eye out for new offers\n",
+    "success": "Menu\nProfile\n" * 60 + "Congratulations!\nYou got a ticket for the $50 freeroll\n",
+    "claimed": "Menu\nProfile\n" * 60 + "This offer has already been claimed.\n",
+}
+
+
+def legacy_classify(text: str, success_patterns, fail_patterns) -> tuple[str, str]:
+    """Per-phrase scan as it was before the compiled matcher (re-normalizes patterns every call)."""
+    tnorm = norm_text(text)
+    lines = split_lines(text)
+    ok, detail = match_phrase_detail(tnorm, lines, ALREADY_CLAIMED_SUCCESS_PHRASES)
+    if ok:
+        return "success", detail
+    ok, detail = match_phrase_detail(tnorm, lines, HARD_MISSED_PHRASES)
+    if ok:
+        return "missed", detail
+    fail = [norm_text(x) for x in (fail_patterns or []) if str(x).strip()]
+    for pat in fail:
+        if pat and pat in tnorm:
+            return "fail", next((l for l in lines if pat in l.lower()), pat)
+    succ = [norm_text(x) for x in (success_patterns or []) if str(x).strip()]
+    if succ:
+        for l in lines:
+            if all(p in l.lower() for p in succ):
+                return "success", l
+        if len(succ) >= 2 and all(p in tnorm for p in succ[:2]):
+            return "success", next((l for l in lines if succ[0] in l.lower()), succ[0])
+    return "none", ""
+
+
+def load_samples(argv: list[str]) -> dict[str, str]:
+    paths = [Path(a) for a in argv]
+    if not paths:
+        paths = sorted((resolve_data_dir() / "logs").glob("*/page.txt"))
+    samples: dict[str, str] = {}
+    for p in paths:
+        try:
+            samples[str(p)] = p.read_text(encoding="utf-8")
+        except Exception:
+            continue
+    return samples or dict(SYNTHETIC)
+
+
+def bench(fn, text: str, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn(text)
+    return (time.perf_counter() - t0) / rounds * 1e6
+
+
+def main() -> None:
+    succ = list(DEFAULT_CONFIG["success_patterns"])
+    fail = list(DEFAULT_CONFIG["fail_patterns"])
+    matcher = ResultMatcher(succ, fail)
+    samples = load_samples(sys.argv[1:])
+    print(f"{'sample':<40} {'chars':>7} {'legacy us':>10} {'matcher us':>10} {'speedup':>8}  result")
+    for name, text in samples.items():
+        rounds = max(50, min(5000, 2_000_000 // max(1, len(text))))
+        old = legacy_classify(text, succ, fail)
+        new = matcher.classify(text)
+        assert old == new, (name, old, new)
+        t_old = bench(lambda t: legacy_classify(t, succ, fail), text, rounds)
+        t_new = bench(matcher.classify, text, rounds)
+        print(f"{Path(name).parent.name or name:<40} {len(text):>7} {t_old:>10.1f} {t_new:>10.1f} {t_old / t_new:>7.2f}x  {new[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""Offline end-to-end benchmark: watch_multi against a fake Telegram and a local mini-app.
+
+Usage:
+  python3 scripts/bench_pipeline.py [--accounts N] [--posts M] [--interval S]
+                                    [--monitor live_only|poll_only|live+poll]
+                                    [--page-delay-ms MS] [--server-delay-ms MS]
+                                    [--expired-every K] [--rpc-ms MS] [--timeout S]
+
+Nothing touches the network: every account gets a FakeClient (shared FakeHub
+"channel") passed to watch_multi(client_factory=...), and the Mini App
+WebView URL points at a local HTTP server that renders the success / expired
+page after a JS delay. The run uses a throwaway DATA_DIR, headless browsers
+and ui_mode "none"; per-post timings come from DATA_DIR/logs/traces.jsonl.
+
+Reported: detect -> result latency (trace "total" of every account open),
+per-stage p50/p95, post -> result as seen by the harness, outcome counts,
+CPU time (this process + children, i.e. Chromium) and peak RSS.
+Without a Chromium install the opens end as "error"; the Telegram side of the
+pipeline (detect, link, fanout, webview) is still measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# DATA_DIR is resolved at import time: point it at a scratch dir first.
+_TMP = tempfile.TemporaryDirectory(prefix="acrfetcher-bench-")
+os.environ["ACRFETCHER_DATA_DIR"] = _TMP.name
+
+from telethon import functions, types  # noqa: E402
+
+from acrfetcher import main as acr  # noqa: E402
+from acrfetcher.tracing import STAGE_ORDER, _percentile  # noqa: E402
+
+CHANNEL_ID = 1777000001
+BOT_ID = 1777000002
+BOT_USERNAME = "benchbot"
+
+PAGE = """<!doctype html><html><head><title>bench</title></head>
+<body><div id="app">Loading...</div>
+<script>
+setTimeout(function () {{
+  document.getElementById("app").innerText = {text};
+}}, {delay});
+</script></body></html>"""
+PAGE_TEXT = {
+    "ok": "Congratulations!\\nYou got a ticket for the $50 freeroll",
+    "exp": "Sorry!\\nThis offer has expired.",
+}
+
+
+# ---------------------------------------------------------------- mini-app
+
+def start_miniapp_server(page_delay_ms: int, server_delay_ms: int) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            q = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            param = (q.get("p") or [""])[0]
+            kind = param.rsplit("_", 1)[-1] if "_" in param else "ok"
+            if server_delay_ms > 0:
+                time.sleep(server_delay_ms / 1000.0)
+            body = PAGE.format(
+                text=json.dumps(PAGE_TEXT.get(kind, PAGE_TEXT["ok"]).replace("\\n", "\n")),
+                delay=int(page_delay_ms),
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_a):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+# ---------------------------------------------------------------- fake Telegram
+
+class FakeMessage:
+    def __init__(self, msg_id: int, result: str):
+        self.id = msg_id
+        self.chat_id = int(f"-100{CHANNEL_ID}")
+        self.date = datetime.now(timezone.utc)
+        self.message = f"Freeroll #{msg_id}\n$50 10K GTD"
+        self.raw_text = self.message
+        self.entities = []
+        self.media = None
+        # Duck-typed inline keyboard (button class names differ across Telethon layers).
+        btn = SimpleNamespace(text="Launch", url=f"https://t.me/{BOT_USERNAME}/app?startapp={msg_id}_{result}")
+        self.reply_markup = SimpleNamespace(rows=[SimpleNamespace(buttons=[btn])])
+
+
+class _Event:
+    def __init__(self, message: FakeMessage):
+        self.message = message
+
+
+class FakeHub:
+    """The shared 'Telegram': one channel history plus every connected client."""
+
+    def __init__(self, miniapp_base: str, rpc_ms: float):
+        self.miniapp_base = miniapp_base
+        self.rpc_s = max(0.0, rpc_ms) / 1000.0
+        self.messages: list[FakeMessage] = []
+        self.clients: list["FakeClient"] = []
+        self.posted_at: dict[int, float] = {}
+        self.rpc_calls = 0
+
+    def factory(self, *_args, **_kwargs) -> "FakeClient":
+        return FakeClient(self)
+
+    def post(self, result: str) -> FakeMessage:
+        msg = FakeMessage(len(self.messages) + 1, result)
+        self.messages.append(msg)
+        self.posted_at[msg.id] = time.time()
+        for c in list(self.clients):
+            c.dispatch(msg)
+        return msg
+
+
+class FakeClient:
+    """Just enough of TelegramClient for watch_multi's runtimes."""
+
+    def __init__(self, hub: FakeHub):
+        self.hub = hub
+        self.handlers = []
+        self.connected = False
+
+    async def _rpc(self):
+        self.hub.rpc_calls += 1
+        if self.hub.rpc_s:
+            await asyncio.sleep(self.hub.rpc_s)
+
+    async def connect(self):
+        await self._rpc()
+        self.connected = True
+        if self not in self.hub.clients:
+            self.hub.clients.append(self)
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def disconnect(self):
+        self.connected = False
+        if self in self.hub.clients:
+            self.hub.clients.remove(self)
+
+    async def is_user_authorized(self) -> bool:
+        return True
+
+    async def get_me(self):
+        await self._rpc()
+        return types.User(id=1, is_self=True)
+
+    async def get_entity(self, _ref):
+        await self._rpc()
+        return types.Channel(
+            id=CHANNEL_ID, title="bench", photo=types.ChatPhotoEmpty(), date=None,
+            access_hash=42, username="benchchannel", broadcast=True,
+        )
+
+    async def get_input_entity(self, ref):
+        await self._rpc()
+        if ref == "me":
+            return types.InputPeerSelf()
+        return types.InputPeerUser(user_id=BOT_ID, access_hash=7)
+
+    async def get_messages(self, _entity, limit=None, min_id=0, ids=None, **_kw):
+        await self._rpc()
+        msgs = self.hub.messages
+        if ids is not None:
+            return next((m for m in msgs if m.id == int(ids)), None)
+        out = [m for m in reversed(msgs) if m.id > int(min_id or 0)]
+        return out[: int(limit)] if limit else out
+
+    def on(self, _builder):
+        def deco(fn):
+            self.handlers.append(fn)
+            return fn
+        return deco
+
+    def dispatch(self, msg: FakeMessage) -> None:
+        if not self.connected:
+            return
+        for fn in self.handlers:
+            asyncio.get_running_loop().create_task(fn(_Event(msg)))
+
+    async def __call__(self, request):
+        await self._rpc()
+        if isinstance(request, functions.messages.RequestAppWebViewRequest):
+            start = urllib.parse.quote(str(request.start_param or ""))
+            return types.WebViewResultUrl(url=f"{self.hub.miniapp_base}/app?p={start}")
+        if isinstance(request, functions.channels.GetParticipantRequest):
+            return None
+        return None
+
+
+# ---------------------------------------------------------------- run + report
+
+def _read_traces(path: Path) -> list[dict]:
+    out = []
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    out.append(json.loads(line))
+                except Exception:
+                    pass
+    except FileNotFoundError:
+        pass
+    return out
+
+
+def _pcts(vals: list[float]) -> str:
+    if not vals:
+        return "-"
+    s = sorted(vals)
+    return f"p50 {_percentile(s, 0.5):8.1f}  p95 {_percentile(s, 0.95):8.1f}  max {s[-1]:8.1f}  (n={len(s)})"
+
+
+def _rss_mb() -> tuple[float, float]:
+    """(peak RSS of this process, peak RSS of the largest child) in MB."""
+    self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    div = 1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0
+    return self_kb / div, child_kb / div
+
+
+async def run(args) -> None:
+    srv = start_miniapp_server(args.page_delay_ms, args.server_delay_ms)
+    hub = FakeHub(f"http://127.0.0.1:{srv.server_address[1]}", args.rpc_ms)
+
+    data_dir = Path(_TMP.name)
+    csv_path = data_dir / "accounts.csv"
+    with csv_path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["phone", "email", "proxy", "role"])
+        for i in range(args.accounts):
+            role = "both" if i < max(1, args.detectors) else "opener"
+            w.writerow([f"+1555{i:07d}", f"bench{i:03d}@example.com", "", role])
+
+    cfg = dict(acr.DEFAULT_CONFIG)
+    cfg.update({
+        "api_id": 1,
+        "api_hash": "0" * 32,
+        "channel": "@benchchannel",
+        "accounts_csv": str(csv_path),
+        "watch_mode": "new",
+        "monitor_mode": args.monitor,
+        "headless": True,
+        "ui_mode": "none",
+        "launch_button_text": "Launch",
+        "pre_open_delay_ms": 0,
+        "result_timeout_ms": int(args.result_timeout_ms),
+        "webhook_enabled": False,
+    })
+
+    traces_path = data_dir / "logs" / "traces.jsonl"
+    quit_ev = asyncio.Event()
+    cpu0 = os.times()
+    t_start = time.monotonic()
+    watcher = asyncio.create_task(
+        acr.watch_multi(cfg, resume=True, client_factory=hub.factory, quit_event=quit_ev)
+    )
+
+    # Wait for the accounts to come up (every detector connected and subscribed).
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline and not watcher.done():
+        if len(hub.clients) >= args.accounts:
+            break
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(args.settle)
+    t_ready = time.monotonic() - t_start
+
+    results = ["exp" if args.expired_every and (i + 1) % args.expired_every == 0 else "ok" for i in range(args.posts)]
+    for res in results:
+        hub.post(res)
+        await asyncio.sleep(args.interval)
+
+    want = args.posts * args.accounts
+    while time.monotonic() < deadline and not watcher.done():
+        if sum(1 for r in _read_traces(traces_path) if r.get("kind") == "open") >= want:
+            break
+        await asyncio.sleep(0.1)
+    quit_ev.set()
+    try:
+        await asyncio.wait_for(watcher, timeout=30)
+    except Exception as e:
+        print(f"watch_multi exit: {type(e).__name__}: {e}")
+    cpu1 = os.times()
+    srv.shutdown()
+
+    recs = _read_traces(traces_path)
+    opens = [r for r in recs if r.get("kind") == "open"]
+    posts = [r for r in recs if r.get("kind") == "post"]
+    outcomes: dict[str, int] = {}
+    for r in opens:
+        outcomes[r.get("res") or "?"] = outcomes.get(r.get("res") or "?", 0) + 1
+    e2e = []
+    for r in opens:
+        try:
+            msg_id = int(str(r["post"]).split(":", 1)[1])
+            e2e.append((float(r["ts"]) - hub.posted_at[msg_id]) * 1000.0)
+        except Exception:
+            pass
+
+    cpu_self = (cpu1.user - cpu0.user) + (cpu1.system - cpu0.system)
+    cpu_child = (cpu1.children_user - cpu0.children_user) + (cpu1.children_system - cpu0.children_system)
+    rss_self, rss_child = _rss_mb()
+
+    print(f"accounts={args.accounts} posts={args.posts} monitor={args.monitor} "
+          f"page_delay={args.page_delay_ms}ms rpc={args.rpc_ms}ms")
+    print(f"ready after {t_ready:.2f}s; opens {len(opens)}/{want}; posts traced {len(posts)}/{args.posts}; "
+          f"fake RPCs {hub.rpc_calls}")
+    print(f"outcomes: {', '.join(f'{k}={v}' for k, v in sorted(outcomes.items())) or '-'}")
+    print(f"{'detect->result':<16} {_pcts([r['stages'].get('total', 0.0) for r in opens])}  ms")
+    print(f"{'post->result':<16} {_pcts(e2e)}  ms")
+    for stage in STAGE_ORDER:
+        if stage == "total":
+            continue
+        vals = [r["stages"][stage] for r in recs if stage in r.get("stages", {})]
+        if vals:
+            print(f"  {stage:<14} {_pcts(vals)}  ms")
+    print(f"CPU: {cpu_self:.2f}s self, {cpu_child:.2f}s children")
+    print(f"peak RSS: {rss_self:.1f} MB self, {rss_child:.1f} MB largest child")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--accounts", type=int, default=5)
+    ap.add_argument("--detectors", type=int, default=2, help="first D accounts detect, the rest only open")
+    ap.add_argument("--posts", type=int, default=5)
+    ap.add_argument("--interval", type=float, default=2.0, help="seconds between posts")
+    ap.add_argument("--monitor", default="live+poll", choices=("live_only", "poll_only", "live+poll"))
+    ap.add_argument("--page-delay-ms", type=int, default=300, help="JS delay before the result text")
+    ap.add_argument("--server-delay-ms", type=int, default=0, help="HTTP response delay")
+    ap.add_argument("--expired-every", type=int, default=0, help="every K-th post shows the expired page")
+    ap.add_argument("--rpc-ms", type=float, default=30.0, help="simulated Telegram RPC latency")
+    ap.add_argument("--result-timeout-ms", type=int, default=8000)
+    ap.add_argument("--settle", type=float, default=1.0, help="seconds to wait after accounts connect")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    args = ap.parse_args()
+    try:
+        asyncio.run(run(args))
+    finally:
+        _TMP.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: watch-table cell formatting per 100 rows, legacy vs cached.
+
+Usage:
+  python3 scripts/bench_render.py [rows]
+
+"legacy" is the pre-cache _pad_ansi (wcwidth import + width scan on every
+call) with uncached _fit_cell / formatProxyMasked; "cached" is the current
+LRU-cached layer with the ASCII fast path (steady state, i.e. every redraw
+after the first). Rows mix ASCII and non-ASCII account labels.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from acrfetcher.main import (  # noqa: E402
+    _fit_cell,
+    _pad_ansi,
+    _status_cell,
+    _strip_ansi,
+    formatProxyMasked,
+)
+from acrfetcher.utils import display_width, pad_display  # noqa: E402
+
+W_ACC, W_ST, W_TK, W_PR = 34, 18, 16, 40
+STATUSES = ["MONITORING", "OPENING", "SUCCESS", "WAITING", "ERROR"]
+
+
+def legacy_pad_ansi(s: str, width: int) -> str:
+    """_pad_ansi as it was before the cache (imports wcwidth on every call)."""
+    if width <= 0:
+        return ""
+    raw = s or ""
+    vis = _strip_ansi(raw)
+    try:
+        from wcwidth import wcswidth, wcwidth
+    except Exception:
+        wcswidth = None
+        wcwidth = None
+
+    def _disp_w(txt: str) -> int:
+        if not txt:
+            return 0
+        if wcswidth:
+            w = wcswidth(txt)
+            return w if w >= 0 else len(txt)
+        return len(txt)
+
+    def _truncate_disp(txt: str, target: int) -> str:
+        if target <= 0:
+            return ""
+        if _disp_w(txt) <= target:
+            return txt
+        if target == 1:
+            return "…"
+        limit = target - 1
+        out = []
+        w = 0
+        for ch in txt:
+            cw = (wcwidth(ch) if wcwidth else 1)
+            if cw < 0:
+                cw = 0
+            if w + cw > limit:
+                break
+            out.append(ch)
+            w += cw
+        return "".join(out) + "…"
+
+    vis_w = _disp_w(vis)
+    if vis_w > width:
+        return _truncate_disp(vis, width)
+    return raw + (" " * (width - vis_w))
+
+
+def make_rows(n: int) -> list[tuple[str, str, str, str]]:
+    rows = []
+    for i in range(n):
+        acc = f"trader.account{i:03d}@example-mail.com" if i % 3 else f"пользователь_{i:03d}@почта.рф 🚀"
+        proxy = f"185.{i % 250}.{(i * 7) % 250}.10:8000:user{i}:secret{i}"
+        rows.append((acc, proxy, STATUSES[i % len(STATUSES)], "$50 10K GTD" if i % 4 == 0 else "—"))
+    return rows
+
+
+def render(rows, pad, fit, proxy_fmt) -> int:
+    total = 0
+    for acc, proxy, st, tk in rows:
+        line = (
+            pad(" " + fit(acc, W_ACC - 1, "email"), W_ACC)
+            + pad(" " + _status_cell(st, ""), W_ST)
+            + pad(" " + (tk if tk == "—" else fit(tk, W_TK - 1, "right")), W_TK)
+            + pad(" " + proxy_fmt(proxy, W_PR - 1), W_PR)
+        )
+        total += len(line)
+    return total
+
+
+def bench(fn, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds * 1e3
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rows = make_rows(n)
+    legacy = (legacy_pad_ansi, _fit_cell.__wrapped__, formatProxyMasked.__wrapped__)
+    cached = (_pad_ansi, _fit_cell, formatProxyMasked)
+    for acc, proxy, _st, _tk in rows:
+        assert legacy_pad_ansi(acc, W_ACC) == _pad_ansi(acc, W_ACC), acc
+        assert legacy_pad_ansi(proxy, 20) == _pad_ansi(proxy, 20), proxy
+
+    rounds = 200
+    t_old = bench(lambda: render(rows, *legacy), rounds)
+    for fn in (pad_display, display_width, _fit_cell, formatProxyMasked):
+        fn.cache_clear()
+    t_cold = bench(lambda: render(rows, *cached), 1)
+    t_new = bench(lambda: render(rows, *cached), rounds)
+    scale = 100.0 / max(1, n)
+    print(f"rows={n}  (times per 100 rows)")
+    print(f"{'legacy':<14} {t_old * scale:>8.3f} ms")
+    print(f"{'cached, cold':<14} {t_cold * scale:>8.3f} ms")
+    print(f"{'cached, warm':<14} {t_new * scale:>8.3f} ms  {t_old / t_new:>6.1f}x")
+    print(f"pad_display cache: {pad_display.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,15 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from acrfetcher.accounts_store import load_accounts_csv, parse_http_proxy, parse_telethon_http_proxy
+from acrfetcher.accounts_store import (
+    effective_roles,
+    load_accounts_csv,
+    parse_account_role,
+    parse_http_proxy,
+    parse_telethon_http_proxy,
+    role_detects,
+    role_opens,
+)
 
 
 class AccountsStoreTests(unittest.TestCase):
@@ -27,6 +35,29 @@ class AccountsStoreTests(unittest.TestCase):
             self.assertEqual(len(rows), 1)
             self.assertEqual(rows[0].email, "x@y.z")
             self.assertEqual(rows[0].phone, "123")
+            self.assertEqual(rows[0].role, "both")
+
+    def test_load_accounts_csv_role_column(self):
+        with TemporaryDirectory() as td:
+            p = Path(td) / "accounts.csv"
+            p.write_text("email,phone,proxy,role\na,1,,detector\nb,2,,Opener\nc,3,,\n", encoding="utf-8")
+            rows = load_accounts_csv(p)
+            self.assertEqual([r.role for r in rows], ["detector", "opener", "both"])
+
+    def test_parse_account_role_aliases(self):
+        self.assertEqual(parse_account_role("listener"), "detector")
+        self.assertEqual(parse_account_role("worker"), "opener")
+        self.assertEqual(parse_account_role("???"), "both")
+
+    def test_role_split(self):
+        self.assertEqual([role_detects(r) for r in ("detector", "opener", "both")], [True, False, True])
+        self.assertEqual([role_opens(r) for r in ("detector", "opener", "both")], [False, True, True])
+
+    def test_effective_roles_falls_back_to_both(self):
+        self.assertEqual(effective_roles(["detector", "opener", "both"]), ["detector", "opener", "both"])
+        self.assertEqual(effective_roles(["detector", "opener"]), ["detector", "opener"])
+        self.assertEqual(effective_roles(["opener", "opener"]), ["both", "both"])
+        self.assertEqual(effective_roles(["detector", "detector"]), ["both", "both"])
 
 
 if __name__ == "__main__":
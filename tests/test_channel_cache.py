@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from telethon import types, utils
+
+from acrfetcher.channel_cache import ChannelCache, entity_from_record
+
+
+def _channel(cid=123, access_hash=456, **kw):
+    return types.Channel(id=cid, title="Drops", photo=types.ChatPhotoEmpty(), date=None, access_hash=access_hash, **kw)
+
+
+class ChannelCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "state" / "channels.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_roundtrip_entity_and_membership(self):
+        c = ChannelCache(self.path)
+        self.assertTrue(c.put("acc1", "t.me/+AbC", _channel(megagroup=True), joined=True))
+
+        c2 = ChannelCache(self.path)
+        ent = c2.entity("acc1", " T.ME/+abc ")
+        self.assertIsInstance(ent, types.Channel)
+        self.assertEqual(utils.get_peer_id(ent), -1000000000123)
+        self.assertEqual(utils.get_input_peer(ent), types.InputPeerChannel(123, 456))
+        self.assertTrue(ent.megagroup)
+        self.assertTrue(c2.joined("acc1", "t.me/+abc"))
+        self.assertIsNone(c2.entity("acc2", "t.me/+abc"))
+
+    def test_put_keeps_membership_for_same_channel(self):
+        c = ChannelCache(self.path)
+        c.put("acc1", "@drops", _channel(), joined=True)
+        c.put("acc1", "@drops", _channel())
+        self.assertTrue(c.joined("acc1", "@drops"))
+        c.put("acc1", "@drops", _channel(cid=999))
+        self.assertFalse(c.joined("acc1", "@drops"))
+
+    def test_invalidate(self):
+        c = ChannelCache(self.path)
+        c.put("acc1", "@a", _channel())
+        c.put("acc1", "@b", _channel(cid=2))
+        self.assertTrue(c.invalidate("acc1", "@a"))
+        self.assertFalse(c.invalidate("acc1", "@a"))
+        self.assertIsNone(ChannelCache(self.path).get("acc1", "@a"))
+        self.assertIsNotNone(ChannelCache(self.path).get("acc1", "@b"))
+        self.assertTrue(c.invalidate("acc1"))
+        self.assertIsNone(ChannelCache(self.path).get("acc1", "@b"))
+
+    def test_non_channels_are_not_cached(self):
+        c = ChannelCache(self.path)
+        chat = types.Chat(id=5, title="g", photo=types.ChatPhotoEmpty(), participants_count=1, date=None, version=1)
+        self.assertFalse(c.put("acc1", "@g", chat))
+        self.assertIsNone(entity_from_record({"id": 1}))
+
+    def test_corrupt_file_is_ignored(self):
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text("{not json", encoding="utf-8")
+        c = ChannelCache(self.path)
+        self.assertIsNone(c.get("acc1", "@a"))
+        c.put("acc1", "@a", _channel())
+        self.assertIsNotNone(ChannelCache(self.path).get("acc1", "@a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
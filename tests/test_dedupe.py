@@ -0,0 +1,50 @@
+import unittest
+
+from acrfetcher.dedupe import DedupeStore
+
+
+class DedupeStoreTests(unittest.TestCase):
+    def test_duplicate_within_ttl(self):
+        d = DedupeStore(ttl_s=10)
+        self.assertFalse(d.seen((1, 2), now=100.0))
+        self.assertTrue(d.seen((1, 2), now=105.0))
+        self.assertEqual((d.counters.hits, d.counters.misses), (1, 1))
+
+    def test_expires_after_ttl_and_hit_does_not_refresh(self):
+        d = DedupeStore(ttl_s=10)
+        d.seen("a", now=100.0)
+        d.seen("a", now=109.0)
+        self.assertFalse(d.seen("a", now=110.0))
+        self.assertEqual(d.counters.expired, 1)
+
+    def test_expiry_stops_at_first_live_entry(self):
+        d = DedupeStore(ttl_s=10)
+        for i in range(5):
+            d.seen(i, now=100.0 + i)
+        self.assertEqual(d.expire(now=112.5), 3)
+        self.assertEqual(list(d), [3, 4])
+
+    def test_size_cap_evicts_oldest(self):
+        d = DedupeStore(ttl_s=1000, max_items=3)
+        for i in range(5):
+            d.seen(i, now=float(i))
+        self.assertEqual(list(d), [2, 3, 4])
+        self.assertEqual(d.counters.evicted, 2)
+        self.assertFalse(d.seen(0, now=6.0))
+
+    def test_zero_ttl_never_dedupes(self):
+        d = DedupeStore(ttl_s=0)
+        self.assertFalse(d.seen("k", now=1.0))
+        self.assertFalse(d.seen("k", now=1.0))
+
+    def test_add_refreshes(self):
+        d = DedupeStore(ttl_s=10)
+        d.add("a", now=0.0)
+        d.add("b", now=1.0)
+        d.add("a", now=5.0)
+        self.assertEqual(list(d), ["b", "a"])
+        self.assertTrue(d.seen("a", now=14.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
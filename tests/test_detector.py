@@ -1,6 +1,6 @@
 import unittest
 
-from acrfetcher.detector import classify_result_text
+from acrfetcher.detector import ResultMatcher, classify_result_text, get_result_matcher
 
 
 class DetectorTests(unittest.TestCase):
@@ -39,6 +39,39 @@ class DetectorTests(unittest.TestCase):
         )
         self.assertEqual(status, "none")
 
+    def test_success_needs_patterns_on_one_line(self):
+        m = ResultMatcher(["you got", "ticket"], [])
+        self.assertEqual(m.classify("Menu\nYou got a Ticket!\n"), ("success", "You got a Ticket!"))
+        self.assertEqual(m.classify("you got\nnothing")[0], "none")
+
+    def test_success_any_accepts_single_pattern(self):
+        m = ResultMatcher(["you got", "ticket"], [])
+        self.assertEqual(m.classify("Menu\nyou got", success_any=True), ("success", "you got"))
+
+    def test_fail_detail_is_first_matching_line(self):
+        m = ResultMatcher([], ["try again", "error"])
+        self.assertEqual(m.classify("Header\nAn error occurred\nPlease   try again"), ("fail", "Please try again"))
+
+    def test_phrase_spanning_lines_falls_back_to_phrase(self):
+        m = ResultMatcher([], [])
+        self.assertEqual(m.classify("This offer has\nexpired")[0], "missed")
+        self.assertEqual(m.classify("offer has already\nbeen claimed"), ("success", "already been claimed"))
+
+    def test_order_changes_precedence(self):
+        m = ResultMatcher(["you got"], ["expired"])
+        text = "You got it\nThis offer has expired"
+        self.assertEqual(m.classify(text)[0], "missed")
+        self.assertEqual(m.classify(text, order=("success", "missed"), success_any=True)[0], "success")
+
+    def test_phrases_are_normalized_and_deduped(self):
+        m = ResultMatcher(["  You   GOT "], ["Expired"])
+        self.assertIn("you got", m.phrases)
+        self.assertEqual(m.phrases.count("expired"), 1)
+
+    def test_get_result_matcher_is_cached(self):
+        a = get_result_matcher(["you got"], ["x"])
+        self.assertIs(a, get_result_matcher(["you got"], ["x"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from acrfetcher.post_store import PostStore
+
+
+class PostStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "state" / "posts.log"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_roundtrip_seen_and_watermark(self):
+        st = PostStore(self.path, ttl_s=100)
+        st.mark_seen(-100123, 5, now=1000.0)
+        st.mark_seen(-100123, 7, now=1001.0)
+        st.set_watermark(-100123, 9, now=1002.0)
+        st.set_watermark(-100123, 8, now=1003.0)  # never moves back
+        st.close()
+
+        st2 = PostStore(self.path, ttl_s=100)
+        st2.load(now=1010.0)
+        self.assertEqual(st2.watermark(-100123), 9)
+        self.assertEqual([k for k, _ts in st2.recent(now=1010.0)], [(-100123, 5), (-100123, 7)])
+
+    def test_load_drops_expired_and_stale_watermark(self):
+        st = PostStore(self.path, ttl_s=10)
+        st.mark_seen(1, 1, now=0.0)
+        st.mark_seen(1, 2, now=50.0)
+        st.close()
+        st2 = PostStore(self.path, ttl_s=10)
+        st2.load(now=55.0)
+        self.assertEqual([k for k, _ts in st2.recent(now=55.0)], [(1, 2)])
+        self.assertEqual(st2.watermark(1, max_age_s=10, now=55.0), 2)
+        self.assertIsNone(st2.watermark(1, max_age_s=10, now=100.0))
+
+    def test_quiet_channel_watermark_survives_restart_after_ttl(self):
+        # Last post at t=0; polls keep confirming the same id until t=2000.
+        st = PostStore(self.path, ttl_s=1800, confirm_every_s=60)
+        st.mark_seen(1, 42, now=0.0)
+        for t in range(10, 2001, 10):
+            st.set_watermark(1, 42, now=float(t))
+        st.close()
+        st2 = PostStore(self.path, ttl_s=1800)
+        st2.load(now=2060.0)
+        self.assertEqual(st2.watermark(1, max_age_s=1800, now=2060.0), 42)
+
+    def test_confirmations_are_throttled_and_survive_a_crash(self):
+        st = PostStore(self.path, ttl_s=1800, confirm_every_s=60)
+        st.mark_seen(1, 42, now=0.0)
+        for t in range(1, 2001):
+            st.confirm_watermark(1, now=float(t))
+        # No close(): the last throttled append is at most confirm_every_s old.
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertLess(len(lines), 40)
+        st2 = PostStore(self.path, ttl_s=1800)
+        st2.load(now=2060.0)
+        self.assertEqual(st2.watermark(1, max_age_s=1800, now=2060.0), 42)
+
+    def test_torn_last_line_is_ignored(self):
+        st = PostStore(self.path, ttl_s=100)
+        st.mark_seen(1, 3, now=10.0)
+        st.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"k": "seen", "c": 1, "m"')
+        st2 = PostStore(self.path, ttl_s=100)
+        st2.load(now=20.0)
+        self.assertEqual(st2.watermark(1), 3)
+
+    def test_compaction_bounds_log(self):
+        st = PostStore(self.path, ttl_s=5, compact_every=10)
+        for i in range(35):
+            st.mark_seen(1, i, now=float(i))
+            if st.compact_due:
+                st.compact(float(i))
+        st.close()
+        lines = self.path.read_text(encoding="utf-8").splitlines()
+        self.assertLess(len(lines), 20)
+        st2 = PostStore(self.path, ttl_s=5)
+        st2.load(now=34.0)
+        self.assertEqual(st2.watermark(1), 34)
+
+    def test_out_of_order_live_post_does_not_skip_ids(self):
+        st = PostStore(self.path, ttl_s=100)
+        st.set_watermark(1, 10, now=0.0)
+        st.mark_seen(1, 12, now=1.0)  # 11 not seen yet
+        self.assertEqual(st.watermark(1), 10)
+        st.mark_seen(1, 11, now=2.0)  # gap filled: carries over 12
+        self.assertEqual(st.watermark(1), 12)
+        st.mark_seen(1, 20, now=3.0)
+        st.close()
+        st2 = PostStore(self.path, ttl_s=100)
+        st2.load(now=4.0)
+        self.assertEqual(st2.watermark(1), 12)
+
+
+class PostStoreCompactTests(unittest.IsolatedAsyncioTestCase):
+    async def test_acompact_keeps_appends_made_meanwhile(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "posts.log"
+            st = PostStore(path, ttl_s=1000, compact_every=10)
+            for i in range(1, 11):
+                st.mark_seen(1, i, now=float(i))
+            self.assertTrue(st.compact_due)
+            task = asyncio.create_task(st.acompact(now=11.0))
+            await asyncio.sleep(0)
+            self.assertFalse(st.compact_due)  # one compaction at a time
+            st.mark_seen(1, 11, now=12.0)  # lands while the worker thread writes
+            await task
+            st.close()
+            st2 = PostStore(path, ttl_s=1000)
+            st2.load(now=13.0)
+            self.assertEqual(st2.watermark(1), 11)
+            self.assertEqual(len(st2.recent(now=13.0)), 11)
+            self.assertLess(len(path.read_text(encoding="utf-8").splitlines()), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from acrfetcher.pw_driver import SharedPlaywright
+
+
+class FakeDriver:
+    def __init__(self):
+        self.stopped = False
+        self.alive = True
+
+    async def stop(self):
+        self.stopped = True
+
+
+class SharedPlaywrightTests(unittest.IsolatedAsyncioTestCase):
+    def _shared(self):
+        started = []
+
+        async def starter():
+            await asyncio.sleep(0.01)
+            d = FakeDriver()
+            started.append(d)
+            return d
+
+        return SharedPlaywright(starter, alive=lambda d: d.alive), started
+
+    async def test_concurrent_acquire_starts_one_driver(self):
+        shared, started = self._shared()
+        drivers = await asyncio.gather(*(shared.acquire() for _ in range(10)))
+        self.assertEqual(len(started), 1)
+        self.assertTrue(all(d is started[0] for d in drivers))
+        self.assertEqual(shared.refs, 10)
+
+    async def test_release_keeps_driver_until_shutdown(self):
+        shared, started = self._shared()
+        d = await shared.acquire()
+        shared.release(d)
+        self.assertEqual(shared.refs, 0)
+        self.assertTrue(shared.running)
+        self.assertIs(await shared.acquire(), d)
+        self.assertEqual(shared.starts, 1)
+
+        await shared.shutdown()
+        self.assertTrue(d.stopped)
+        self.assertFalse(shared.running)
+        self.assertEqual(shared.refs, 0)
+
+    async def test_stale_release_after_shutdown_is_ignored(self):
+        shared, started = self._shared()
+        old = await shared.acquire()
+        await shared.shutdown()
+        new = await shared.acquire()
+        self.assertIsNot(old, new)
+        shared.release(old)
+        self.assertEqual(shared.refs, 1)
+        self.assertEqual(shared.starts, 2)
+
+    async def test_dead_driver_is_replaced(self):
+        shared, started = self._shared()
+        old = await shared.acquire()
+        old.alive = False  # Node process died
+        new = await shared.acquire()
+        self.assertIsNot(old, new)
+        self.assertEqual(shared.starts, 2)
+        self.assertEqual(shared.refs, 1)
+        shared.release(old)  # stale holder
+        self.assertEqual(shared.refs, 1)
+
+    async def test_invalidate_forgets_current_driver_only(self):
+        shared, started = self._shared()
+        d = await shared.acquire()
+        shared.invalidate(object())
+        self.assertTrue(shared.is_current(d))
+        shared.invalidate(d)
+        self.assertFalse(shared.running)
+        self.assertIsNot(await shared.acquire(), d)
+
+
+if __name__ == "__main__":
+    unittest.main()
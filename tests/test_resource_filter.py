@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+from acrfetcher.resource_filter import ESTIMATED_BYTES, ResourceFilter
+
+
+class _Req:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class _Route:
+    def __init__(self, url, resource_type):
+        self.request = _Req(url, resource_type)
+        self.outcome = ""
+
+    async def abort(self, reason=""):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class ResourceFilterTests(unittest.TestCase):
+    def test_blocks_by_type(self):
+        flt = ResourceFilter(block_types=["image", "font"], block_domains=[])
+        self.assertEqual(flt.decide("https://app.example/logo.png", "image"), "type:image")
+        self.assertEqual(flt.decide("https://app.example/app.js", "script"), "")
+
+    def test_document_is_never_blocked(self):
+        flt = ResourceFilter(block_types=["document"], block_domains=["example.com"])
+        self.assertEqual(flt.decide("https://example.com/", "document"), "")
+
+    def test_blocks_domain_and_subdomains(self):
+        flt = ResourceFilter(block_types=[], block_domains=["google-analytics.com"])
+        self.assertEqual(flt.decide("https://www.google-analytics.com/g/collect", "xhr"), "domain:google-analytics.com")
+        self.assertEqual(flt.decide("https://ssl.google-analytics.com/ga.js", "script"), "domain:google-analytics.com")
+        self.assertEqual(flt.decide("https://notgoogle-analytics.com/x", "script"), "")
+
+    def test_allowlist_overrides_blocks(self):
+        flt = ResourceFilter(block_types=["image"], block_domains=["cdn.example"], allow_domains=["img.cdn.example"])
+        self.assertEqual(flt.decide("https://img.cdn.example/a.png", "image"), "")
+        self.assertEqual(flt.decide("https://cdn.example/a.png", "image"), "domain:cdn.example")
+
+    def test_from_config_default_off(self):
+        self.assertIsNone(ResourceFilter.from_config({}))
+        flt = ResourceFilter.from_config({
+            "resource_filter_enabled": True,
+            "resource_filter_block_types": "image, media",
+            "resource_filter_allow_domains": "www.Example.com",
+        })
+        self.assertEqual(flt.block_types, frozenset({"image", "media"}))
+        self.assertEqual(flt.allow_domains, ("example.com",))
+        self.assertTrue(flt.block_domains)
+
+    def test_route_handler_counts_and_resets(self):
+        flt = ResourceFilter(block_types=["image"], block_domains=[])
+        r1 = _Route("https://a.example/x.png", "image")
+        r2 = _Route("https://a.example/", "document")
+        asyncio.run(flt._handle(r1))
+        asyncio.run(flt._handle(r2))
+        self.assertEqual((r1.outcome, r2.outcome), ("abort", "continue"))
+        st = flt.take_stats()
+        self.assertEqual((st.blocked, st.allowed), (1, 1))
+        self.assertEqual(st.bytes_saved, ESTIMATED_BYTES["image"])
+        self.assertEqual(st.by_reason, {"type:image": 1})
+        self.assertEqual(flt.take_stats().blocked, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
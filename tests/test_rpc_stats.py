@@ -0,0 +1,98 @@
+import unittest
+
+from acrfetcher.rpc_stats import RpcStats
+
+
+class FloodWaitError(Exception):
+    def __init__(self, seconds):
+        super().__init__(f"wait {seconds}s")
+        self.seconds = seconds
+
+
+class RpcStatsTests(unittest.TestCase):
+    def test_ewma_latency(self):
+        st = RpcStats(alpha=0.5)
+        st.record("a", 1.0)
+        st.record("a", 0.0)
+        self.assertAlmostEqual(st.latency("a"), 0.5)
+        self.assertEqual(st.latency("unknown"), st.default_latency_s)
+
+    def test_error_rate_decays(self):
+        st = RpcStats(alpha=0.5)
+        st.record("a", 0.1, ok=False)
+        self.assertAlmostEqual(st.error_rate("a"), 0.5)
+        st.record("a", 0.1)
+        self.assertAlmostEqual(st.error_rate("a"), 0.25)
+        self.assertEqual(st.get("a").errors, 1)
+        self.assertEqual(st.get("a").calls, 2)
+
+    def test_fastest_skips_flood_wait_and_ranks_by_score(self):
+        st = RpcStats(alpha=1.0)
+        st.record("slow", 0.9)
+        st.record("fast", 0.1)
+        st.record("flaky", 0.05)
+        st.record("flaky", 0.05, ok=False)
+        st.record_flood("fast", 30, now=100.0)
+        self.assertEqual(st.fastest(["slow", "fast", "flaky"], n=2, now=110.0), ["flaky", "slow"])
+        self.assertEqual(st.fastest(["slow", "fast"], n=1, now=131.0), ["fast"])
+
+    def test_poll_floors_throttle_only_unhealthy(self):
+        st = RpcStats(alpha=1.0)
+        st.record("fast", 0.1)
+        st.record("slow", 0.25)  # normal proxy spread: not throttled
+        st.record("mid", 0.15)
+        st.record("broken", 0.1)
+        st.record("broken", 0.1, ok=False)
+        st.record_flood("flood", 30, now=100.0)
+        floors = st.poll_floors(["fast", "slow", "mid", "broken", "flood"], 10.0, max_factor=4.0, now=110.0)
+        self.assertEqual(floors["broken"], 40.0)
+        self.assertEqual(floors["flood"], 40.0)
+        # Healthy accounts share the budget the throttled ones gave up.
+        self.assertEqual(floors["fast"], floors["slow"])
+        self.assertLess(floors["fast"], 10.0)
+        self.assertGreaterEqual(floors["fast"], 5.0)
+        even = st.poll_floors(["fast", "slow", "mid"], 10.0)
+        self.assertEqual(set(even.values()), {10.0})
+        self.assertEqual(st.poll_floors([], 10.0), {})
+
+    def _poll_rate(self, st, keys, seconds=600.0):
+        tick = 10.0 / len(keys)
+        last_poll: dict = {}
+        now, polls = 1000.0, 0
+        end = now + seconds
+        while now < end:
+            key, wait = st.next_poller(keys, last_poll, 10.0, now=now)
+            if key is None:
+                now += max(0.05, min(wait, tick))
+                continue
+            last_poll[key] = now
+            polls += 1
+            now += tick
+        return polls / seconds
+
+    def test_aggregate_poll_rate_does_not_fall(self):
+        keys = [f"a{i}" for i in range(10)]
+        st = RpcStats(alpha=1.0)
+        for i, k in enumerate(keys):
+            st.record(k, 0.1 + 0.02 * i)  # 0.10s .. 0.28s latency
+        baseline = len(keys) / 10.0
+        self.assertGreaterEqual(self._poll_rate(st, keys), 0.99 * baseline)
+        # Two failing accounts: the others pick up their polls (minus tick rounding).
+        st.record("a0", 0.1, ok=False)
+        st.record("a1", 1.0)
+        self.assertGreaterEqual(self._poll_rate(st, keys), 0.95 * baseline)
+
+    def test_measure_records_errors_and_flood(self):
+        st = RpcStats()
+        with self.assertRaises(FloodWaitError):
+            with st.measure("a"):
+                raise FloodWaitError(12)
+        self.assertGreater(st.flood_wait_left("a"), 10)
+        self.assertEqual(st.get("a").errors, 1)
+        with st.measure("a"):
+            pass
+        self.assertEqual(st.get("a").calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_DATA = tempfile.TemporaryDirectory()
+os.environ.setdefault("ACRFETCHER_DATA_DIR", _DATA.name)
+
+from acrfetcher.stats_store import StatsStore  # noqa: E402
+
+
+class StatsStoreTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "state" / "stats.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_burst_is_coalesced_into_one_write(self):
+        st = StatsStore(self.path, flush_delay_s=0.05)
+        for i in range(100):
+            st.bump(f"acc{i % 3}", "success")
+        st.bump("acc0", "timeout")
+        self.assertFalse(st.bump("acc0", "error"))
+        self.assertEqual(st.writes, 0)
+        await asyncio.sleep(0.2)
+        self.assertEqual(st.writes, 1)
+        raw = json.loads(self.path.read_text(encoding="utf-8"))
+        self.assertEqual(raw["total"]["success"], 100)
+        self.assertEqual(raw["accounts"]["acc0"]["timeout"], 1)
+        self.assertEqual(raw["accounts"]["acc1"]["success"], 33)
+        self.assertFalse(self.path.with_name("stats.json.tmp").exists())
+
+    async def test_aclose_writes_pending_and_reload_matches(self):
+        st = StatsStore(self.path, flush_delay_s=10.0)
+        st.bump("a", "missed")
+        st.bump("a", "success")
+        await st.aclose()
+        again = StatsStore(self.path)
+        self.assertEqual(again.counts("a"), {"success": 1, "missed": 1, "fail": 0, "timeout": 0})
+        self.assertEqual(again.gotem, 1)
+
+    def test_gotem_reset_and_legacy_seed(self):
+        st = StatsStore(self.path)
+        st.seed_gotem(7)
+        self.assertEqual(st.gotem, 7)
+        st.seed_gotem(9)  # only a brand-new store is seeded
+        self.assertEqual(st.gotem, 7)
+        st.reset_gotem()
+        st.bump("a", "success")
+        self.assertEqual(st.gotem, 1)
+        self.assertEqual(st.counts()["success"], 8)
+        self.assertEqual(StatsStore(self.path).gotem, 1)
+
+    def test_legacy_gotem_is_cleared_after_seeding(self):
+        from acrfetcher import main
+
+        cfg = {"gotem": 5}
+        cfg_path = Path(self._tmp.name) / "config.json"
+        with patch.object(main, "_STATS", StatsStore(self.path)), patch.object(main, "CONFIG_PATH", cfg_path):
+            self.assertEqual(main.gotem_count(cfg), 5)
+            self.assertEqual(cfg["gotem"], 0)
+            self.assertEqual(json.loads(cfg_path.read_text(encoding="utf-8"))["gotem"], 0)
+        # Deleting stats.json now really starts from zero.
+        self.path.unlink()
+        with patch.object(main, "_STATS", StatsStore(self.path)), patch.object(main, "CONFIG_PATH", cfg_path):
+            self.assertEqual(main.gotem_count(cfg), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,6 +19,10 @@ class StatusCodesTests(unittest.TestCase):
     def test_stopped_label(self):
         self.assertIn("STOPPED", status_label("STOPPED"))
 
+    def test_catchup_label(self):
+        self.assertEqual(normalize_status("catch_up").value, "CATCHUP")
+        self.assertIn("CATCHUP 3 missed", status_label("CATCHUP", "3 missed"))
+
 
 if __name__ == "__main__":
     unittest.main()
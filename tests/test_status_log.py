@@ -0,0 +1,85 @@
+import asyncio
+import gzip
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from acrfetcher.status_log import HEADER, StatusLog, format_status_line
+
+
+class StatusLogTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "status_live.tsv"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_format_flattens_newlines(self):
+        line = format_status_line("acc", "ERROR", "a\nb\rc", "", ts=0)
+        self.assertEqual(line.count("\n"), 1)
+        self.assertTrue(line.endswith("\tacc\tERROR\t\ta b c\n"))
+
+    async def test_burst_is_written_in_batches(self):
+        log = StatusLog(self.path, batch_lines=50, flush_ms=1000)
+        runner = asyncio.create_task(log.run())
+        await asyncio.sleep(0)
+        for i in range(120):
+            log.log(f"acc{i}", "OPENING")
+        await asyncio.sleep(0.05)
+        # One write for the whole burst, long before flush_ms.
+        self.assertEqual(log.writes, 1)
+        self.assertEqual(log.pending, 0)
+        log.log("late", "SUCCESS")
+        runner.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await runner
+        lines = self.path.read_text(encoding="utf-8").splitlines(keepends=True)
+        self.assertEqual(lines[0], HEADER)
+        self.assertEqual(len(lines), 122)
+        self.assertEqual(log.writes, 2)
+
+    async def test_flush_latency_is_bounded(self):
+        log = StatusLog(self.path, batch_lines=1000, flush_ms=50)
+        stop = asyncio.Event()
+        runner = asyncio.create_task(log.run(stop))
+        await asyncio.sleep(0)
+        log.log("acc", "SUCCESS", "ok")
+        await asyncio.sleep(0.2)
+        self.assertIn("\tacc\tSUCCESS\t", self.path.read_text(encoding="utf-8"))
+        stop.set()
+        await runner
+
+    def test_rotates_by_size_and_compresses(self):
+        log = StatusLog(self.path, max_bytes=200, keep=2)
+        for i in range(6):
+            for j in range(5):
+                log.log(f"acc{i}-{j}", "MONITORING")
+            log.flush()
+        log.close()
+        segs = log.segments()
+        self.assertGreaterEqual(log.rotations, 3)
+        self.assertEqual(len(segs), 2)
+        self.assertTrue(all(p.name.endswith(".tsv.gz") for p in segs))
+        with gzip.open(segs[-1], "rt", encoding="utf-8") as f:
+            self.assertEqual(f.readline(), HEADER)
+        self.assertFalse(list(self.dir.glob("*.tmp")))
+
+    def test_rotates_file_from_previous_day_on_open(self):
+        self.path.write_text(HEADER + "old\n", encoding="utf-8")
+        old = time.time() - 2 * 86400
+        os.utime(self.path, (old, old))
+        log = StatusLog(self.path)
+        log.log("acc", "LOGIN")
+        log.flush()
+        log.close()
+        self.assertEqual(log.rotations, 1)
+        self.assertEqual(self.path.read_text(encoding="utf-8").count("\n"), 2)
+        self.assertEqual(len(log.segments()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import gzip
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from acrfetcher.tracing import Tracer
+
+
+class TracerTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "logs" / "traces.jsonl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_post_and_open_records_written_as_jsonl(self):
+        tr = Tracer(self.path)
+        post = tr.begin((-100123, 7), "det")
+        post.add("tg", 900)
+        post.mark("queue")
+        post.mark("link")
+        child = post.fork("acc1")
+        post.finish("fanout")
+        post.finish("fanout")  # only once
+        child.mark("fanout")
+        child.add("webview", 80)
+        child.mark("result")
+        child.finish("success")
+        tr.close()
+
+        recs = [json.loads(l) for l in self.path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["kind"] for r in recs], ["post", "open"])
+        self.assertEqual(recs[0]["post"], "-100123:7")
+        self.assertEqual(set(recs[0]["stages"]), {"tg", "queue", "link"})
+        self.assertEqual(recs[1]["account"], "acc1")
+        self.assertEqual(recs[1]["res"], "success")
+        self.assertEqual(set(recs[1]["stages"]), {"fanout", "webview", "result", "total"})
+        self.assertEqual(recs[1]["stages"]["webview"], 80.0)
+
+    def test_file_is_rotated_and_capped(self):
+        tr = Tracer(self.path, max_bytes=2000, keep=2)
+        for i in range(200):
+            t = tr.begin((1, i), "acc")
+            t.add("link", i)
+            t.finish("success")
+        tr.close()
+        segs = sorted(self.path.parent.glob("traces-*.jsonl.gz"))
+        self.assertEqual(len(segs), 2)
+        self.assertLess(self.path.stat().st_size, 2000 + 300)
+        with gzip.open(segs[-1], "rt", encoding="utf-8") as f:
+            first = json.loads(f.readline())
+        self.assertEqual(first["kind"], "post")
+        last = json.loads(self.path.read_text(encoding="utf-8").splitlines()[-1])
+        self.assertEqual(last["post"], "1:199")
+
+    def test_mark_measures_since_previous_mark(self):
+        tr = Tracer(None)
+        t = tr.begin((1, 1), "a")
+        time.sleep(0.02)
+        self.assertGreaterEqual(t.mark("queue"), 15)
+        self.assertLess(t.mark("link"), 15)
+
+    def test_percentiles_and_summary(self):
+        tr = Tracer(None, window=100)
+        for ms in range(1, 101):
+            t = tr.begin((1, ms), "a")
+            t.add("link", ms)
+            t.finish()
+        p50, p95 = tr.percentiles("link")
+        self.assertAlmostEqual(p50, 50, delta=1)
+        self.assertAlmostEqual(p95, 95, delta=1)
+        self.assertIsNone(tr.percentiles("navigate"))
+        self.assertTrue(tr.summary().startswith("link 5"))
+        self.assertIs(tr.summary(), tr.summary())
+
+    def test_window_keeps_recent_samples(self):
+        tr = Tracer(None, window=10)
+        for ms in [1000] * 10 + [10] * 10:
+            t = tr.begin((1, 1), "a")
+            t.add("result", ms)
+            t.finish()
+        self.assertEqual(tr.percentiles("result"), (10, 10))
+
+
+class TracerWriterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_records_are_batched_while_running(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "traces.jsonl"
+            tr = Tracer(path)
+            runner = asyncio.create_task(tr.run())
+            await asyncio.sleep(0)
+            for i in range(50):
+                t = tr.begin((1, i), "acc")
+                t.finish("success")
+            self.assertFalse(path.exists())  # nothing written on the hot path
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+            await tr.aclose()
+            self.assertEqual(len(path.read_text(encoding="utf-8").splitlines()), 50)
+            self.assertEqual(tr._log.writes, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import time
+import unittest
+
+from acrfetcher.models import RowState, UiEvent
+from acrfetcher.ui_watch import RowRenderCache, UiStateReducer
+
+
+class UiStateReducerTests(unittest.IsolatedAsyncioTestCase):
+    def _reducer(self, *labels):
+        ui = UiStateReducer()
+        for lb in labels:
+            ui.init_row(lb, RowState(phone=lb, proxy="", status="MONITORING", ticket="—"))
+        ui.take_dirty()
+        return ui
+
+    async def test_apply_marks_only_changed_rows_dirty(self):
+        ui = self._reducer("a", "b")
+        self.assertTrue(ui.apply(UiEvent(kind="status", label="a", status="OPENING")))
+        self.assertFalse(ui.apply(UiEvent(kind="status", label="b", status="MONITORING")))
+        self.assertFalse(ui.apply(UiEvent(kind="status", label="zz", status="OPENING")))
+        self.assertTrue(ui.changed.is_set())
+        self.assertEqual(ui.take_dirty(), {"a"})
+        self.assertFalse(ui.changed.is_set())
+        self.assertEqual(ui.state["a"].status, "OPENING")
+
+    async def test_ticket_kept_unless_given(self):
+        ui = self._reducer("a")
+        ui.apply(UiEvent(kind="status", label="a", status="GOT", ticket="$50"))
+        ui.apply(UiEvent(kind="status", label="a", status="SUCCESS", detail="ok"))
+        row = ui.state["a"]
+        self.assertEqual((row.status, row.detail, row.ticket), ("SUCCESS", "ok", "$50"))
+
+    async def test_next_frame_coalesces_bursts(self):
+        ui = self._reducer("a", "b")
+        ui.last_frame = time.monotonic()
+        t0 = time.monotonic()
+        for i in range(50):
+            ui.apply(UiEvent(kind="status", label="a" if i % 2 else "b", status=f"S{i}"))
+        dirty = await ui.next_frame(max_fps=20, idle_s=1.0)
+        self.assertEqual(dirty, {"a", "b"})
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+
+    async def test_next_frame_idles_without_changes(self):
+        ui = self._reducer("a")
+        t0 = time.monotonic()
+        dirty = await ui.next_frame(max_fps=100, idle_s=0.05)
+        self.assertEqual(dirty, set())
+        self.assertGreaterEqual(time.monotonic() - t0, 0.04)
+
+    async def test_queue_path_still_applies(self):
+        ui = self._reducer("a")
+        stop = asyncio.Event()
+        runner = asyncio.create_task(ui.run(stop))
+        await ui.emit(UiEvent(kind="status", label="a", status="ERROR"))
+        await ui.events.join()
+        stop.set()
+        await runner
+        self.assertEqual(ui.state["a"].status, "ERROR")
+        self.assertIn("a", ui.dirty)
+
+
+class RowRenderCacheTests(unittest.TestCase):
+    def test_rebuilds_only_on_key_change_or_discard(self):
+        cache = RowRenderCache()
+        calls = []
+
+        def build(text):
+            return lambda: calls.append(text) or text
+
+        self.assertEqual(cache.get("a", ("MON", 0), build("x")), "x")
+        self.assertEqual(cache.get("a", ("MON", 0), build("y")), "x")
+        self.assertEqual(cache.get("a", ("MON", 1), build("z")), "z")
+        cache.discard(["a"])
+        self.assertEqual(cache.get("a", ("MON", 1), build("w")), "w")
+        self.assertEqual(calls, ["x", "z", "w"])
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
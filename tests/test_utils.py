@@ -1,11 +1,14 @@
 import unittest
 
 from acrfetcher.utils import (
+    display_width,
     extract_ticket_info,
     is_telegram_link,
     normalize_telegram_link,
     pad_ansi,
+    pad_display,
     parse_message_link,
+    truncate_display,
 )
 
 
@@ -28,6 +31,26 @@ class UtilsTests(unittest.TestCase):
         s = pad_ansi("abc", 5)
         self.assertEqual(len(s), 5)
 
+    def test_display_width_ascii_and_wide(self):
+        self.assertEqual(display_width("abc"), 3)
+        self.assertEqual(display_width(""), 0)
+        self.assertEqual(display_width("🚀x"), 3)
+        self.assertEqual(display_width("日本"), 4)
+
+    def test_truncate_display(self):
+        self.assertEqual(truncate_display("abcdef", 4, "…"), "abc…")
+        self.assertEqual(truncate_display("abcdef", 6, "…"), "abcdef")
+        self.assertEqual(truncate_display("日本語テキスト", 5, "…"), "日本…")
+
+    def test_pad_display_ansi_and_cache(self):
+        red = "\x1b[31mok\x1b[0m"
+        self.assertEqual(pad_display(red, 4, "…"), red + "  ")
+        self.assertEqual(pad_display("\x1b[31mtoolong\x1b[0m", 4, "…"), "too…")
+        before = pad_display.cache_info().hits
+        pad_ansi("cached", 8)
+        pad_ansi("cached", 8)
+        self.assertGreater(pad_display.cache_info().hits, before)
+
     def test_extract_ticket_info(self):
         txt = "Win $50 and 10000 GTD now!"
         info = extract_ticket_info(txt)
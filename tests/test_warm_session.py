@@ -0,0 +1,220 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+_DATA = tempfile.TemporaryDirectory()
+os.environ.setdefault("ACRFETCHER_DATA_DIR", _DATA.name)
+
+from acrfetcher import main  # noqa: E402
+from acrfetcher.main import SharedBrowserPool, WarmBrowserSession, detect_result_via_warm_session  # noqa: E402
+from acrfetcher.pw_driver import SharedPlaywright  # noqa: E402
+
+
+class FakePage:
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.closed = False
+        self.urls = []
+        self.body = ""
+
+    def is_closed(self):
+        return self.closed or self.ctx.dead
+
+    async def goto(self, url, **kw):
+        await asyncio.sleep(0)
+        if self.is_closed():
+            raise RuntimeError("Target closed")
+        self.urls.append(url)
+
+    async def close(self):
+        self.closed = True
+
+    async def inner_text(self, selector):
+        return self.body
+
+    async def evaluate(self, js):
+        return None
+
+    async def expose_function(self, name, fn):
+        pass
+
+    async def add_init_script(self, js):
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.dead = False
+        self.pages = []
+
+    async def new_page(self):
+        if self.dead:
+            raise RuntimeError("Browser has been closed")
+        p = FakePage(self)
+        self.pages.append(p)
+        return p
+
+    async def storage_state(self, **kw):
+        self.saved_to = kw.get("path")
+
+    async def close(self):
+        self.dead = True
+
+
+class FakePool:
+    def __init__(self):
+        self.contexts = []
+        self.released = 0
+
+    async def new_context(self, **kw):
+        ctx = FakeContext()
+        self.contexts.append(ctx)
+        return ctx
+
+    async def release_context(self, ctx):
+        self.released += 1
+
+
+class WarmSessionRestartTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pool = FakePool()
+        self.session = WarmBrowserSession(
+            profile_dir=Path(self._tmp.name) / "acc",
+            proxy=None,
+            headless=True,
+            page_pool_size=3,
+            shared_pool=self.pool,
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_closed_tab_does_not_restart_other_pages(self):
+        s = self.session
+        a = await s.acquire_page()
+        b = await s.acquire_page()
+        a.closed = True
+        a2 = await s.goto("https://x/1", page=a)
+        self.assertIsNot(a2, a)
+        self.assertEqual(a2.urls[-1], "https://x/1")
+        # b's browser context survived and b is still a valid lease.
+        self.assertEqual(len(self.pool.contexts), 1)
+        b2 = await s.goto("https://x/2", page=b)
+        self.assertIs(b2, b)
+        s.release_page(a2)
+        s.release_page(b2)
+        await asyncio.sleep(0.01)
+        self.assertEqual(s._idle.qsize(), 3)
+
+    async def test_dead_context_restarts_once_for_all_holders(self):
+        s = self.session
+        pages = [await s.acquire_page() for _ in range(3)]
+        self.pool.contexts[0].dead = True
+        got = await asyncio.gather(*(s.goto(f"https://x/{i}", page=p) for i, p in enumerate(pages)))
+        self.assertEqual(len(self.pool.contexts), 2)
+        self.assertEqual(self.pool.released, 1)
+        self.assertEqual(len(set(map(id, got))), 3)
+        for i, p in enumerate(got):
+            self.assertIs(p.ctx, self.pool.contexts[1])
+            self.assertEqual(p.urls[-1], f"https://x/{i}")
+            s.release_page(p)
+        await asyncio.sleep(0.01)
+        self.assertEqual(s._idle.qsize(), 3)
+
+    async def test_push_reads_page_when_observer_stays_silent(self):
+        # The observer installs, but its init script never reports (e.g. navigation race).
+        s = WarmBrowserSession(
+            profile_dir=Path(self._tmp.name) / "push",
+            proxy=None,
+            headless=True,
+            push_detect=True,
+            shared_pool=self.pool,
+        )
+        await s.start()
+        s._page.body = "Congratulations, you won!"
+        res, _ = await detect_result_via_warm_session(
+            s, "https://x/p", {"result_detect_mode": "push"}, 200, 50, ["you won"], ["expired"]
+        )
+        self.assertEqual(res, "success")
+
+    async def test_use_mode_saves_storage_state_where_it_loads_it(self):
+        sp = Path(self._tmp.name) / "state.json"
+        s = WarmBrowserSession(
+            profile_dir=Path(self._tmp.name) / "use",
+            proxy=None,
+            headless=True,
+            storage_state_mode="use",
+            storage_state_path=sp,
+            shared_pool=self.pool,
+        )
+        await s.start()
+        ctx = self.pool.contexts[0]
+        await s.close()
+        self.assertEqual(ctx.saved_to, str(sp))
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kw):
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeChromium:
+    def __init__(self, delay_s):
+        self.delay_s = delay_s
+        self.launches = 0
+
+    async def launch(self, **kw):
+        self.launches += 1
+        await asyncio.sleep(self.delay_s)
+        return FakeBrowser()
+
+
+class FakeDriver:
+    def __init__(self, delay_s):
+        self.chromium = FakeChromium(delay_s)
+
+    async def stop(self):
+        pass
+
+
+class SharedBrowserPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_cold_launch_does_not_block_other_slots(self):
+        driver = FakeDriver(0.3)
+
+        async def starter():
+            return driver
+
+        with patch.object(main, "_PLAYWRIGHT", SharedPlaywright(starter, alive=lambda d: True)):
+            pool = SharedBrowserPool(size=2)
+            first = await pool.new_context()  # slot 0 launched
+            t0 = time.monotonic()
+            slow = asyncio.create_task(pool.new_context())  # slot 1: cold launch
+            await asyncio.sleep(0)
+            fast = await pool.new_context()  # slot 0 is warm: no wait for slot 1
+            self.assertLess(time.monotonic() - t0, 0.2)
+            await slow
+            self.assertEqual(driver.chromium.launches, 2)
+            self.assertEqual(sorted(pool.stats()), [1, 2])
+            for ctx in (first, fast):
+                await pool.release_context(ctx)
+            self.assertTrue(all(b is not None for b in pool._browsers))
+            await pool.release_context(slow.result())
+            self.assertTrue(all(b is None for b in pool._browsers))
+
+
+if __name__ == "__main__":
+    unittest.main()